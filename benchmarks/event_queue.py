@@ -0,0 +1,110 @@
+# benchmarks/event_queue.py
+
+"""
+Event-queue benchmark: heapq vs the hierarchical timing wheel.
+
+Builds an event trace from generator workloads: every process contributes
+an arrival event (inter-arrival gaps are the generator's arrival field)
+and, once the arrival is popped, a completion event `burst` later. At
+most `pending` arrivals are queued ahead of time, so the same trace
+can be replayed with a few queued events (like the engine, which keeps
+one timer per CPU and device) or with every arrival preloaded.
+
+For each (events, pending) cell both queues replay the trace, and the
+result records which one was faster and what select_queue() picked.
+
+Usage (from the repository root):
+    python benchmarks/event_queue.py
+    python benchmarks/event_queue.py --sizes 1000000 10000000 --pending 16 4096 all
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_generator import generate_processes
+from scheduler.event_queue import make_queue, select_queue
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_PENDING = ["16", "256", "4096", "65536", "all"]
+
+
+def trace(n, seed=0):
+    """(arrival times, bursts) of n generated processes."""
+    arrivals = []
+    bursts = []
+    t = 0
+    for p in generate_processes(num_processes=n, seed=seed):
+        t += p["arrival"]
+        arrivals.append(t)
+        bursts.append(p["burst"])
+    return arrivals, bursts
+
+
+def replay(kind, arrivals, bursts, pending):
+    """Seconds to push and pop every event of the trace through one queue."""
+    q = make_queue(kind)
+    push = q.push
+    pop = q.pop
+    n = len(arrivals)
+    nxt = 0
+    seq = 0
+    start = time.perf_counter()
+    while nxt < n or len(q):
+        while nxt < n and len(q) < pending:
+            seq += 1
+            push((arrivals[nxt], seq, nxt, 0))
+            nxt += 1
+        t, _, i, kind_ = pop()
+        if kind_ == 0:
+            seq += 1
+            push((t + bursts[i], seq, i, 1))
+    return time.perf_counter() - start
+
+
+def run_cell(arrivals, bursts, pending, repeats):
+    heap_s = min(replay("heap", arrivals, bursts, pending) for _ in range(repeats))
+    wheel_s = min(replay("wheel", arrivals, bursts, pending) for _ in range(repeats))
+    sample = arrivals[:1000] + bursts[:1000]
+    auto = select_queue(sample, min(pending, len(arrivals)))
+    fastest = "heap" if heap_s <= wheel_s else "wheel"
+    return {
+        "events": 2 * len(arrivals),
+        "pending": min(pending, len(arrivals)),
+        "heap_s": round(heap_s, 4),
+        "wheel_s": round(wheel_s, 4),
+        "wheel_speedup": round(heap_s / wheel_s, 3) if wheel_s else None,
+        "auto": auto,
+        "fastest": fastest,
+        "auto_is_fastest": auto == fastest,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark heapq against the timing wheel on generated traces.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="processes per trace")
+    ap.add_argument("--pending", nargs="+", default=DEFAULT_PENDING,
+                    help="arrivals queued ahead of time ('all' preloads every arrival)")
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    for n in args.sizes:
+        arrivals, bursts = trace(n, args.seed)
+        for pending in args.pending:
+            pending = n if pending == "all" else int(pending)
+            if pending > n:
+                continue
+            cell = run_cell(arrivals, bursts, pending, args.repeats)
+            sys.stdout.write(json.dumps(cell, separators=(",", ":")) + "\n")
+            sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
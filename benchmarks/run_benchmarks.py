@@ -0,0 +1,268 @@
+# benchmarks/run_benchmarks.py
+
+"""
+Benchmark suite for schedulers, metrics, security and rendering.
+
+Times every run_* scheduler (Round Robin at several quanta),
+metrics.compute, anomaly_detector.detect_and_mitigate and the chart
+renderers across workload sizes, fits a scaling exponent per benchmark
+(slope of log time vs log n), and stores the results in a JSON file keyed
+by git commit.
+
+Sizes a benchmark cannot finish within --budget seconds (extrapolated from
+the exponent so far) are skipped, so quadratic engines stop early instead
+of stalling the suite at 10^6.
+
+Regression gate: --compare <commit> fails (exit code 1) when any tracked
+benchmark is more than --threshold percent slower than the stored run.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 10 100 1000 --only RR
+    python benchmarks/run_benchmarks.py --compare previous --threshold 15
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_generator import generate_processes
+from scheduler.fcfs import run_fcfs
+from scheduler.sjf import run_sjf
+from scheduler.srtf import run_srtf
+from scheduler.roundrobin import run_roundrobin
+from scheduler.priority import run_priority
+from security.anomaly_detector import detect_and_mitigate
+from metrics import metrics
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+DEFAULT_QUANTA = [1, 2, 4, 8]
+DEFAULT_RESULTS = os.path.join(ROOT, "data", "benchmarks.json")
+MIN_GATED_SECONDS = 0.001   # timings below this are too noisy to gate on
+FIT_MIN_SIZE = 100          # ignore fixed overhead at tiny sizes when fitting
+
+
+# ---------------- workloads ----------------
+_workloads = {}
+
+
+def workload(n):
+    """Seeded workload of n processes, shared by every benchmark."""
+    if n not in _workloads:
+        _workloads[n] = generate_processes(num_processes=n, seed=n)
+    return _workloads[n]
+
+
+def copies(n):
+    return [p.copy() for p in workload(n)]
+
+
+_schedules = {}
+
+
+def rr_schedule(n):
+    """Multi-segment output used by metrics and rendering benchmarks."""
+    if n not in _schedules:
+        _schedules[n] = run_roundrobin(copies(n), quantum=2)["processes"]
+    return _schedules[n]
+
+
+# ---------------- benchmark table ----------------
+def build_benchmarks(quanta, render):
+    """name -> (setup(n) -> args, fn(*args))"""
+    benches = {
+        "scheduler.FCFS": (lambda n: (copies(n),), run_fcfs),
+        "scheduler.SJF": (lambda n: (copies(n),), run_sjf),
+        "scheduler.SRTF": (lambda n: (copies(n),), run_srtf),
+        "scheduler.Priority": (lambda n: (copies(n),), run_priority),
+    }
+    for q in quanta:
+        benches[f"scheduler.RR.q{q}"] = (lambda n, q=q: (copies(n), q), run_roundrobin)
+    benches["metrics.compute"] = (lambda n: (rr_schedule(n),), metrics.compute)
+    benches["security.detect_and_mitigate"] = (lambda n: (copies(n),), detect_and_mitigate)
+
+    if render:
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+            from visualization import charts
+        except ImportError:
+            print("matplotlib not available; skipping rendering benchmarks", file=sys.stderr)
+        else:
+            def gantt(processes):
+                charts.plot_gantt_chart(processes)
+                plt.gcf().canvas.draw()
+                plt.close("all")
+
+            def dashboard(m):
+                charts.plot_metrics_dashboard(m)
+                plt.gcf().canvas.draw()
+                plt.close("all")
+
+            benches["charts.gantt"] = (lambda n: (rr_schedule(n),), gantt)
+            benches["charts.dashboard"] = (lambda n: (metrics.compute(rr_schedule(n)),), dashboard)
+    return benches
+
+
+# ---------------- timing ----------------
+def time_once(setup, fn, n, repeats):
+    """Best of `repeats` wall-clock timings; setup is excluded."""
+    best = math.inf
+    for _ in range(repeats):
+        args = setup(n)
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def fit_exponent(timings):
+    """Least-squares slope of log(seconds) against log(n)."""
+    pts = [(math.log(n), math.log(t)) for n, t in timings.items() if n >= FIT_MIN_SIZE and t > 0]
+    if len(pts) < 2:
+        pts = [(math.log(n), math.log(t)) for n, t in timings.items() if t > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    sxx = sum((x - mx) ** 2 for x, _ in pts)
+    if sxx == 0:
+        return None
+    return round(sum((x - mx) * (y - my) for x, y in pts) / sxx, 3)
+
+
+def run_suite(benches, sizes, budget, repeats):
+    results = {}
+    for name, (setup, fn) in benches.items():
+        timings = {}
+        for n in sorted(sizes):
+            if timings:
+                last_n = max(timings)
+                k = fit_exponent(timings) or 1.0
+                predicted = timings[last_n] * (n / last_n) ** max(k, 1.0)
+                if predicted > budget:
+                    print(f"  {name:<32} n={n:<8} skipped (predicted {predicted:.1f}s > budget)")
+                    continue
+            reps = repeats if n <= 10000 else 1
+            t = time_once(setup, fn, n, reps)
+            timings[n] = t
+            print(f"  {name:<32} n={n:<8} {t * 1000:10.3f} ms")
+        results[name] = {
+            "seconds": {str(n): t for n, t in timings.items()},
+            "exponent": fit_exponent(timings),
+        }
+    return results
+
+
+# ---------------- storage & regression gate ----------------
+def git_commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(path, store):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(store, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def find_regressions(current, baseline, threshold):
+    """[(name, n, base_s, cur_s, pct)] for benchmarks slower than threshold percent."""
+    regressions = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for n, t in cur["seconds"].items():
+            b = base["seconds"].get(n)
+            if b is None or b < MIN_GATED_SECONDS:
+                continue
+            pct = (t - b) / b * 100.0
+            if pct > threshold:
+                regressions.append((name, n, b, t, pct))
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark schedulers, metrics, security and rendering.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--quanta", type=int, nargs="+", default=DEFAULT_QUANTA)
+    ap.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--budget", type=float, default=60.0, help="max predicted seconds per measurement")
+    ap.add_argument("--no-render", action="store_true", help="skip chart rendering benchmarks")
+    ap.add_argument("--results", default=DEFAULT_RESULTS, help="JSON file keyed by git commit")
+    ap.add_argument("--no-save", action="store_true")
+    ap.add_argument("--compare", help="baseline commit key, or 'previous' for the last stored run")
+    ap.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+    args = ap.parse_args(argv)
+
+    benches = build_benchmarks(args.quanta, render=not args.no_render)
+    if args.only:
+        benches = {k: v for k, v in benches.items() if any(s in k for s in args.only)}
+
+    commit = git_commit()
+    print(f"Benchmarking {len(benches)} benchmarks at commit {commit}")
+    results = run_suite(benches, args.sizes, args.budget, args.repeats)
+
+    print("\nScaling exponents (time ~ n^k):")
+    for name, r in results.items():
+        print(f"  {name:<32} k = {r['exponent']}")
+
+    store = load_results(args.results)
+    baseline = None
+    if args.compare:
+        key = store.get("_latest") if args.compare == "previous" else args.compare
+        if not key or key not in store:
+            print(f"\nNo stored baseline '{args.compare}' to compare against.", file=sys.stderr)
+            return 2
+        baseline = store[key]["results"]
+
+    if not args.no_save:
+        store[commit] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        store["_latest"] = commit
+        save_results(args.results, store)
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions vs {key} (> {args.threshold:.1f}%):")
+            for name, n, b, t, pct in regressions:
+                print(f"  {name:<32} n={n:<8} {b * 1000:.3f} ms -> {t * 1000:.3f} ms (+{pct:.1f}%)")
+            return 1
+        print(f"\nNo regressions vs {key} (threshold {args.threshold:.1f}%).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# experiments/autotune.py
+
+"""
+SLO-driven auto-tuning of scheduler parameters.
+
+Tunes the Round Robin quantum (hand-picked in the GUI, default 2) and the
+anomaly detector thresholds (detect_and_mitigate burst_threshold=8,
+priority_threshold=2) for one workload, against an objective such as
+"minimum p99 turnaround" under constraints such as "cpu_utilization >= 90"
+and "context_switches <= 5000".
+
+Search is successive halving over the parameter grid:
+ - rung 0 evaluates every candidate on a contiguous arrival window of
+   `min_fraction` of the workload (a window keeps the offered load of the
+   full trace, where taking every k-th process would thin it out)
+ - each rung keeps the best 1/eta of the candidates and grows the window
+   eta times, until the survivors run on the whole workload
+ - candidates are ranked by constraint violation first (0 when feasible),
+   then by the objective. Counts that grow with the workload
+   (context_switches) are scaled to the full size before the check
+ - every (configuration, window) evaluation is memoized, so a
+   configuration seen again, or a memo carried over from an earlier
+   tune() call on the same workload, is never simulated twice
+The defaults are always evaluated on the full workload as the baseline,
+and the report includes the Pareto frontier of the full-workload
+evaluations over the objective and the constrained metrics.
+
+The detector halves the burst of every process it flags, so on their own
+lower thresholds only ever look better: flagging everything minimizes
+turnaround. The thresholds are therefore tuned only under a
+"detection_rate<=X" constraint, which bounds how much of the workload may
+be flagged; without one the detector runs at its default thresholds and
+only the quantum is tuned.
+
+Usage (from the repository root):
+    python experiments/autotune.py --generate 2000 --seed 1 --objective turnaround_p99 \\
+        --constraint "cpu_utilization>=90" --constraint "context_switches<=3000" \
+        --constraint "detection_rate<=0.3"
+    python experiments/autotune.py --workload data/trace.csv --no-secure --quantum 1 2 4 8 16
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+from itertools import product
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import run_scheduler
+from process_generator import generate_processes
+from security.anomaly_detector import detect_and_mitigate
+from metrics import metrics
+
+SPACE = {
+    "quantum": (1, 2, 3, 4, 5, 6, 8, 10, 12, 16),
+    "burst_threshold": (4, 6, 8, 10, 12, 16, 24),
+    "priority_threshold": (0, 1, 2, 3, 4),
+}
+DEFAULTS = {"quantum": 2, "burst_threshold": 8, "priority_threshold": 2}
+THRESHOLDS = ("burst_threshold", "priority_threshold")
+MAXIMIZE = ("cpu_utilization", "effective_cpu_utilization", "throughput")
+EXTENSIVE = ("context_switches",)       # grow with the workload
+FRONTIER_METRICS = ("cpu_utilization", "context_switches")
+
+_CONSTRAINT = re.compile(r"^\s*(\w+)\s*(<=|>=)\s*(-?[\d.]+(?:[eE][-+]?\d+)?)\s*$")
+
+
+def parse_constraint(text):
+    """"metric>=value" or "metric<=value" -> (metric, op, value)."""
+    m = _CONSTRAINT.match(text)
+    if not m:
+        raise ValueError(f"Bad constraint {text!r}: expected metric>=value or metric<=value")
+    return m.group(1), m.group(2), float(m.group(3))
+
+
+def evaluate(processes, params, algorithm="RR", secure=True, cpus=1):
+    """
+    Metrics of one configuration on `processes`: metrics.compute(), the
+    turnaround percentiles and the context switch count. Parameters
+    missing from `params` take their DEFAULTS.
+    """
+    params = dict(DEFAULTS, **params)
+    procs = [p.copy() for p in processes]
+    if secure:
+        procs = detect_and_mitigate(procs, burst_threshold=params["burst_threshold"],
+                                    priority_threshold=params["priority_threshold"])
+    result = run_scheduler(algorithm, procs, quantum=params["quantum"], cpus=cpus, instrumentation=True)
+    out = dict(result["metrics"])
+    out.update(metrics.turnaround_percentiles(result["processes"]))
+    out["context_switches"] = result["instrumentation"]["counters"]["context_switches"]
+    return out
+
+
+def detection_budget(constraints):
+    """True if `constraints` cap the detection rate, which tuning the thresholds requires."""
+    return any(name == "detection_rate" and op == "<=" for name, op, _ in constraints)
+
+
+def violation(values, constraints, scale=1.0):
+    """Sum of relative constraint violations (0 when every constraint holds)."""
+    total = 0.0
+    for name, op, bound in constraints:
+        value = values[name] * (scale if name in EXTENSIVE else 1.0)
+        miss = bound - value if op == ">=" else value - bound
+        if miss > 0:
+            total += miss / max(abs(bound), 1e-9)
+    return total
+
+
+def _sign(name):
+    return -1.0 if name in MAXIMIZE else 1.0
+
+
+def pareto_frontier(points, names):
+    """
+    Points (dicts with "metrics") not dominated on `names` (each minimized,
+    or maximized if in MAXIMIZE). Points with the same values on `names`
+    appear once, the first of them.
+    """
+    keyed = {}
+    for p in points:
+        keyed.setdefault(tuple(_sign(n) * p["metrics"][n] for n in names), p)
+    frontier = [p for key, p in keyed.items()
+                if not any(other != key and all(a <= b for a, b in zip(other, key)) for other in keyed)]
+    return sorted(frontier, key=lambda p: _sign(names[0]) * p["metrics"][names[0]])
+
+
+def tune(processes, objective="turnaround_p99", constraints=(), space=None, algorithm="RR", secure=True,
+         cpus=1, eta=3, min_fraction=1 / 27, min_processes=20, max_candidates=None, seed=0, memo=None,
+         progress=None):
+    """
+    Successive-halving search (see the module docstring).
+    constraints: (metric, op, value) tuples or "metric>=value" strings
+    space: {parameter: candidate values}; default SPACE, without the
+           thresholds when `secure` is off or no constraint caps
+           detection_rate (see the module docstring)
+    max_candidates: evaluate a random sample (seeded) of a larger grid
+    memo: dict of earlier evaluations of this workload, updated in place
+    progress: optional callback(evaluations done, evaluations planned)
+
+    Returns {"best", "baseline", "feasible", "frontier", "rungs",
+             "evaluations", "cache_hits"}, where best / baseline / frontier
+    entries are {"params", "metrics"} on the full workload.
+    """
+    constraints = [parse_constraint(c) if isinstance(c, str) else tuple(c) for c in constraints]
+    if eta < 2 or not 0 < min_fraction <= 1:
+        raise ValueError("eta must be >= 2 and min_fraction in (0, 1]")
+    if space is None:
+        space = {k: v for k, v in SPACE.items() if k not in THRESHOLDS or secure and detection_budget(constraints)}
+    elif secure and any(k in THRESHOLDS for k in space) and not detection_budget(constraints):
+        raise ValueError("Tuning the detector thresholds needs a detection_rate<=X constraint")
+    names = list(space)
+    procs = sorted(processes, key=lambda p: p.get("arrival_time", p.get("arrival", 0)))
+    n = len(procs)
+    if not n:
+        raise ValueError("Nothing to tune: the workload is empty")
+
+    grid = [dict(zip(names, values)) for values in product(*(space[k] for k in names))]
+    if max_candidates is not None and len(grid) > max_candidates:
+        grid = random.Random(seed).sample(grid, max_candidates)
+
+    # rung plan: window sizes and how many candidates each rung evaluates
+    plan = []
+    fraction, count = min_fraction, len(grid)
+    while True:
+        size = min(n, max(min_processes, round(n * fraction)))
+        plan.append((size, count))
+        if size == n:
+            break
+        count = max(1, math.ceil(count / eta))
+        fraction *= eta
+    planned = sum(count for _, count in plan) + 1
+
+    memo = {} if memo is None else memo
+    stats = {"evaluations": 0, "cache_hits": 0}
+
+    def measure(params, size):
+        key = (tuple((k, params[k]) for k in sorted(params)), size, algorithm, secure, cpus)
+        if key in memo:
+            stats["cache_hits"] += 1
+        else:
+            memo[key] = evaluate(procs[:size], params, algorithm, secure, cpus)
+        stats["evaluations"] += 1
+        if progress is not None:
+            progress(stats["evaluations"], planned)
+        return memo[key]
+
+    def rank(params, size):
+        values = measure(params, size)
+        return violation(values, constraints, n / size), _sign(objective) * values[objective]
+
+    candidates = grid
+    rungs = []
+    for size, _ in plan:
+        candidates = sorted(candidates, key=lambda c: rank(c, size))
+        rungs.append({"processes": size, "candidates": len(candidates), "leader": dict(candidates[0])})
+        if size < n:
+            candidates = candidates[:max(1, math.ceil(len(candidates) / eta))]
+
+    baseline = {k: DEFAULTS[k] for k in names if k in DEFAULTS}
+    baseline_values = measure(baseline, n)
+
+    full = []
+    for key, values in memo.items():
+        params, size = dict(key[0]), key[1]
+        if size == n and key[2:] == (algorithm, secure, cpus) and set(params) == set(names):
+            full.append({"params": {k: params[k] for k in names}, "metrics": values})
+    frontier_names = [objective] + [c[0] for c in constraints if c[0] != objective]
+    frontier_names += [m for m in FRONTIER_METRICS if m not in frontier_names]
+
+    best = candidates[0]
+    best_values = measure(best, n)
+    return {
+        "objective": objective,
+        "constraints": [f"{name}{op}{value:g}" for name, op, value in constraints],
+        "best": {"params": best, "metrics": best_values},
+        "feasible": violation(best_values, constraints) == 0,
+        "baseline": {"params": baseline, "metrics": baseline_values},
+        "frontier": pareto_frontier(full, frontier_names),
+        "rungs": rungs,
+        "evaluations": stats["evaluations"],
+        "cache_hits": stats["cache_hits"],
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SLO-driven tuning of the RR quantum and anomaly thresholds.")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--workload", help="workload file (.csv, .jsonl or .bin)")
+    src.add_argument("--generate", type=int, metavar="N", default=500, help="generate N random processes")
+    ap.add_argument("--seed", type=int, default=0, help="seed for --generate and candidate sampling")
+    ap.add_argument("--algorithm", type=str.upper, default="RR", choices=("RR", "STRIDE", "LOTTERY"))
+    ap.add_argument("--objective", default="turnaround_p99", help="metric to minimize (maximize for utilization)")
+    ap.add_argument("--constraint", action="append", default=[], metavar="METRIC>=X",
+                    help="e.g. cpu_utilization>=90 or context_switches<=5000 (repeatable)")
+    ap.add_argument("--no-secure", action="store_true", help="tune the quantum only, without the anomaly detector")
+    ap.add_argument("--quantum", type=int, nargs="+", help="candidate quanta (default: %s)" % (SPACE["quantum"],))
+    ap.add_argument("--cpus", type=int, default=1)
+    ap.add_argument("--eta", type=int, default=3, help="keep 1/eta of the candidates per rung (default 3)")
+    ap.add_argument("--min-fraction", type=float, default=1 / 27, help="workload share of the first rung")
+    ap.add_argument("--max-candidates", type=int, help="sample this many configurations from the grid")
+    ap.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = ap.parse_args(argv)
+
+    if args.workload:
+        from workload.loader import load_workload
+        try:
+            processes = load_workload(args.workload).to_dicts()
+        except (OSError, ValueError) as e:
+            ap.error(str(e))
+    else:
+        processes = generate_processes(num_processes=args.generate, seed=args.seed)
+    secure = not args.no_secure
+    try:
+        constraints = [parse_constraint(c) for c in args.constraint]
+    except ValueError as e:
+        ap.error(f"{e}")
+    space = {k: v for k, v in SPACE.items() if k not in THRESHOLDS or secure and detection_budget(constraints)}
+    if args.quantum:
+        space["quantum"] = tuple(args.quantum)
+    try:
+        report = tune(processes, args.objective, constraints, space, algorithm=args.algorithm, secure=secure,
+                      cpus=args.cpus, eta=args.eta, min_fraction=args.min_fraction,
+                      max_candidates=args.max_candidates, seed=args.seed)
+    except (KeyError, ValueError) as e:
+        ap.error(f"{e}")
+
+    if args.json:
+        print(json.dumps(report))
+        return 0
+    shown = [report["objective"]] + [m for m in ("cpu_utilization", "context_switches", "detection_rate")
+                                     if m != report["objective"] and (secure or m != "detection_rate")]
+
+    def line(entry):
+        params = " ".join(f"{k}={v}" for k, v in entry["params"].items())
+        return f"{params:<52} " + "  ".join(f"{m}={entry['metrics'][m]}" for m in shown)
+
+    print(f"{report['evaluations']} evaluations ({report['cache_hits']} memoized), "
+          f"rungs: {' -> '.join(str(r['candidates']) for r in report['rungs'])} candidates")
+    print(f"best ({'feasible' if report['feasible'] else 'no feasible configuration'}):")
+    print("  " + line(report["best"]))
+    print("defaults:")
+    print("  " + line(report["baseline"]))
+    print("frontier:")
+    for entry in report["frontier"]:
+        print("  " + line(entry))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
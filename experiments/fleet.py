@@ -0,0 +1,198 @@
+# experiments/fleet.py
+
+"""
+Sharded multi-tenant simulation.
+
+Simulates many independent machines (tenants), each with its own
+workload, across worker processes on one box:
+ - all workloads are packed once into a single multiprocessing
+   shared_memory block (int64 columns, see pack_fleet), which workers
+   attach by name instead of receiving pickled copies
+ - tenants are split into contiguous shards; each worker simulates its
+   shards with the event-driven engine and returns mergeable
+   MetricAccumulators (metrics.accumulators) instead of schedules
+ - the coordinator merges the accumulators into fleet-wide mean, stddev
+   and percentiles, per process and per machine
+
+Shared block layout (int64): offsets[T + 1] | arrival[N] | burst[N] | priority[N]
+where tenant t owns rows offsets[t]:offsets[t + 1].
+
+Usage (from the repository root):
+    python experiments/fleet.py --tenants 5000 --processes 40 --workers 8
+    python experiments/fleet.py --tenants 1000 --algorithm RR --quantum 2 --cpus 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_generator import generate_processes
+from scheduler.engine import simulate
+from metrics.accumulators import MetricAccumulator, merge_all
+from workload.columnar import Workload
+
+ITEM = 8                     # bytes per int64
+PROCESS_METRICS = ("waiting", "turnaround", "response")
+MACHINE_METRICS = ("average_waiting_time", "average_turnaround_time", "makespan", "cpu_utilization")
+
+
+# ---------------- shared workload block ----------------
+def pack_fleet(workloads):
+    """
+    Copy per-tenant Workloads into a new SharedMemory block.
+    Returns (shm, tenants, rows); the caller must close() and unlink() it.
+    """
+    workloads = list(workloads)
+    tenants = len(workloads)
+    rows = sum(len(w) for w in workloads)
+    shm = SharedMemory(create=True, size=max((tenants + 1 + 3 * rows) * ITEM, ITEM))
+    try:
+        view = shm.buf.cast("q")
+        pos = 0
+        for t, w in enumerate(workloads):
+            view[t] = pos
+            pos += len(w)
+        view[tenants] = pos
+        base = tenants + 1
+        for col, name in enumerate(("arrival", "burst", "priority")):
+            start = base + col * rows
+            for w in workloads:
+                n = len(w)
+                view[start:start + n] = getattr(w, name)
+                start += n
+        view.release()
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return shm, tenants, rows
+
+
+def tenant_processes(view, tenants, rows, t):
+    """Process dicts of tenant t from an attached int64 view."""
+    lo, hi = view[t], view[t + 1]
+    base = tenants + 1
+    arrival = view[base + lo:base + hi]
+    burst = view[base + rows + lo:base + rows + hi]
+    priority = view[base + 2 * rows + lo:base + 2 * rows + hi]
+    return [{"pid": f"P{i + 1}", "arrival": a, "burst": b, "priority": p}
+            for i, (a, b, p) in enumerate(zip(arrival, burst, priority))]
+
+
+# ---------------- workers ----------------
+def _new_accumulators(relative_accuracy):
+    acc = {f"process.{m}": MetricAccumulator(relative_accuracy) for m in PROCESS_METRICS}
+    acc.update({f"machine.{m}": MetricAccumulator(relative_accuracy) for m in MACHINE_METRICS})
+    return acc
+
+
+def simulate_tenant(processes, acc, policy, quantum, cpus):
+    """Simulate one machine and fold its results into `acc`."""
+    if not processes:
+        return
+    result = simulate(processes, policy, quantum=quantum, cpus=cpus)
+    total_wait = total_turn = busy = 0
+    for q in result["summary"]:
+        acc["process.waiting"].push(q["waiting"])
+        acc["process.turnaround"].push(q["turnaround"])
+        acc["process.response"].push(q["start"] - q["arrival"])
+        total_wait += q["waiting"]
+        total_turn += q["turnaround"]
+        busy += q["burst"]
+    n = len(result["summary"])
+    first = min(q["arrival"] for q in result["summary"])
+    makespan = max(q["finish"] for q in result["summary"]) - first
+    acc["machine.average_waiting_time"].push(total_wait / n)
+    acc["machine.average_turnaround_time"].push(total_turn / n)
+    acc["machine.makespan"].push(makespan)
+    acc["machine.cpu_utilization"].push(100.0 * busy / (makespan * cpus) if makespan > 0 else 0.0)
+
+
+def run_shard(task):
+    """Worker entry point: attach to the block and simulate tenants [lo, hi)."""
+    name, tenants, rows, lo, hi, policy, quantum, cpus, relative_accuracy = task
+    shm = SharedMemory(name=name)
+    try:
+        view = shm.buf.cast("q")
+        acc = _new_accumulators(relative_accuracy)
+        for t in range(lo, hi):
+            simulate_tenant(tenant_processes(view, tenants, rows, t), acc, policy, quantum, cpus)
+        view.release()
+    finally:
+        shm.close()
+    return acc
+
+
+# ---------------- coordinator ----------------
+def run_fleet(workloads, policy="FCFS", quantum=3, cpus=1, workers=None, shards_per_worker=4,
+              relative_accuracy=0.01, progress=None):
+    """
+    Simulate every tenant workload and return fleet-wide summaries:
+    {"tenants", "processes", "metrics": {name: {count, mean, stddev, min, max, p50, p90, p99}}}
+    """
+    workers = workers or os.cpu_count() or 1
+    shm, tenants, rows = pack_fleet(workloads)
+    try:
+        shards = max(1, min(tenants, workers * shards_per_worker))
+        bounds = [tenants * i // shards for i in range(shards + 1)]
+        tasks = [(shm.name, tenants, rows, bounds[i], bounds[i + 1], policy, quantum, cpus, relative_accuracy)
+                 for i in range(shards) if bounds[i] < bounds[i + 1]]
+        if workers == 1:
+            parts = []
+            for i, task in enumerate(tasks):
+                parts.append(run_shard(task))
+                if progress is not None:
+                    progress(i + 1, len(tasks))
+        else:
+            with get_context().Pool(workers) as pool:
+                parts = []
+                for i, part in enumerate(pool.imap_unordered(run_shard, tasks)):
+                    parts.append(part)
+                    if progress is not None:
+                        progress(i + 1, len(tasks))
+        merged = merge_all(parts)
+    finally:
+        shm.close()
+        shm.unlink()
+    return {
+        "tenants": tenants,
+        "processes": rows,
+        "metrics": {name: merged[name].summary() for name in sorted(merged)} if merged else {},
+    }
+
+
+def generate_fleet(tenants, processes, seed=0):
+    """Tenant t gets generate_processes(processes, seed=seed + t) as a Workload."""
+    return (Workload.from_dicts(generate_processes(num_processes=processes, seed=seed + t))
+            for t in range(tenants))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sharded multi-tenant scheduling simulation.")
+    ap.add_argument("--tenants", type=int, default=1000, help="machines to simulate")
+    ap.add_argument("--processes", type=int, default=20, help="processes per machine")
+    ap.add_argument("--algorithm", type=str.upper, default="FCFS",
+                    choices=["FCFS", "SJF", "SRTF", "RR", "PRIORITY"])
+    ap.add_argument("--quantum", type=int, default=3)
+    ap.add_argument("--cpus", type=int, default=1, help="CPUs per machine")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    report = run_fleet(generate_fleet(args.tenants, args.processes, args.seed), args.algorithm,
+                       quantum=args.quantum, cpus=args.cpus, workers=args.workers)
+    report["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
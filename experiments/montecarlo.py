@@ -0,0 +1,153 @@
+# experiments/montecarlo.py
+
+"""
+Adaptive Monte Carlo comparison of scheduling algorithms.
+
+A single generate_processes() draw says little about which algorithm is
+better, and a fixed replication count wastes time on pairs that are far
+apart. This runner:
+ - draws replication i from seed base_seed + i, and runs every selected
+   algorithm on that same workload (common random numbers), so paired
+   differences cancel most of the workload-to-workload noise
+ - keeps Welford running mean / variance of each metric and of each
+   paired difference, so no samples are stored
+ - stops a comparison (algorithm pair x metric) as soon as the confidence
+   interval half-width of its mean difference is below the target; an
+   algorithm stops being run once all of its comparisons are resolved
+
+Usage (from the repository root):
+    python experiments/montecarlo.py --algorithms FCFS SJF RR --target 0.25
+    python experiments/montecarlo.py --metrics average_waiting_time --processes 50 --confidence 0.99
+"""
+
+import argparse
+import os
+import sys
+from itertools import combinations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from process_generator import generate_processes
+from scheduler.fcfs import run_fcfs
+from scheduler.sjf import run_sjf
+from scheduler.srtf import run_srtf
+from scheduler.roundrobin import run_roundrobin
+from scheduler.priority import run_priority
+from security.anomaly_detector import detect_and_mitigate
+from metrics import metrics
+from metrics.accumulators import RunningStats
+
+RUNNERS = {
+    "FCFS": lambda procs, quantum: run_fcfs(procs),
+    "SJF": lambda procs, quantum: run_sjf(procs),
+    "SRTF": lambda procs, quantum: run_srtf(procs),
+    "RR": lambda procs, quantum: run_roundrobin(procs, quantum=quantum),
+    "PRIORITY": lambda procs, quantum: run_priority(procs),
+}
+DEFAULT_METRICS = ("average_waiting_time", "average_turnaround_time")
+
+
+def run_replication(algorithms, seed, num_processes, quantum=3, secure=False, metric_names=DEFAULT_METRICS):
+    """Run `algorithms` on the workload drawn from `seed`; returns {algorithm: {metric: value}}."""
+    workload = generate_processes(num_processes=num_processes, seed=seed)
+    if secure:
+        workload = detect_and_mitigate([p.copy() for p in workload])
+    out = {}
+    for algo in algorithms:
+        result = RUNNERS[algo]([p.copy() for p in workload], quantum)
+        m = metrics.compute(result["processes"])
+        out[algo] = {k: m[k] for k in metric_names}
+    return out
+
+
+def compare(algorithms, metric_names=DEFAULT_METRICS, target=0.5, confidence=0.95,
+            num_processes=20, quantum=3, secure=False, base_seed=0,
+            min_reps=10, max_reps=10000, progress=None):
+    """
+    Compare every pair of `algorithms` on every metric until the CI
+    half-width of each mean paired difference is below `target` (in metric
+    units) or max_reps replications have been run.
+
+    Returns {"replications", "per_algorithm": {algo: {metric: stats}},
+             "comparisons": [{"a", "b", "metric", "mean_diff", "half_width",
+                              "n", "resolved", "significant"}]}
+    where mean_diff is a - b.
+    """
+    algorithms = [a.upper() for a in algorithms]
+    for a in algorithms:
+        if a not in RUNNERS:
+            raise ValueError(f"Unknown algorithm: {a}")
+    if len(algorithms) < 2:
+        raise ValueError("Need at least two algorithms to compare")
+    if min_reps < 2:
+        raise ValueError("min_reps must be >= 2")
+
+    per_algo = {a: {m: RunningStats() for m in metric_names} for a in algorithms}
+    diffs = {(a, b, m): RunningStats() for a, b in combinations(algorithms, 2) for m in metric_names}
+    open_pairs = set(diffs)
+
+    reps = 0
+    while open_pairs and reps < max_reps:
+        active = sorted({a for a, b, _ in open_pairs} | {b for a, b, _ in open_pairs}, key=algorithms.index)
+        sample = run_replication(active, base_seed + reps, num_processes, quantum, secure, metric_names)
+        reps += 1
+        for a in active:
+            for m in metric_names:
+                per_algo[a][m].push(sample[a][m])
+        for key in list(open_pairs):
+            a, b, m = key
+            stats = diffs[key]
+            stats.push(sample[a][m] - sample[b][m])
+            if stats.n >= min_reps and stats.half_width(confidence) < target:
+                open_pairs.discard(key)
+        if progress is not None:
+            progress(reps, max_reps)
+
+    comparisons = []
+    for (a, b, m), stats in diffs.items():
+        hw = stats.half_width(confidence)
+        comparisons.append({
+            "a": a, "b": b, "metric": m,
+            "mean_diff": stats.mean,
+            "half_width": hw,
+            "n": stats.n,
+            "resolved": (a, b, m) not in open_pairs,
+            "significant": abs(stats.mean) > hw,
+        })
+    return {
+        "replications": reps,
+        "confidence": confidence,
+        "per_algorithm": {a: {m: s.to_dict(confidence) for m, s in ms.items()} for a, ms in per_algo.items()},
+        "comparisons": comparisons,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Adaptive Monte Carlo comparison of schedulers.")
+    ap.add_argument("--algorithms", nargs="+", type=str.upper, default=list(RUNNERS), choices=list(RUNNERS))
+    ap.add_argument("--metrics", nargs="+", default=list(DEFAULT_METRICS))
+    ap.add_argument("--target", type=float, default=0.5, help="CI half-width to stop at (metric units)")
+    ap.add_argument("--confidence", type=float, default=0.95)
+    ap.add_argument("--processes", type=int, default=20, help="processes per workload")
+    ap.add_argument("--quantum", type=int, default=3)
+    ap.add_argument("--secure", action="store_true")
+    ap.add_argument("--seed", type=int, default=0, help="seed of the first replication")
+    ap.add_argument("--min-reps", type=int, default=10)
+    ap.add_argument("--max-reps", type=int, default=10000)
+    args = ap.parse_args(argv)
+
+    report = compare(args.algorithms, args.metrics, target=args.target, confidence=args.confidence,
+                     num_processes=args.processes, quantum=args.quantum, secure=args.secure,
+                     base_seed=args.seed, min_reps=args.min_reps, max_reps=args.max_reps)
+    print(f"{report['replications']} replications")
+    for c in report["comparisons"]:
+        state = "resolved" if c["resolved"] else "open"
+        verdict = "significant" if c["significant"] else "not significant"
+        print(f"  {c['a']:>8} - {c['b']:<8} {c['metric']:<24} {c['mean_diff']:+9.3f} "
+              f"± {c['half_width']:.3f}  (n={c['n']}, {state}, {verdict})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,21 +6,230 @@ from tkinter import ttk, messagebox, filedialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import copy
+import queue
+import threading
+import time
 import traceback
+from contextlib import nullcontext
 
-# ----- Import Scheduler Algorithms -----
-from scheduler.fcfs import run_fcfs
-from scheduler.sjf import run_sjf
-from scheduler.srtf import run_srtf
-from scheduler.roundrobin import run_roundrobin
-from scheduler.priority import run_priority
+# ----- Import Scheduler Engine -----
+from scheduler.progress import SimulationCancelled, make_progress
+from scheduler import instrument
+from scheduler.cost_model import CostModel
+from scheduler.incremental import IncrementalSimulation
+from scheduler.workload_index import WorkloadIndex
 
 # ----- Import Security -----
 from security.anomaly_detector import detect_and_mitigate
 
+# ----- Import Trace Export / Playback -----
+from visualization.trace_export import export_trace
+from visualization.playback import SchedulePlayback
+
+# ----- Import Workload -----
+from workload.columnar import Workload
+from workload.loader import load_workload
+
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), "exports")
 os.makedirs(EXPORT_DIR, exist_ok=True)
 
+# GUI policy names, run on the engine (IncrementalSimulation); "All" runs them in this order
+ALGORITHMS = ("FCFS", "SJF", "SRTF", "Round Robin", "Priority")
+
+POLL_MS = 50    # how often the Tk loop drains the worker queue
+GANTT_LABEL_LIMIT = 50  # label bars and rows only on charts this small
+
+
+def gantt_rows(processes):
+    """
+    Group schedule segments into one Gantt row per pid, in order of first
+    appearance: {pid: {color: [(start, duration), ...]}}. Each color list
+    becomes a single broken_barh, so a chart costs a few artists per pid
+    instead of one per segment.
+    """
+    rows = {}
+    for p in processes:
+        if p.get("start") is None or p.get("finish") is None:
+            continue
+        color = "gray" if p.get("kind") == "overhead" else "red" if p.get("is_rogue") else "blue"
+        rows.setdefault(p["pid"], {}).setdefault(color, []).append((p["start"], p["finish"] - p["start"]))
+    return rows
+
+
+def draw_gantt(ax, processes):
+    """Draw `processes` on `ax` as a Gantt chart; returns the number of rows."""
+    rows = gantt_rows(processes)
+    labelled = sum(len(r) for bars in rows.values() for r in bars.values()) <= GANTT_LABEL_LIMIT
+    for idx, (pid, bars) in enumerate(rows.items()):
+        for color, ranges in bars.items():
+            ax.broken_barh(ranges, (idx * 10, 9), facecolors=color)
+            if labelled:
+                for start, _ in ranges:
+                    ax.text(start + 0.1, idx * 10 + 5, pid, color="white", fontsize=8, va="center")
+    if len(rows) <= GANTT_LABEL_LIMIT:
+        ax.set_yticks([i * 10 + 5 for i in range(len(rows))])
+        ax.set_yticklabels(list(rows))
+    else:
+        ax.set_yticks([])
+    return len(rows)
+
+
+class VirtualProcessTable:
+    """
+    Process table over a columnar Workload that only materializes the
+    visible rows. The Treeview holds at most `height` items; scrolling
+    rewrites their values in place instead of inserting one item per process.
+    """
+
+    COLUMNS = ("PID", "Arrival", "Burst", "Priority")
+
+    def __init__(self, master, workload, height=8):
+        self.workload = workload
+        self.height = height
+        self.offset = 0
+
+        self.frame = ttk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=self.COLUMNS, show="headings", height=height)
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100, anchor='center')
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scroll)
+        self.tree.pack(side="left", fill="x", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+        self.refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_workload(self, workload):
+        self.workload = workload
+        self.offset = 0
+        self.refresh()
+
+    def scroll(self, rows):
+        self.offset = max(0, min(self.offset + rows, len(self.workload) - self.height))
+        self.refresh()
+
+    def scroll_to_end(self):
+        self.offset = max(0, len(self.workload) - self.height)
+        self.refresh()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.workload))
+            self.scroll(0)
+        elif unit == "pages":
+            self.scroll(int(amount) * self.height)
+        else:
+            self.scroll(int(amount))
+
+    def refresh(self):
+        n = len(self.workload)
+        visible = range(self.offset, min(self.offset + self.height, n))
+        items = self.tree.get_children()
+        # grow / shrink the fixed pool of row items
+        for _ in range(len(visible) - len(items)):
+            self.tree.insert("", tk.END)
+        for iid in items[len(visible):]:
+            self.tree.delete(iid)
+        for iid, i in zip(self.tree.get_children(), visible):
+            self.tree.item(iid, values=self.workload.row(i))
+        if n:
+            self.scrollbar.set(self.offset / n, (self.offset + len(visible)) / n)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class PlaybackWindow:
+    """
+    Toplevel that animates finished schedules: play/pause, playback speed
+    (simulated time units per second) and a seek bar.
+    """
+
+    PLAYBACK_SECONDS = 20       # default speed plays the whole schedule in about this long
+
+    def __init__(self, root, results):
+        self.results = results
+        self.playback = None
+        self._syncing = False
+
+        self.win = tk.Toplevel(root)
+        self.win.title("Schedule Playback")
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self.win)
+        controls.pack(fill="x", padx=10, pady=6)
+        self.algo_var = tk.StringVar(value=next(iter(results)))
+        if len(results) > 1:
+            chooser = ttk.Combobox(controls, textvariable=self.algo_var, values=list(results), width=14, state="readonly")
+            chooser.pack(side="left", padx=4)
+            chooser.bind("<<ComboboxSelected>>", lambda e: self.load(self.algo_var.get()))
+        self.play_button = ttk.Button(controls, text="Play", command=self.toggle)
+        self.play_button.pack(side="left", padx=4)
+        ttk.Label(controls, text="Speed:").pack(side="left")
+        self.speed_scale = ttk.Scale(controls, from_=0.1, to=1.0, length=140, command=self.on_speed)
+        self.speed_scale.pack(side="left", padx=4)
+        self.speed_label = ttk.Label(controls, width=10)
+        self.speed_label.pack(side="left")
+        ttk.Label(controls, text="Seek:").pack(side="left")
+        self.seek_scale = ttk.Scale(controls, from_=0.0, to=1.0, command=self.on_seek)
+        self.seek_scale.pack(side="left", fill="x", expand=True, padx=4)
+
+        self.fig, self.ax = plt.subplots(figsize=(10, 4))
+        self.canvas = FigureCanvasTkAgg(self.fig, self.win)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self.load(self.algo_var.get())
+
+    def load(self, algo_name):
+        if self.playback is not None:
+            self.playback.close()
+        self.ax.clear()
+        self.ax.set_title(f"{algo_name} Playback")
+        self.playback = SchedulePlayback(self.fig, self.ax, self.results[algo_name], on_time=self.on_time)
+        tl = self.playback.timeline
+        span = max(tl.t_end - tl.t_start, 1)
+        self._syncing = True
+        self.seek_scale.config(from_=tl.t_start, to=tl.t_start + span)
+        self.seek_scale.set(tl.t_start)
+        self.speed_scale.config(from_=span / 1000, to=span / 2)
+        self.speed_scale.set(span / self.PLAYBACK_SECONDS)
+        self._syncing = False
+        self.playback.set_speed(span / self.PLAYBACK_SECONDS)
+        self.speed_label.config(text=f"{self.playback.speed:.2f}/s")
+        self.play_button.config(text="Play")
+        self.canvas.draw()
+
+    def toggle(self):
+        self.playback.toggle()
+        self.play_button.config(text="Pause" if self.playback.playing else "Play")
+
+    def on_speed(self, value):
+        if self._syncing:
+            return
+        self.playback.set_speed(value)
+        self.speed_label.config(text=f"{self.playback.speed:.2f}/s")
+
+    def on_seek(self, value):
+        if self._syncing:
+            return
+        self.playback.seek(float(value))
+
+    def on_time(self, t):
+        self._syncing = True
+        self.seek_scale.set(t)
+        self._syncing = False
+        if not self.playback.playing:
+            self.play_button.config(text="Play")
+
+    def close(self):
+        self.playback.close()
+        plt.close(self.fig)
+        self.win.destroy()
+
 
 class CPUSchedulerApp:
     def __init__(self, root):
@@ -28,10 +237,16 @@ class CPUSchedulerApp:
         root.title("Secure CPU Scheduler Simulator (GUI)")
         root.geometry("980x720")
 
-        self.process_list = []
+        self.workload = Workload()
         self.last_single_result = None      # store last single algorithm result
         self.last_all_results = None        # store dict for all-mode
         self.dark_mode = tk.BooleanVar(value=False)
+        self.worker = None                  # background simulation thread
+        self.worker_queue = None
+        self.cancel_event = None
+        # (algorithm, quantum, secure, costs) -> IncrementalSimulation of the
+        # current workload; rows added since its last run are spliced in
+        self.sim_cache = {}
 
         # ------------ INPUT FRAME ------------
         frame = ttk.LabelFrame(root, text="Add New Process")
@@ -50,13 +265,13 @@ class CPUSchedulerApp:
         self.priority_entry.grid(row=1, column=2)
 
         ttk.Button(frame, text="Add Process", command=self.add_process).grid(row=1, column=3, padx=8)
+        ttk.Button(frame, text="Import Workload...", command=self.import_workload).grid(row=1, column=4, padx=8)
+        self.count_label = ttk.Label(frame, text="0 processes")
+        self.count_label.grid(row=1, column=5, padx=8)
 
         # ------------ PROCESS TABLE ------------
-        self.tree = ttk.Treeview(root, columns=("PID", "Arrival", "Burst", "Priority"), show="headings", height=8)
-        for col in ("PID", "Arrival", "Burst", "Priority"):
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100, anchor='center')
-        self.tree.pack(fill="x", padx=10, pady=6)
+        self.table = VirtualProcessTable(root, self.workload, height=8)
+        self.table.pack(fill="x", padx=10, pady=6)
 
         # ------------ OPTIONS ------------
         opt = ttk.LabelFrame(root, text="Options")
@@ -76,12 +291,28 @@ class CPUSchedulerApp:
         self.quantum_entry = ttk.Entry(opt, width=6)
         self.quantum_entry.pack(side="left", padx=6)
 
+        ttk.Label(opt, text="Switch Cost:").pack(side="left")
+        self.switch_cost_entry = ttk.Entry(opt, width=6)
+        self.switch_cost_entry.pack(side="left", padx=6)
+
         self.security_var = tk.BooleanVar()
         ttk.Checkbutton(opt, text="Enable Security", variable=self.security_var).pack(side="left", padx=6)
 
         ttk.Checkbutton(opt, text="Dark Mode", variable=self.dark_mode, command=self.apply_dark_mode).pack(side="left", padx=6)
 
-        ttk.Button(opt, text="Run Scheduling", command=self.run_scheduler).pack(side="right", padx=6)
+        self.instrument_var = tk.BooleanVar()
+        ttk.Checkbutton(opt, text="Instrument", variable=self.instrument_var).pack(side="left", padx=6)
+
+        self.run_button = ttk.Button(opt, text="Run Scheduling", command=self.run_scheduler)
+        self.run_button.pack(side="right", padx=6)
+
+        # ------------ PROGRESS ------------
+        run_frame = ttk.Frame(root)
+        run_frame.pack(fill="x", padx=10, pady=2)
+        self.progress_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(run_frame, variable=self.progress_var, maximum=100).pack(side="left", fill="x", expand=True)
+        self.cancel_button = ttk.Button(run_frame, text="Cancel", command=self.cancel_run, state="disabled")
+        self.cancel_button.pack(side="right", padx=6)
 
         # ------------ METRICS & EXPORT FRAME ------------
         bottom = ttk.Frame(root)
@@ -98,6 +329,8 @@ class CPUSchedulerApp:
         export_frame.pack(fill="x", padx=6, pady=6)
         ttk.Button(export_frame, text="Export Metrics CSV", command=self.export_metrics_csv).pack(side="left", padx=4)
         ttk.Button(export_frame, text="Export Last Chart PNG", command=self.export_last_chart_png).pack(side="left", padx=4)
+        ttk.Button(export_frame, text="Export Trace", command=self.export_trace_file).pack(side="left", padx=4)
+        ttk.Button(export_frame, text="Playback", command=self.open_playback).pack(side="left", padx=4)
 
         # Right area: instructions and small preview placeholder
         info_frame = ttk.LabelFrame(bottom, text="Preview / Info")
@@ -113,10 +346,9 @@ class CPUSchedulerApp:
             burst = int(self.burst_entry.get())
             priority = int(self.priority_entry.get())
 
-            pid = f"P{len(self.process_list) + 1}"
-            proc = {"pid": pid, "arrival_time": arrival, "burst_time": burst, "priority": priority}
-            self.process_list.append(proc)
-            self.tree.insert("", tk.END, values=(pid, arrival, burst, priority))
+            self.workload.append(None, arrival, burst, priority)
+            self.table.scroll_to_end()
+            self.count_label.config(text=f"{len(self.workload)} processes")
 
             self.arrival_entry.delete(0, tk.END)
             self.burst_entry.delete(0, tk.END)
@@ -124,6 +356,39 @@ class CPUSchedulerApp:
         except ValueError:
             messagebox.showerror("Input Error", "Please enter valid integers for arrival/burst/priority.")
 
+    # ---------------- bulk import (parsed on the worker thread) ----------------
+    def import_workload(self):
+        if self.worker is not None:
+            return
+        path = filedialog.askopenfilename(
+            title="Import workload",
+            filetypes=[("Workload files", "*.csv *.jsonl *.bin"), ("CSV", "*.csv"),
+                       ("JSON lines", "*.jsonl"), ("Binary trace", "*.bin")]
+        )
+        if not path:
+            return
+        self._start_worker(self._load, (path,), f"Importing {os.path.basename(path)} ...")
+
+    def _load(self, path):
+        post = self.worker_queue.put
+        try:
+            workload = load_workload(path, progress=make_progress(lambda f: post(("progress", f)), self.cancel_event))
+        except SimulationCancelled:
+            post(("cancelled",))
+            return
+        except Exception as e:
+            traceback.print_exc()
+            post(("error", "Import Error", str(e)))
+            return
+        post(("loaded", workload))
+
+    def _set_workload(self, workload):
+        self.workload = workload
+        self.sim_cache = {}
+        self.table.set_workload(workload)
+        self.count_label.config(text=f"{len(workload)} processes")
+        self.preview_label.config(text=f"Loaded {len(workload)} processes.")
+
     # ---------------- normalize ----------------
     def normalize(self, plist):
         normalized = []
@@ -154,89 +419,169 @@ class CPUSchedulerApp:
 
     # ---------------- run scheduler ----------------
     def run_scheduler(self):
-        if not self.process_list:
+        if self.worker is not None:
+            return
+        if not len(self.workload):
             messagebox.showerror("Error", "Add at least one process.")
             return
         algo = self.algo_var.get()
         if algo == "":
             messagebox.showerror("Error", "Select an algorithm.")
             return
+        if algo != "All" and algo not in ALGORITHMS:
+            messagebox.showerror("Error", "Unknown algorithm selected.")
+            return
+        raw_q = self.quantum_entry.get().strip()
+        try:
+            q = 2 if raw_q == "" else int(raw_q)
+        except ValueError:
+            messagebox.showerror("Input Error", "Quantum must be an integer.")
+            return
+        raw_cost = self.switch_cost_entry.get().strip()
+        try:
+            switch_cost = 0.0 if raw_cost == "" else float(raw_cost)
+            cost_model = CostModel(context_switch=switch_cost) if switch_cost > 0 else None
+        except ValueError:
+            messagebox.showerror("Input Error", "Switch cost must be a non-negative number.")
+            return
 
-        base = self.normalize(copy.deepcopy(self.process_list))
-        if self.security_var.get():
+        # Snapshot the inputs; everything heavy happens on the worker thread
+        self._start_worker(self._simulate,
+                           (algo, self.workload.copy(), self.security_var.get(), q,
+                            self.instrument_var.get(), cost_model),
+                           f"Running: {algo} ...")
+
+    def _start_worker(self, target, args, status):
+        self.cancel_event = threading.Event()
+        self.worker_queue = queue.Queue()
+        self.worker = threading.Thread(target=target, args=args, daemon=True)
+        self.progress_var.set(0.0)
+        self.run_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.preview_label.config(text=status)
+        self.worker.start()
+        self.root.after(POLL_MS, self._poll_worker)
+
+    def cancel_run(self):
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.preview_label.config(text="Cancelling ...")
+
+    # ---------------- worker thread (never touches Tk) ----------------
+    def _simulate(self, algo, workload, secure, q, instrumented=False, cost_model=None):
+        post = self.worker_queue.put
+        base = self.normalize(workload.to_dicts())
+        security_ns = 0
+        if secure:
+            t0 = time.perf_counter_ns()
             try:
                 base = detect_and_mitigate(copy.deepcopy(base))
             except Exception:
                 traceback.print_exc()
-                messagebox.showerror("Security Error", "Security module error; check console.")
+                post(("error", "Security Error", "Security module error; check console."))
                 return
-
-        # ALL mode
-        if algo == "All":
-            algorithms = [
-                ("FCFS", run_fcfs),
-                ("SJF", run_sjf),
-                ("SRTF", run_srtf),
-                ("Round Robin", run_roundrobin),
-                ("Priority", run_priority)
-            ]
-            results = {}
-            metrics_summary = {}
-            for name, func in algorithms:
-                proc_copy = copy.deepcopy(base)
-                try:
-                    if name == "Round Robin":
-                        raw_q = self.quantum_entry.get().strip()
-                        if raw_q == "":
-                            q = 2
+            security_ns = time.perf_counter_ns() - t0
+
+        names = list(ALGORITHMS) if algo == "All" else [algo]
+        index = None        # WorkloadIndex shared by the policies that run from scratch
+        results = {}
+        metrics_summary = {}
+        probes = {}
+        name = algo
+        try:
+            for k, name in enumerate(names):
+                if self.cancel_event.is_set():
+                    raise SimulationCancelled()
+                callback = make_progress(lambda f: post(("progress", f)), self.cancel_event,
+                                         offset=k / len(names), scale=1 / len(names))
+                costs = None if cost_model is None else tuple(sorted(cost_model.to_dict().items()))
+                key = (name, q, secure, costs)
+                sim = self.sim_cache.get(key)
+                with instrument.instrumented() if instrumented else nullcontext() as probe:
+                    with instrument.phase("scheduling"):
+                        # the engine reproduces the run_* schedulers; rows are only
+                        # ever appended, so a cached run just splices in the new ones
+                        if sim is None or len(sim) > len(base):
+                            if index is None and len(names) > 1:
+                                index = WorkloadIndex(base)
+                            sim = IncrementalSimulation(base, name, quantum=q, cost_model=cost_model,
+                                                        progress=callback, index=index,
+                                                        cancel_event=self.cancel_event)
+                            self.sim_cache[key] = sim
                         else:
-                            q = int(raw_q)
-                        out = func(proc_copy, q)
-                    else:
-                        out = func(proc_copy)
-                except Exception:
-                    traceback.print_exc()
-                    messagebox.showerror("Scheduler Error", f"{name} failed; check console.")
-                    return
-                scheduled = out.get("processes", out)
-                results[name] = scheduled
-                metrics_summary[name] = self.compute_metrics(scheduled)
-            self.last_all_results = {"results": results, "metrics": metrics_summary}
-            self.update_metrics_text_all(metrics_summary)
-            self.show_all_charts(results)
+                            sim.add(base[len(sim):], progress=callback, cancel_event=self.cancel_event)
+                        out = sim.result()
+                    scheduled = out.get("processes", out)
+                    results[name] = scheduled
+                    with instrument.phase("metrics"):
+                        metrics_summary[name] = self.compute_metrics(scheduled)
+                if probe is not None:
+                    if secure:
+                        probe.phases_ns["security"] = security_ns
+                    probes[name] = probe
+        except SimulationCancelled:
+            post(("cancelled",))
+            return
+        except Exception:
+            traceback.print_exc()
+            if algo == "All":
+                post(("error", "Scheduler Error", f"{name} failed; check console."))
+            else:
+                post(("error", "Scheduler Error", "Scheduler execution failed; check console."))
             return
+        post(("done", algo, results, metrics_summary, probes))
 
-        # Single algorithm mode
+    # ---------------- poll worker results (Tk main thread) ----------------
+    def _poll_worker(self):
         try:
-            processes = copy.deepcopy(base)
-            if algo == "FCFS":
-                out = run_fcfs(processes)
-            elif algo == "SJF":
-                out = run_sjf(processes)
-            elif algo == "SRTF":
-                out = run_srtf(processes)
-            elif algo == "Round Robin":
-                raw_q = self.quantum_entry.get().strip()
-                if raw_q == "":
-                    q = 2
+            while True:
+                msg = self.worker_queue.get_nowait()
+                kind = msg[0]
+                if kind == "progress":
+                    self.progress_var.set(msg[1] * 100)
+                    continue
+                self._finish_run()
+                if kind == "done":
+                    self._show_run_results(*msg[1:])
+                elif kind == "loaded":
+                    self.progress_var.set(100.0)
+                    self._set_workload(msg[1])
+                elif kind == "cancelled":
+                    self.progress_var.set(0.0)
+                    self.preview_label.config(text="Run cancelled.")
                 else:
-                    q = int(raw_q)
-                out = run_roundrobin(processes, q)
-            elif algo == "Priority":
-                out = run_priority(processes)
-            else:
-                messagebox.showerror("Error", "Unknown algorithm selected.")
+                    self.preview_label.config(text="Run failed.")
+                    messagebox.showerror(msg[1], msg[2])
                 return
-        except Exception:
-            traceback.print_exc()
-            messagebox.showerror("Scheduler Error", "Scheduler execution failed; check console.")
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self._poll_worker)
+
+    def _finish_run(self):
+        self.worker = None
+        self.run_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+
+    def _show_run_results(self, algo, results, metrics_summary, probes):
+        self.progress_var.set(100.0)
+        t0 = time.perf_counter_ns()
+        # ALL mode
+        if algo == "All":
+            self.last_all_results = {"results": results, "metrics": metrics_summary}
+            self.show_all_charts(results)
+            render_ns = time.perf_counter_ns() - t0
+            self.update_metrics_text_all(metrics_summary, probes, render_ns if probes else None)
             return
 
-        scheduled = out.get("processes", out)
-        metrics = self.compute_metrics(scheduled)
+        # Single algorithm mode
+        scheduled = results[algo]
+        metrics = metrics_summary[algo]
         self.last_single_result = {"algo": algo, "processes": scheduled, "metrics": metrics}
-        self.update_metrics_text(metrics, algo)
         self.show_gantt(scheduled, algo)
+        probe = probes.get(algo)
+        if probe is not None:
+            probe.phases_ns["rendering"] = time.perf_counter_ns() - t0
+        self.update_metrics_text(metrics, algo, probe)
 
     # ---------------- compute metrics ----------------
     def compute_metrics(self, processes):
@@ -247,20 +592,31 @@ class CPUSchedulerApp:
         first_start = None
         last_finish = None
         detected = 0
+        # one entry per PID: engine runs emit a record per dispatch, so
+        # preempted processes (SRTF, Round Robin) have several segments
+        per_pid = {}
         for p in processes:
-            # skip terminated processes
-            if p.get("terminated"):
+            # skip terminated processes and dispatch overhead segments
+            if p.get("terminated") or p.get("kind") == "overhead":
                 continue
+            q = per_pid.get(p.get("pid"))
+            if q is None:
+                q = per_pid[p.get("pid")] = dict(p, ran=0)
+            if p.get("start") is not None and p.get("finish") is not None:
+                q["start"] = p["start"] if q.get("start") is None else min(q["start"], p["start"])
+                q["finish"] = p["finish"] if q.get("finish") is None else max(q["finish"], p["finish"])
+                q["ran"] += p["finish"] - p["start"]
+        for p in per_pid.values():
             n += 1
-            # waiting_time or fallback start-arrival
-            wt = p.get("waiting_time")
-            if wt is None or wt == 0:
-                if p.get("start") is not None and p.get("arrival_time") is not None:
-                    wt = p["start"] - p["arrival_time"]
             tt = p.get("turnaround_time")
             if tt is None or tt == 0:
                 if p.get("finish") is not None and p.get("arrival_time") is not None:
                     tt = p["finish"] - p["arrival_time"]
+            # waiting_time or fallback: time in the system not spent running
+            wt = p.get("waiting_time")
+            if wt is None or wt == 0:
+                if tt is not None and p.get("start") is not None:
+                    wt = tt - p["ran"]
             wt = wt if wt is not None else 0
             tt = tt if tt is not None else 0
             total_wait += wt
@@ -274,15 +630,26 @@ class CPUSchedulerApp:
                 if last_finish is None or p["finish"] > last_finish:
                     last_finish = p["finish"]
 
+        # overhead segments widen the timeline
+        for p in processes:
+            if p.get("kind") == "overhead":
+                first_start = p["start"] if first_start is None else min(first_start, p["start"])
+                last_finish = p["finish"] if last_finish is None else max(last_finish, p["finish"])
+
         avg_wait = (total_wait / n) if n else 0.0
         avg_turn = (total_turn / n) if n else 0.0
         total_time = (last_finish - first_start) if (first_start is not None and last_finish is not None) else 0.0
         throughput = (n / total_time) if total_time > 0 else 0.0
         busy_time = 0.0
+        overhead_time = 0.0
         for p in processes:
             if p.get("start") is not None and p.get("finish") is not None:
-                busy_time += (p["finish"] - p["start"])
-        cpu_util = (busy_time / total_time * 100) if total_time > 0 else 0.0
+                if p.get("kind") == "overhead":
+                    overhead_time += (p["finish"] - p["start"])
+                else:
+                    busy_time += (p["finish"] - p["start"])
+        cpu_util = ((busy_time + overhead_time) / total_time * 100) if total_time > 0 else 0.0
+        effective_util = (busy_time / total_time * 100) if total_time > 0 else 0.0
         detection_rate = (detected / n) if n else 0.0
 
         return {
@@ -290,20 +657,32 @@ class CPUSchedulerApp:
             "average_turnaround_time": round(avg_turn, 3),
             "throughput": round(throughput, 3),
             "cpu_utilization": round(cpu_util, 2),
+            "effective_cpu_utilization": round(effective_util, 2),
+            "overhead_time": round(overhead_time, 3),
             "detection_rate": round(detection_rate, 3)
         }
 
     # ---------------- update metrics text (single) ----------------
-    def update_metrics_text(self, metrics, algo_name):
+    def update_metrics_text(self, metrics, algo_name, probe=None):
         self.metrics_text.delete("1.0", tk.END)
         self.metrics_text.insert(tk.END, f"Algorithm: {algo_name}\n")
         self.metrics_text.insert(tk.END, "-" * 30 + "\n")
         for k, v in metrics.items():
             self.metrics_text.insert(tk.END, f"{k}: {v}\n")
+        if probe is not None:
+            self.insert_instrumentation(probe.report())
         self.preview_label.config(text=f"Last run: {algo_name}")
 
+    # ---------------- instrumentation counters / phase timings ----------------
+    def insert_instrumentation(self, report, indent=""):
+        self.metrics_text.insert(tk.END, f"{indent}[instrumentation]\n")
+        for k, v in report["counters"].items():
+            self.metrics_text.insert(tk.END, f"{indent}{k}: {v}\n")
+        for k, v in report["phases_ms"].items():
+            self.metrics_text.insert(tk.END, f"{indent}{k}_ms: {v}\n")
+
     # ---------------- update metrics text (all) ----------------
-    def update_metrics_text_all(self, metrics_summary):
+    def update_metrics_text_all(self, metrics_summary, probes=None, render_ns=None):
         self.metrics_text.delete("1.0", tk.END)
         self.metrics_text.insert(tk.END, "All Algorithms Metrics\n")
         self.metrics_text.insert(tk.END, "-" * 36 + "\n")
@@ -311,28 +690,21 @@ class CPUSchedulerApp:
             self.metrics_text.insert(tk.END, f"{algo}:\n")
             for k, v in met.items():
                 self.metrics_text.insert(tk.END, f"  {k}: {v}\n")
+            if probes and algo in probes:
+                self.insert_instrumentation(probes[algo].report(), indent="  ")
             self.metrics_text.insert(tk.END, "\n")
+        if render_ns is not None:
+            self.metrics_text.insert(tk.END, f"dashboard rendering_ms: {render_ns / 1e6:.3f}\n")
         self.preview_label.config(text="Last run: All algorithms")
 
     # ---------------- show single gantt ----------------
     def show_gantt(self, processes, algo_name):
         fig, ax = plt.subplots(figsize=(9, 3))
-        idx = 0
-        for p in processes:
-            if p.get("start") is None or p.get("finish") is None:
-                continue
-            duration = p["finish"] - p["start"]
-            color = "red" if p.get("is_rogue") else "blue"
-            ax.broken_barh([(p["start"], duration)], (idx * 10, 9), facecolors=color)
-            ax.text(p["start"] + 0.1, idx * 10 + 5, p["pid"], color="white", fontsize=8, va="center")
-            idx += 1
-
-        if idx == 0:
+        if not draw_gantt(ax, processes):
+            plt.close(fig)
             messagebox.showinfo("No Data", "No valid start/finish timings to plot.")
             return
 
-        ax.set_yticks([i * 10 + 5 for i in range(idx)])
-        ax.set_yticklabels([p["pid"] for p in processes if p.get("start") is not None])
         ax.set_xlabel("Time")
         ax.set_ylabel("Processes")
         ax.set_title(f"{algo_name} Scheduling")
@@ -365,17 +737,7 @@ class CPUSchedulerApp:
         self._last_all_figs = []
         for algo_name, processes in results.items():
             fig, ax = plt.subplots(figsize=(10, 3))
-            idx = 0
-            for p in processes:
-                if p.get("start") is None or p.get("finish") is None:
-                    continue
-                duration = p["finish"] - p["start"]
-                color = "red" if p.get("is_rogue") else "blue"
-                ax.broken_barh([(p["start"], duration)], (idx * 10, 9), facecolors=color)
-                ax.text(p["start"] + 0.1, idx * 10 + 5, p["pid"], color="white", fontsize=8)
-                idx += 1
-            ax.set_yticks([i * 10 + 5 for i in range(idx)])
-            ax.set_yticklabels([p["pid"] for p in processes if p.get("start")])
+            draw_gantt(ax, processes)
             ax.set_xlabel("Time")
             ax.set_ylabel("Processes")
             ax.set_title(f"{algo_name} Scheduling")
@@ -390,6 +752,17 @@ class CPUSchedulerApp:
         # store last_all_results for export metrics
         self._last_all_results = results
 
+    # ---------------- animated playback ----------------
+    def open_playback(self):
+        if self.last_single_result:
+            results = {self.last_single_result["algo"]: self.last_single_result["processes"]}
+        elif self.last_all_results:
+            results = self.last_all_results["results"]
+        else:
+            messagebox.showinfo("No Schedule", "No schedule available to play back. Run a simulation first.")
+            return
+        PlaybackWindow(self.root, results)
+
     # ---------------- export last chart png ----------------
     def export_last_chart_png(self):
         # prefer _last_fig if single; else allow saving all figs
@@ -418,6 +791,33 @@ class CPUSchedulerApp:
         else:
             messagebox.showinfo("No Chart", "No chart available to export. Run a simulation first.")
 
+    # ---------------- export chrome / perfetto trace ----------------
+    def export_trace_file(self):
+        filetypes = [("Chrome trace JSON", "*.json"), ("Perfetto trace", "*.pftrace")]
+        if self.last_single_result:
+            path = filedialog.asksaveasfilename(initialdir=EXPORT_DIR, defaultextension=".json",
+                                                filetypes=filetypes, title="Save schedule trace")
+            if not path:
+                return
+            try:
+                export_trace(self.last_single_result["processes"], path)
+                messagebox.showinfo("Saved", f"Trace saved to {path}")
+            except Exception:
+                traceback.print_exc()
+                messagebox.showerror("Error", "Failed to save trace. Check console.")
+        elif self.last_all_results:
+            dirpath = filedialog.askdirectory(initialdir=EXPORT_DIR, title="Select folder to save all traces")
+            if dirpath:
+                for name, processes in self.last_all_results["results"].items():
+                    safe_name = name.replace(" ", "_")
+                    try:
+                        export_trace(processes, os.path.join(dirpath, f"{safe_name}.json"))
+                    except Exception:
+                        traceback.print_exc()
+                messagebox.showinfo("Saved", f"All traces saved to {dirpath}")
+        else:
+            messagebox.showinfo("No Schedule", "No schedule available to export. Run a simulation first.")
+
     # ---------------- export metrics csv ----------------
     def export_metrics_csv(self):
         # prefer last_all_results metrics, else last_single_result
@@ -450,7 +850,8 @@ class CPUSchedulerApp:
                                             filetypes=[("CSV files", "*.csv")], title="Save metrics CSV")
         if not path:
             return
-        keys = ["algorithm", "average_waiting_time", "average_turnaround_time", "throughput", "cpu_utilization", "detection_rate"]
+        keys = ["algorithm", "average_waiting_time", "average_turnaround_time", "throughput", "cpu_utilization",
+                "effective_cpu_utilization", "overhead_time", "detection_rate"]
         try:
             with open(path, "w", newline="") as f:
                 writer = csv.DictWriter(f, fieldnames=keys)
@@ -1,57 +1,231 @@
 # main.py
-from process_generator import generate_processes
-from scheduler import fcfs, sjf, srtf, rr, priority
+
+"""
+Secure Process Scheduler Simulator - batch command line.
+
+Reads a workload file (CSV / JSONL / binary trace, see workload.loader) or
+generates a seeded random workload, runs the chosen algorithms and writes
+one JSON line of metrics per algorithm to stdout. matplotlib is imported
+only when --plot is given, so metrics-only runs start quickly.
+
+Examples:
+    python main.py --generate 1000 --seed 7 --algorithms FCFS RR --quantum 2
+    python main.py --workload data/trace.csv --secure --switch-cost 0.5
+    python main.py --batch 5000 --cpus 64 --utilization 0.9 --algorithms EASY CONSERVATIVE
+    python main.py --interactive
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from process_generator import generate_processes, generate_periodic_tasks, generate_batch_jobs
+from scheduler import fcfs, sjf, srtf, roundrobin, priority, edf, rate_monotonic, schedulability
+from scheduler import stride, lottery
+from scheduler import backfill, gang, instrument, engine
+from scheduler.cost_model import CostModel
+from scheduler.power_model import GOVERNORS, PowerModel
+from scheduler.workload_index import WorkloadIndex, simulate_indexed
 from security import anomaly_detector
 from metrics import metrics
-from visualization import charts
 
-def run_scheduler(algorithm, processes, quantum=3, secure=False):
+ALGORITHMS = ("FCFS", "SJF", "SRTF", "RR", "PRIORITY")
+REALTIME = ("EDF", "RM")        # deadline-driven; run only when named explicitly
+PROPORTIONAL = ("STRIDE", "LOTTERY")   # ticket-based; run only when named explicitly
+BATCH = ("EASY", "CONSERVATIVE")      # rigid multi-CPU jobs; run only when named explicitly
+PARALLEL = ("GANG",)            # multi-threaded gangs; run only when named explicitly
+EXPLICIT = REALTIME + PROPORTIONAL + BATCH + PARALLEL
+EXPLICIT_NAMES = " / ".join(EXPLICIT)
+
+def run_scheduler(algorithm, processes, quantum=3, secure=False,
+                  instrumentation=False, profile=False, trace_memory=False,
+                  cost_model=None, cpus=1, checkpoint_path=None, checkpoint_every=10000,
+                  seed=None, memory_budget=None, spill_dir=None, index=None, workers=1, power_model=None,
+                  packing="first_fit"):
     """
     Run the selected scheduler with optional security.
     Returns a dict with process results.
+
+    cost_model / cpus: run on the event-driven engine, charging dispatch
+                       overhead (scheduler.cost_model.CostModel) and/or
+                       scheduling across several CPUs
+    power_model: run on the engine with DVFS / C-states and energy
+                 accounting (scheduler.power_model.PowerModel); the metrics
+                 then include total energy, energy per process and the
+                 energy-delay product
+    Processes with CPU / I/O "bursts" also run on the engine, and the
+    metrics then include device utilization and I/O overlap.
+    STRIDE / LOTTERY: proportional share with tickets from priority; the
+                      metrics include the deviation from the ideal share.
+                      `seed` seeds the lottery draws.
+    checkpoint_path: run on the engine, checkpointing there every
+                     `checkpoint_every` steps; if the file already exists the
+                     run resumes from it. It is removed once the run completes.
+    memory_budget: keep at most this many bytes of segments in memory and
+                   spill the rest to compressed chunks in `spill_dir`;
+                   result["processes"] is then a SegmentStore (see
+                   scheduler.segment_store), which the caller should close().
+                   Not supported for the EXPLICIT algorithms or with checkpoints.
+    index: scheduler.workload_index.WorkloadIndex of `processes`, built once
+           and shared by the runs of several algorithms (after the security
+           layer: `secure` is not applied again). FCFS / SJF / SRTF / RR /
+           PRIORITY then run on the engine from the index, and on one CPU
+           their busy periods are spread over `workers` processes.
+    EASY / CONSERVATIVE: backfilling of rigid batch jobs (each needing the
+                         "cpus" field's CPUs at once) on `cpus` CPUs, see
+                         scheduler.backfill. The metrics include utilization,
+                         bounded slowdown and the backfilled job count, next
+                         to the same figures for strict FCFS as the baseline.
+    GANG: gang scheduling of processes with "threads" on an Ousterhout
+          matrix of `cpus` columns and slots of `quantum` (scheduler.gang,
+          gangs placed by `packing`). The metrics include fragmentation and
+          gang idle time, and the throughput, turnaround and utilization of
+          the same threads scheduled independently (RR) for comparison.
+
+    instrumentation: add result["instrumentation"] with hot-path counters
+                     and per-phase timings (see scheduler.instrument)
+    profile / trace_memory: also capture a cProfile summary / tracemalloc peak
     """
+    options = dict(cost_model=cost_model, cpus=cpus, checkpoint_path=checkpoint_path,
+                   checkpoint_every=checkpoint_every, seed=seed, memory_budget=memory_budget,
+                   spill_dir=spill_dir, index=index, workers=workers, power_model=power_model, packing=packing)
+    if not (instrumentation or profile or trace_memory):
+        return _run_scheduler(algorithm, processes, quantum, secure, **options)
+    with instrument.instrumented(profile=profile, trace_memory=trace_memory) as probe:
+        result = _run_scheduler(algorithm, processes, quantum, secure, **options)
+    result["instrumentation"] = probe.report()
+    return result
+
+def _run_scheduler(algorithm, processes, quantum, secure, cost_model=None, cpus=1,
+                   checkpoint_path=None, checkpoint_every=10000, seed=None, memory_budget=None,
+                   spill_dir=None, index=None, workers=1, power_model=None, packing="first_fit"):
     # Copy list to avoid mutation
     proc_copy = [p.copy() for p in processes]
 
     # Apply security layer if needed
-    if secure:
-        proc_copy = anomaly_detector.detect_and_mitigate(proc_copy)
+    if secure and index is None:
+        with instrument.phase("security"):
+            proc_copy = anomaly_detector.detect_and_mitigate(proc_copy)
 
     # Select scheduler
-    if algorithm == "FCFS":
-        result = fcfs.run_fcfs(proc_copy)
-    elif algorithm == "SJF":
-        result = sjf.run_sjf(proc_copy)
-    elif algorithm == "SRTF":
-        result = srtf.run_srtf(proc_copy)
-    elif algorithm == "RR":
-        result = rr.run_rr(proc_copy, quantum=quantum)
-    elif algorithm == "PRIORITY":
-        result = priority.run_priority(proc_copy)
-    else:
+    if algorithm not in ALGORITHMS + EXPLICIT:
         raise ValueError("Invalid algorithm")
+    if memory_budget is not None and (algorithm in EXPLICIT or checkpoint_path is not None):
+        raise ValueError(f"memory_budget is not supported for {EXPLICIT_NAMES} or with checkpoints")
+    if index is not None and (algorithm in EXPLICIT or checkpoint_path is not None or memory_budget is not None):
+        raise ValueError("index is only used for the classic algorithms, without checkpoints or a memory budget")
+    if power_model is not None and algorithm in EXPLICIT:
+        raise ValueError(f"power_model is not supported for {EXPLICIT_NAMES}")
+    with instrument.phase("scheduling"):
+        if algorithm == "EDF":
+            result = edf.run_edf(proc_copy)
+        elif algorithm == "RM":
+            result = rate_monotonic.run_rate_monotonic(proc_copy)
+        elif algorithm == "STRIDE":
+            result = stride.run_stride(proc_copy, quantum=quantum)
+        elif algorithm == "LOTTERY":
+            result = lottery.run_lottery(proc_copy, quantum=quantum, seed=seed)
+        elif algorithm in BATCH:
+            result = backfill.run_backfill(proc_copy, cpus=cpus, mode=algorithm.lower())
+            result["baseline"] = backfill.run_backfill(proc_copy, cpus=cpus, mode="fcfs")["batch"]
+        elif algorithm in PARALLEL:
+            result = gang.run_gang(proc_copy, cpus=cpus, quantum=quantum, packing=packing)
+            independent = gang.run_independent(proc_copy, cpus=cpus, quantum=quantum)
+            result["baseline"] = metrics.compute(independent["processes"], num_cpus=cpus)
+        elif checkpoint_path is not None:
+            if os.path.exists(checkpoint_path):
+                result = engine.resume(checkpoint_path, checkpoint_every=checkpoint_every)
+            else:
+                result = engine.simulate(proc_copy, algorithm, quantum=quantum, cpus=cpus, cost_model=cost_model,
+                                         checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+                                         power_model=power_model)
+            if os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+        elif index is not None:
+            result = simulate_indexed(index, algorithm, quantum=quantum, cpus=cpus, cost_model=cost_model,
+                                      workers=workers, power_model=power_model)
+        elif algorithm == "RR" and memory_budget is not None and cost_model is None and cpus == 1 \
+                and not any(p.get("bursts") for p in proc_copy):
+            result = roundrobin.run_roundrobin(proc_copy, quantum=quantum, memory_budget=memory_budget,
+                                               spill_dir=spill_dir)
+        elif (cost_model is not None or cpus > 1 or memory_budget is not None or power_model is not None
+              or any(p.get("bursts") for p in proc_copy)):
+            result = engine.simulate(proc_copy, algorithm, quantum=quantum, cpus=cpus, cost_model=cost_model,
+                                     memory_budget=memory_budget, spill_dir=spill_dir, power_model=power_model)
+        elif algorithm == "FCFS":
+            result = fcfs.run_fcfs(proc_copy)
+        elif algorithm == "SJF":
+            result = sjf.run_sjf(proc_copy)
+        elif algorithm == "SRTF":
+            result = srtf.run_srtf(proc_copy)
+        elif algorithm == "RR":
+            result = roundrobin.run_roundrobin(proc_copy, quantum=quantum)
+        else:
+            result = priority.run_priority(proc_copy)
 
     # Compute metrics
-    result["metrics"] = metrics.compute(result["processes"])
+    with instrument.phase("metrics"):
+        idle_energy = result["energy"]["idle"] if "energy" in result else 0.0
+        result["metrics"] = metrics.compute(result["processes"], num_cpus=cpus, idle_energy=idle_energy)
+        if "jobs" in result:
+            result["metrics"].update(metrics.deadline_metrics(result["jobs"]))
+        if "shares" in result:
+            result["metrics"]["max_share_deviation"] = result["shares"]["max_abs_deviation"]
+            result["metrics"]["mean_share_deviation"] = result["shares"]["mean_abs_deviation"]
+        if "batch" in result:
+            result["metrics"].update(result["batch"])
+            for key in ("utilization", "mean_bounded_slowdown", "max_bounded_slowdown", "makespan"):
+                result["metrics"][f"fcfs_{key}"] = result["baseline"][key]
+        if "gang" in result:
+            result["metrics"].update(result["gang"])
+            for key in ("throughput", "average_turnaround_time", "cpu_utilization"):
+                result["metrics"][f"independent_{key}"] = result["baseline"][key]
+        if "io_segments" in result:
+            result["metrics"].update(metrics.io_utilization(
+                result["processes"], result["io_segments"], num_devices=result["devices"]))
     return result
 
 def display_results(result, algorithm):
     print(f"\n===== {algorithm} Scheduling Results =====")
     print("PID | Arrival | Burst | Priority | Waiting | Turnaround | Rogue | Terminated")
     for p in result["processes"]:
-        print(f"{p['pid']:>3} | {p['arrival']:>7} | {p['burst']:>5} | {p.get('priority',0):>8} | "
+        print(f"{p['pid']:>3} | {p.get('arrival', p.get('arrival_time')):>7} | "
+              f"{p.get('burst', p.get('burst_time')):>5} | {p.get('priority',0):>8} | "
               f"{p.get('waiting',0):>7} | {p.get('turnaround',0):>10} | "
               f"{str(p.get('is_rogue',False)):>5} | {str(p.get('terminated',False)):>10}")
 
     print("\n📈 Metrics:")
     for k, v in result["metrics"].items():
-        print(f"  {k}: {v:.2f}")
+        if isinstance(v, dict):
+            for d, u in v.items():
+                print(f"  {k}[{d}]: {u:.2f}")
+        else:
+            print(f"  {k}: {v:.2f}")
+
+    report = result.get("instrumentation")
+    if report:
+        print("\n⏱ Instrumentation:")
+        for k, v in report["counters"].items():
+            print(f"  {k}: {v}")
+        for k, v in report["phases_ms"].items():
+            print(f"  {k}_ms: {v}")
+        if "peak_memory_kb" in report:
+            print(f"  peak_memory_kb: {report['peak_memory_kb']}")
+        if "profile" in report:
+            print(report["profile"])
 
-    # Visualization
+    # Visualization (matplotlib is only loaded here)
+    from visualization import charts
+    t0 = time.perf_counter_ns()
     charts.plot_gantt_chart(result["processes"], title=f"{algorithm} Gantt Chart")
     charts.plot_metrics_dashboard(result["metrics"], algorithm_name=algorithm)
+    if report:
+        report["phases_ms"]["rendering"] = round((time.perf_counter_ns() - t0) / 1e6, 3)
+        print(f"  rendering_ms: {report['phases_ms']['rendering']}")
 
-if __name__ == "__main__":
+def interactive():
     print("🔹 Secure Process Scheduler Simulator 🔹")
 
     # User input
@@ -78,3 +252,149 @@ if __name__ == "__main__":
     display_results(result, algorithm)
 
     print("\n✅ Simulation complete!")
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="Run CPU schedulers in batch and print metrics as JSON lines.")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--workload", help="workload file (.csv, .jsonl or .bin)")
+    src.add_argument("--generate", type=int, metavar="N", default=6,
+                     help="generate N random processes (default 6)")
+    src.add_argument("--periodic", type=int, metavar="N",
+                     help="generate N periodic tasks (for EDF / RM), see --utilization")
+    src.add_argument("--batch", type=int, metavar="N",
+                     help="generate N rigid multi-CPU batch jobs (for EASY / CONSERVATIVE) for --cpus CPUs, "
+                          "offering --utilization as the load")
+    ap.add_argument("--seed", type=int, help="seed for --generate")
+    ap.add_argument("--io-bursts", type=int, default=0, metavar="K",
+                    help="give generated processes up to K I/O bursts each")
+    ap.add_argument("--devices", type=int, default=1, help="I/O devices for --io-bursts (default 1)")
+    ap.add_argument("--threads", type=int, default=1, metavar="K",
+                    help="give generated processes up to K threads each (for GANG)")
+    ap.add_argument("--utilization", type=float, default=0.7,
+                    help="total utilization for --periodic, offered load for --batch")
+    ap.add_argument("--algorithms", nargs="+", default=["ALL"], type=str.upper,
+                    choices=ALGORITHMS + EXPLICIT + ("ALL",),
+                    help=f"algorithms to run (default ALL = all but {EXPLICIT_NAMES})")
+    ap.add_argument("--precheck", action="store_true",
+                    help="for EDF / RM, skip task sets that fail the schedulability test")
+    ap.add_argument("--quantum", type=int, default=3, help="Round Robin time quantum (default 3)")
+    ap.add_argument("--packing", choices=gang.PACKINGS, default="first_fit",
+                    help="where GANG places arriving gangs in the matrix (default first_fit)")
+    ap.add_argument("--secure", action="store_true", help="apply the anomaly detector first")
+    ap.add_argument("--cpus", type=int, default=1, help="CPUs (more than 1 uses the event-driven engine)")
+    ap.add_argument("--switch-cost", type=float, default=0.0, help="context-switch overhead per dispatch")
+    ap.add_argument("--cache-refill", type=float, default=0.0, help="full cache-refill penalty")
+    ap.add_argument("--cache-decay", type=float, default=10.0, help="cache warmth decay time")
+    ap.add_argument("--migration", type=float, default=0.0, help="CPU migration penalty")
+    ap.add_argument("--governor", choices=sorted(GOVERNORS),
+                    help="model DVFS / C-states with this frequency governor and report energy")
+    ap.add_argument("--checkpoint-dir", metavar="DIR",
+                    help="checkpoint each run to DIR/<ALGORITHM>.ckpt and resume from it if present")
+    ap.add_argument("--checkpoint-every", type=int, default=10000, metavar="STEPS",
+                    help="engine steps between checkpoints (default 10000)")
+    ap.add_argument("--memory-budget", type=float, metavar="MB",
+                    help="keep at most MB of segments in memory, spilling the rest to disk")
+    ap.add_argument("--spill-dir", metavar="DIR", help="directory for spilled segments (default: system temp)")
+    ap.add_argument("--workers", type=int, default=1, metavar="N",
+                    help="processes to spread single-CPU busy periods over on the engine (0 = all cores)")
+    ap.add_argument("--instrument", action="store_true", help="include hot-path counters and phase timings")
+    ap.add_argument("--plot", action="store_true", help="also print result tables and show charts")
+    ap.add_argument("--interactive", action="store_true", help="prompt for inputs (legacy mode)")
+    return ap
+
+def main(argv=None):
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    if args.interactive:
+        interactive()
+        return 0
+
+    if args.workload:
+        from workload.loader import load_workload
+        try:
+            processes = load_workload(args.workload).to_dicts()
+        except (OSError, ValueError) as e:
+            ap.error(str(e))
+    elif args.periodic:
+        processes = generate_periodic_tasks(args.periodic, args.utilization, seed=args.seed)
+    elif args.batch:
+        processes = generate_batch_jobs(args.batch, cpus=args.cpus, load=args.utilization, seed=args.seed)
+    else:
+        processes = generate_processes(num_processes=args.generate, seed=args.seed,
+                                       io_bursts=args.io_bursts, devices=args.devices, threads=args.threads)
+
+    cost_model = None
+    if args.switch_cost or args.cache_refill or args.migration:
+        cost_model = CostModel(context_switch=args.switch_cost, cache_refill=args.cache_refill,
+                               cache_decay=args.cache_decay, migration=args.migration)
+
+    power_model = PowerModel(governor=args.governor) if args.governor else None
+
+    algorithms = ALGORITHMS if "ALL" in args.algorithms else args.algorithms
+    if power_model is not None and any(a in EXPLICIT for a in algorithms):
+        ap.error(f"--governor is not supported for {EXPLICIT_NAMES}")
+    if args.checkpoint_dir and any(a in EXPLICIT for a in algorithms):
+        ap.error(f"--checkpoint-dir is not supported for {EXPLICIT_NAMES}")
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+    memory_budget = None
+    if args.memory_budget is not None:
+        if args.checkpoint_dir or any(a in EXPLICIT for a in algorithms):
+            ap.error(f"--memory-budget is not supported with --checkpoint-dir or for {EXPLICIT_NAMES}")
+        memory_budget = int(args.memory_budget * 1024 * 1024)
+
+    # runs bound for the engine share one normalized, presorted index
+    index = None
+    on_engine = (cost_model is not None or power_model is not None or args.cpus > 1 or args.workers != 1
+                 or any(p.get("bursts") for p in processes))
+    if on_engine and any(a in ALGORITHMS for a in algorithms) and not args.checkpoint_dir and memory_budget is None:
+        base = processes
+        if args.secure:
+            base = anomaly_detector.detect_and_mitigate([p.copy() for p in processes])
+        index = WorkloadIndex(base)
+    out = sys.stdout
+    for algorithm in algorithms:
+        if args.precheck and algorithm in REALTIME:
+            report = schedulability.check(processes, algorithm)
+            if report["schedulable"] is False:
+                out.write(json.dumps({"algorithm": algorithm, "num_processes": len(processes),
+                                      "schedulability": report}, separators=(",", ":")) + "\n")
+                out.flush()
+                continue
+        checkpoint_path = None
+        if args.checkpoint_dir:
+            checkpoint_path = os.path.join(args.checkpoint_dir, f"{algorithm}.ckpt")
+        result = run_scheduler(algorithm, processes, quantum=args.quantum, secure=args.secure,
+                               instrumentation=args.instrument, cost_model=cost_model, cpus=args.cpus,
+                               checkpoint_path=checkpoint_path, checkpoint_every=args.checkpoint_every,
+                               seed=args.seed, memory_budget=memory_budget, spill_dir=args.spill_dir,
+                               index=index if algorithm in ALGORITHMS else None, workers=args.workers,
+                               power_model=power_model, packing=args.packing)
+        record = {
+            "algorithm": algorithm,
+            "num_processes": len(processes),
+            "secure": args.secure,
+            "cpus": args.cpus,
+            "metrics": result["metrics"],
+        }
+        if algorithm in ("RR", "STRIDE", "LOTTERY", "GANG"):
+            record["quantum"] = args.quantum
+        if algorithm in PARALLEL:
+            record["packing"] = args.packing
+        if power_model is not None:
+            record["governor"] = args.governor
+        if "instrumentation" in result:
+            record["instrumentation"] = result["instrumentation"]
+        if memory_budget is not None:
+            record["segment_store"] = result["processes"].stats()
+            record["peak_rss_kb"] = instrument.peak_rss_kb()
+        out.write(json.dumps(record, separators=(",", ":")) + "\n")
+        out.flush()
+        if args.plot:
+            display_results(result, algorithm)
+        if memory_budget is not None:
+            result["processes"].close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# metrics/accumulators.py
+
+"""
+Mergeable metric accumulators.
+
+Partial results computed in different processes (or on different
+replications) can be combined without keeping the samples:
+ - RunningStats: Welford mean / variance / min / max; merge() uses Chan's
+   parallel update, so merging shards gives the same moments as one pass
+ - QuantileSketch: log-bucketed histogram with a relative-accuracy
+   guarantee (DDSketch); merging adds bucket counts, so fleet-wide
+   percentiles do not depend on how the samples were sharded
+ - MetricAccumulator: both, for one metric
+
+All of them are plain picklable objects.
+"""
+
+import math
+from statistics import NormalDist
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+def t_quantile(p, df):
+    """
+    Student-t quantile via the Cornish-Fisher expansion of the normal
+    quantile (Abramowitz & Stegun 26.7.5); accurate to ~1e-3 for df >= 5.
+    """
+    z = NormalDist().inv_cdf(p)
+    z2 = z * z
+    g1 = (z2 + 1) * z / 4
+    g2 = ((5 * z2 + 16) * z2 + 3) * z / 96
+    g3 = (((3 * z2 + 19) * z2 + 17) * z2 - 15) * z / 384
+    g4 = ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) * z / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+class RunningStats:
+    """Welford's online mean and variance, plus min and max."""
+
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        """Fold `other` into self (Chan et al. pairwise update)."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else float("inf")
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def half_width(self, confidence=0.95):
+        """Half-width of the Student-t confidence interval on the mean."""
+        if self.n < 2:
+            return float("inf")
+        return t_quantile(0.5 + confidence / 2, self.n - 1) * self.stddev / math.sqrt(self.n)
+
+    def to_dict(self, confidence=0.95):
+        return {"n": self.n, "mean": self.mean, "stddev": self.stddev if self.n > 1 else None,
+                "half_width": self.half_width(confidence) if self.n > 1 else None}
+
+
+class QuantileSketch:
+    """
+    Quantiles within `relative_accuracy` of the true sample value.
+
+    Positive and negative values go to logarithmic buckets of ratio
+    gamma = (1 + a) / (1 - a); values with |x| < min_value count as zero.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-9):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0
+        self.count = 0
+
+    def _key(self, x):
+        return math.ceil(math.log(x) / self._log_gamma)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def push(self, x, n=1):
+        self.count += n
+        if x > self.min_value:
+            k = self._key(x)
+            self.positive[k] = self.positive.get(k, 0) + n
+        elif x < -self.min_value:
+            k = self._key(-x)
+            self.negative[k] = self.negative.get(k, 0) + n
+        else:
+            self.zero += n
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for k, c in other.positive.items():
+            self.positive[k] = self.positive.get(k, 0) + c
+        for k, c in other.negative.items():
+            self.negative[k] = self.negative.get(k, 0) + c
+        self.zero += other.zero
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q in [0, 1]; None when empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.positive))
+
+
+class MetricAccumulator:
+    """Moments and quantile sketch of one metric."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def push(self, x):
+        self.stats.push(x)
+        self.sketch.push(x)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def summary(self, percentiles=DEFAULT_PERCENTILES):
+        s = self.stats
+        out = {"count": s.n}
+        if s.n:
+            out.update({"mean": round(s.mean, 3), "stddev": round(s.stddev, 3) if s.n > 1 else 0.0,
+                        "min": s.min, "max": s.max})
+            for p in percentiles:
+                out[f"p{p:g}"] = round(self.sketch.quantile(p / 100), 3)
+        return out
+
+
+def merge_all(accumulator_maps):
+    """Merge a sequence of {name: accumulator} dicts into one dict."""
+    merged = {}
+    for acc in accumulator_maps:
+        for name, a in acc.items():
+            if name in merged:
+                merged[name].merge(a)
+            else:
+                merged[name] = a
+    return merged
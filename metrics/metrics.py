@@ -7,28 +7,68 @@ This module computes:
  - average_waiting_time
  - average_turnaround_time
  - throughput (processes per unit time)
- - cpu_utilization (percentage, 0..100)
+ - cpu_utilization (percentage, 0..100) - raw busy time, dispatch overhead included
+ - effective_cpu_utilization (percentage, 0..100) - useful work only
+ - overhead_time (time charged as context-switch / cache / migration overhead)
  - detection_rate (fraction of processes flagged as rogue)
+ - with a power model (segments carrying "energy"): total_energy (active
+   plus idle), energy_per_process (joules per job) and
+   energy_delay_product (energy per job * average turnaround time)
+
+io_utilization() reports device utilization and CPU / I/O overlap for
+engine runs with I/O bursts; deadline_metrics() reports deadline misses,
+lateness percentiles and jitter for the real-time schedulers;
+turnaround_percentiles() reports tail turnaround times.
 
 Compatible input forms:
  - Per-process single-record outputs (start/finish present)
  - Multi-segment outputs (Round Robin) where each segment is a dict with pid/start/finish
+ - Engine outputs, where segments with "kind": "overhead" are dispatch overhead
+   and segments may carry a "cpu" index
  - Uses keys: pid, arrival_time or arrival, burst_time or burst, start, finish, is_rogue
+ - Optional io_time (time blocked on I/O; the largest value over a PID's
+   segments, as engine segments carry the I/O time accrued so far) is not
+   counted as waiting, nor is stretch (time a segment ran longer because
+   of a lower CPU frequency)
+ - Any iterable of segments, e.g. a scheduler.segment_store.SegmentStore:
+   compute() makes one pass and keeps O(1) state per PID, not per segment
 """
 
-def compute(processes):
+def compute(processes, num_cpus=None, idle_energy=0.0):
+    """
+    num_cpus: CPUs the timeline ran on; defaults to the number of distinct
+    "cpu" values in the input (1 for single-CPU schedulers)
+    idle_energy: energy of idle CPUs, which no segment carries
+    (result["energy"]["idle"] of an engine run with a power model)
+    """
     if not processes:
         return {
             "average_waiting_time": 0.0,
             "average_turnaround_time": 0.0,
             "throughput": 0.0,
             "cpu_utilization": 0.0,
+            "effective_cpu_utilization": 0.0,
+            "overhead_time": 0.0,
             "detection_rate": 0.0
         }
 
-    # Group segments / entries by PID
+    # Group segments / entries by PID; overhead segments only add busy time
     grouped = {}
+    overhead_time = 0.0
+    overhead_bounds = None
+    cpus_seen = set()
+    energy = None
     for p in processes:
+        cpus_seen.add(p.get("cpu", 0))
+        if "energy" in p:
+            energy = (energy or 0.0) + p["energy"]
+        if p.get("kind") == "overhead":
+            overhead_time += max(0, p["finish"] - p["start"])
+            if overhead_bounds is None:
+                overhead_bounds = (p["start"], p["finish"])
+            else:
+                overhead_bounds = (min(overhead_bounds[0], p["start"]), max(overhead_bounds[1], p["finish"]))
+            continue
         pid = p.get("pid") or str(p.get("pid", "unknown"))
         if pid not in grouped:
             grouped[pid] = {
@@ -36,11 +76,24 @@ def compute(processes):
                 "burst_time": p.get("burst_time", p.get("burst", 0)),
                 "priority": p.get("priority", None),
                 "is_rogue": bool(p.get("is_rogue", False)),
-                "segments": []   # (start, finish) pairs
+                "io_time": p.get("io_time", 0),
+                "first": None,   # earliest (start, finish) segment
+                "last": None,    # latest (start, finish) segment
+                "busy": 0.0,
+                "stretch": 0
             }
-        # collect segment if available
+        grouped[pid]["stretch"] += p.get("stretch", 0)
+        if "io_time" in p:
+            grouped[pid]["io_time"] = max(grouped[pid]["io_time"], p["io_time"])
+        # fold in the segment if available
         if p.get("start") is not None and p.get("finish") is not None:
-            grouped[pid]["segments"].append((p["start"], p["finish"]))
+            info = grouped[pid]
+            seg = (p["start"], p["finish"])
+            if info["first"] is None or seg < info["first"]:
+                info["first"] = seg
+            if info["last"] is None or seg > info["last"]:
+                info["last"] = seg
+            info["busy"] += max(0, seg[1] - seg[0])
 
     # Compute per-process waiting & turnaround using segments when possible
     total_wait = 0.0
@@ -60,17 +113,13 @@ def compute(processes):
             # If arrival missing, assume 0
             arrival = 0
 
-        segments = sorted(info["segments"])
-
-        if segments:
+        if info["first"] is not None:
             # compute process completion and waiting based on segments
-            start_first = segments[0][0]
-            finish_last = segments[-1][1]
+            start_first = info["first"][0]
+            finish_last = info["last"][1]
             turnaround = finish_last - arrival
-            waiting = turnaround - burst
-            # accumulate busy time from segments
-            for s, f in segments:
-                busy_time += max(0, f - s)
+            waiting = turnaround - burst - info["io_time"] - info["stretch"]
+            busy_time += info["busy"]
             completed = True
         else:
             # No segments: fallback - assume process executed once from arrival for burst_time
@@ -98,6 +147,13 @@ def compute(processes):
         if last_finish is None or finish_last > last_finish:
             last_finish = finish_last
 
+    # overhead segments belong to the timeline too
+    if overhead_bounds is not None:
+        if first_arrival is None or overhead_bounds[0] < first_arrival:
+            first_arrival = overhead_bounds[0]
+        if last_finish is None or overhead_bounds[1] > last_finish:
+            last_finish = overhead_bounds[1]
+
     # safety for timeline
     if first_arrival is None:
         first_arrival = 0
@@ -111,22 +167,150 @@ def compute(processes):
         total_sim_time = max(sum_bursts, 1.0)
 
     n = len(grouped)
+    if num_cpus is None:
+        num_cpus = max(len(cpus_seen), 1)
     avg_wait = (total_wait / n) if n else 0.0
     avg_turn = (total_turn / n) if n else 0.0
     throughput = (completed_count / total_sim_time) if total_sim_time > 0 else 0.0
-    cpu_util = (busy_time / total_sim_time) * 100.0
-    # clamp cpu_util between 0 and 100
-    if cpu_util < 0:
-        cpu_util = 0.0
-    if cpu_util > 100:
-        cpu_util = 100.0
+    capacity = total_sim_time * num_cpus
+    # clamp utilizations between 0 and 100
+    cpu_util = min(max((busy_time + overhead_time) / capacity * 100.0, 0.0), 100.0)
+    effective_util = min(max(busy_time / capacity * 100.0, 0.0), 100.0)
 
     detection_rate = (rogue_count / n) if n else 0.0
 
-    return {
+    out = {
         "average_waiting_time": round(avg_wait, 3),
         "average_turnaround_time": round(avg_turn, 3),
         "throughput": round(throughput, 3),
         "cpu_utilization": round(cpu_util, 2),
+        "effective_cpu_utilization": round(effective_util, 2),
+        "overhead_time": round(overhead_time, 3),
         "detection_rate": round(detection_rate, 3)
     }
+    if energy is not None:
+        total_energy = energy + idle_energy
+        per_process = (total_energy / n) if n else 0.0
+        out["total_energy"] = round(total_energy, 3)
+        out["energy_per_process"] = round(per_process, 3)
+        out["energy_delay_product"] = round(per_process * avg_turn, 3)
+    return out
+
+
+def io_utilization(processes, io_segments, num_devices=None):
+    """
+    Device utilization and CPU / I/O overlap for an engine result with
+    I/O bursts (result["processes"], result["io_segments"]).
+
+    Returns:
+     - device_utilization: {device: percentage of the timeline busy}
+     - io_overlap: percentage of the timeline with a CPU and a device both busy
+     - average_io_time: mean time per process blocked on I/O (queueing + service)
+    """
+    cpu_iv = [(p["start"], p["finish"]) for p in processes
+              if p.get("start") is not None and p.get("finish") is not None]
+    io_iv = [(s["start"], s["finish"]) for s in io_segments]
+    if num_devices is None:
+        num_devices = max((s["device"] for s in io_segments), default=-1) + 1
+    if not cpu_iv and not io_iv:
+        return {"device_utilization": {d: 0.0 for d in range(num_devices)},
+                "io_overlap": 0.0, "average_io_time": 0.0}
+
+    begin = min(s for s, _ in cpu_iv + io_iv)
+    end = max(f for _, f in cpu_iv + io_iv)
+    span = max(end - begin, 1e-12)
+
+    busy = [0.0] * num_devices
+    for s in io_segments:
+        busy[s["device"]] += s["finish"] - s["start"]
+
+    # sweep: time with >= 1 CPU interval and >= 1 I/O interval open
+    points = [(s, 0, 1) for s, f in cpu_iv] + [(f, 0, -1) for s, f in cpu_iv]
+    points += [(s, 1, 1) for s, f in io_iv] + [(f, 1, -1) for s, f in io_iv]
+    points.sort()
+    open_count = [0, 0]
+    overlap = 0.0
+    last = begin
+    for t, kind, delta in points:
+        if open_count[0] and open_count[1]:
+            overlap += t - last
+        last = t
+        open_count[kind] += delta
+
+    io_time = {}
+    for p in processes:
+        if "io_time" in p:
+            io_time[p["pid"]] = p["io_time"]
+    return {
+        "device_utilization": {d: round(min(busy[d] / span * 100.0, 100.0), 2) for d in range(num_devices)},
+        "io_overlap": round(overlap / span * 100.0, 2),
+        "average_io_time": round(sum(io_time.values()) / len(io_time), 3) if io_time else 0.0,
+    }
+
+
+def _percentile(sorted_values, q):
+    """Linear-interpolated percentile (q in 0..100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def turnaround_percentiles(processes, percentiles=(50, 90, 99)):
+    """
+    turnaround_pXX: percentiles of per-process turnaround (last finish -
+    arrival), from the same segment forms compute() accepts.
+    """
+    bounds = {}
+    for p in processes:
+        if p.get("kind") == "overhead" or p.get("finish") is None:
+            continue
+        pid = p.get("pid")
+        arrival = p.get("arrival_time", p.get("arrival", 0)) or 0
+        finish = bounds[pid][1] if pid in bounds else None
+        bounds[pid] = (arrival, p["finish"] if finish is None else max(finish, p["finish"]))
+    turnaround = sorted(finish - arrival for arrival, finish in bounds.values())
+    return {f"turnaround_p{q}": round(_percentile(turnaround, q), 3) for q in percentiles}
+
+
+def deadline_metrics(jobs, percentiles=(50, 90, 99)):
+    """
+    Deadline metrics for real-time runs (result["jobs"] of run_edf /
+    run_rate_monotonic). Jobs without a deadline are ignored.
+
+     - deadline_miss_ratio: fraction of jobs finishing after their deadline
+     - lateness_pXX / max_lateness: lateness = finish - deadline (negative = early)
+     - response_jitter: max - min response time per task, averaged over tasks
+       (max_response_jitter: worst task)
+     - start_jitter: max - min release-to-start delay per task, averaged
+    """
+    jobs = [j for j in jobs if j["deadline"] != float("inf")]
+    if not jobs:
+        out = {"deadline_miss_ratio": 0.0, "max_lateness": 0.0, "response_jitter": 0.0,
+               "max_response_jitter": 0.0, "start_jitter": 0.0}
+        out.update({f"lateness_p{q}": 0.0 for q in percentiles})
+        return out
+
+    lateness = sorted(j["lateness"] for j in jobs)
+    missed = sum(1 for j in jobs if j["missed"])
+    per_task = {}
+    for j in jobs:
+        r = j["response"]
+        s = j["start"] - j["release"]
+        lo_r, hi_r, lo_s, hi_s = per_task.get(j["task"], (r, r, s, s))
+        per_task[j["task"]] = (min(lo_r, r), max(hi_r, r), min(lo_s, s), max(hi_s, s))
+    response_jitter = [hi - lo for lo, hi, _, _ in per_task.values()]
+    start_jitter = [hi - lo for _, _, lo, hi in per_task.values()]
+
+    out = {
+        "deadline_miss_ratio": round(missed / len(jobs), 4),
+        "max_lateness": round(lateness[-1], 3),
+        "response_jitter": round(sum(response_jitter) / len(response_jitter), 3),
+        "max_response_jitter": round(max(response_jitter), 3),
+        "start_jitter": round(sum(start_jitter) / len(start_jitter), 3),
+    }
+    for q in percentiles:
+        out[f"lateness_p{q}"] = round(_percentile(lateness, q), 3)
+    return out
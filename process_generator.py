@@ -1,22 +1,110 @@
 import random
 
-def generate_processes(num_processes=6):
-    """Automatically generate random processes."""
+def generate_processes(num_processes=6, seed=None, io_bursts=0, devices=1, threads=1):
+    """
+    Automatically generate random processes.
+    seed: make the workload reproducible (uses a private random.Random)
+    io_bursts: if > 0, each process gets 0..io_bursts I/O bursts between CPU
+               bursts ("bursts" = [cpu, io, ..., cpu]) on random devices
+               0..devices-1 ("devices"); "burst" is the total CPU time
+    threads: if > 1, each process gets 1..threads "threads" that must run
+             together (for gang scheduling, scheduler.gang)
+    """
+    rng = random if seed is None else random.Random(seed)
     processes = []
     for i in range(num_processes):
         pid = f"P{i+1}"
-        arrival = random.randint(0, 5)
-        burst = random.randint(2, 8)
-        priority = random.randint(1, 3)
-        processes.append({
+        arrival = rng.randint(0, 5)
+        burst = rng.randint(2, 8)
+        priority = rng.randint(1, 3)
+        proc = {
             "pid": pid,
             "arrival": arrival,
             "burst": burst,
             "priority": priority
-        })
+        }
+        if io_bursts > 0:
+            bursts = [burst]
+            proc["devices"] = []
+            for _ in range(rng.randint(0, io_bursts)):
+                bursts += [rng.randint(2, 10), rng.randint(1, 8)]
+                proc["devices"].append(rng.randrange(devices))
+            proc["bursts"] = bursts
+            proc["burst"] = sum(bursts[0::2])
+        if threads > 1:
+            proc["threads"] = rng.randint(1, threads)
+        processes.append(proc)
     return processes
 
 
+PERIODS = (10, 20, 25, 40, 50, 100, 200)     # divisors of 200: hyperperiod stays <= 200
+
+
+def generate_periodic_tasks(num_tasks=5, utilization=0.7, seed=None, constrained=False):
+    """
+    Random periodic task set for the real-time schedulers.
+    Per-task utilizations come from UUniFast (uniform over the simplex summing
+    to `utilization`); periods are drawn from PERIODS and bursts rounded to
+    at least 1, so the realized utilization is close to the target.
+    constrained: draw deadlines in [burst, period] instead of deadline = period
+    (a task with burst > period, possible once utilization > 1, keeps its period)
+    """
+    rng = random if seed is None else random.Random(seed)
+    shares = []
+    remaining = utilization
+    for i in range(1, num_tasks):
+        nxt = remaining * rng.random() ** (1 / (num_tasks - i))
+        shares.append(remaining - nxt)
+        remaining = nxt
+    shares.append(remaining)
+
+    tasks = []
+    for i, u in enumerate(shares):
+        period = rng.choice(PERIODS)
+        burst = max(1, round(u * period))
+        task = {
+            "pid": f"T{i+1}",
+            "arrival": 0,
+            "burst": burst,
+            "priority": rng.randint(1, 3),
+            "period": period,
+            "deadline": rng.randint(min(burst, period), period) if constrained else period
+        }
+        tasks.append(task)
+    return tasks
+
+
+def generate_batch_jobs(num_jobs=100, cpus=64, load=0.9, seed=None, overestimate=3.0):
+    """
+    Random rigid batch jobs for the backfilling schedulers (scheduler.backfill).
+    Widths ("cpus") are powers of two up to `cpus`, smaller ones more likely;
+    runtimes are log-uniform from 1 to 1000; each "estimate" is the runtime
+    times a factor uniform in [1, overestimate]. Poisson arrivals are spaced
+    for an offered load of `load` on `cpus` CPUs.
+    """
+    rng = random if seed is None else random.Random(seed)
+    widths = [1 << k for k in range(cpus.bit_length()) if 1 << k <= cpus]
+    weights = [1 / (k + 1) for k in range(len(widths))]
+    jobs = []
+    for i in range(num_jobs):
+        width = rng.choices(widths, weights)[0]
+        burst = max(1, round(10 ** rng.uniform(0, 3)))
+        jobs.append({
+            "pid": f"J{i+1}",
+            "burst": burst,
+            "priority": rng.randint(1, 3),
+            "cpus": width,
+            "estimate": max(burst, round(burst * rng.uniform(1, overestimate)))
+        })
+    mean_work = sum(j["burst"] * j["cpus"] for j in jobs) / max(num_jobs, 1)
+    gap = mean_work / (cpus * load)
+    t = 0.0
+    for job in jobs:
+        job["arrival"] = round(t)
+        t += rng.expovariate(1 / gap)
+    return jobs
+
+
 def generate_processes_manual():
     """Take process details manually from user."""
     processes = []
@@ -0,0 +1,352 @@
+# scheduler/backfill.py
+
+"""
+Batch scheduling of rigid multi-CPU jobs with backfilling.
+
+Batch fields on a process:
+ - cpus: CPUs the job needs for its whole run (default 1)
+ - estimate: the user's runtime estimate (default: the burst). As on a
+   real batch system, a job still running at its estimate is killed then
+   (marked "terminated")
+
+Jobs queue in arrival order. Future CPU availability is an availability
+Profile: a step function of free CPUs over time, kept as sorted
+breakpoint lists, built from the estimated ends of running jobs (and,
+for conservative backfilling, every queued job's reservation).
+ - fcfs: strict FCFS; the queue head blocks every job behind it
+ - easy: EASY backfilling (Lifka). Only the head gets a reservation, at
+   the "shadow time" when enough running jobs will have ended; a later
+   job may start now if it fits in the free CPUs and either ends by the
+   shadow time or only uses CPUs the head will not need ("extra" CPUs).
+   The profile then only holds running jobs, so free CPUs never decrease
+   over time and the shadow time is a binary search: O(log n)
+ - conservative: every job gets a reservation when it arrives, at the
+   earliest start that delays no earlier reservation. When a job ends
+   before its estimate, reservations are recomputed in queue order, so
+   jobs only ever move earlier. Each recomputation scans the profile once
+   per queued job, so long queues make this mode much slower than EASY
+
+Output:
+ - result["processes"]: one segment per allocated CPU of every job (pid,
+   start, finish, "cpu", "cpus" = job width), so metrics.compute sees
+   the true busy time
+ - result["summary"]: one dict per job with start, finish, waiting,
+   turnaround, bounded_slowdown, backfilled and terminated
+ - result["batch"]: utilization (%), mean / max bounded slowdown
+   (max(1, response / max(runtime, SLOWDOWN_TAU))), backfilled (jobs
+   that started ahead of an earlier queued job), killed and makespan
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+
+from scheduler import instrument
+
+MODES = ("fcfs", "easy", "conservative")
+SLOWDOWN_TAU = 10       # runtimes below this count as this long in bounded slowdown
+
+
+class Profile:
+    """
+    Free CPUs over time: free[i] CPUs during [times[i], times[i + 1]), and
+    free[-1] from times[-1] on. Point lookups are bisections.
+    """
+
+    def __init__(self, cpus, now=0):
+        self.cpus = cpus
+        self.times = [now]
+        self.free = [cpus]
+
+    def __len__(self):
+        return len(self.times)
+
+    def advance(self, now):
+        """Drop the breakpoints before `now`."""
+        i = bisect_right(self.times, now) - 1
+        if i > 0:
+            del self.times[:i]
+            del self.free[:i]
+        self.times[0] = now
+
+    def free_at(self, t):
+        return self.free[bisect_right(self.times, t) - 1]
+
+    def _split(self, t):
+        """Index of a breakpoint at t, inserting one if needed."""
+        i = bisect_left(self.times, t)
+        if i < len(self.times) and self.times[i] == t:
+            return i
+        self.times.insert(i, t)
+        self.free.insert(i, self.free[i - 1])
+        return i
+
+    def reserve(self, start, end, k):
+        """Take k CPUs over [start, end)."""
+        self._change(start, end, -k)
+
+    def release(self, start, end, k):
+        """Give back k CPUs over [start, end)."""
+        self._change(start, end, k)
+
+    def _change(self, start, end, k):
+        if end <= start or not k:
+            return
+        lo = self._split(start)
+        hi = self._split(end)
+        free = self.free
+        for i in range(lo, hi):
+            free[i] += k
+        # coalesce equal neighbours at both ends, so the profile stays as
+        # small as the number of distinct steps
+        if hi < len(free) and free[hi] == free[hi - 1]:
+            del self.times[hi], free[hi]
+        if lo > 0 and free[lo] == free[lo - 1]:
+            del self.times[lo], free[lo]
+
+    def shadow(self, k):
+        """
+        First time from which k CPUs stay free, for a profile whose free
+        CPUs never decrease over time (running jobs only): a binary search.
+        Returns (time, free CPUs then).
+        """
+        i = bisect_left(self.free, k)
+        return self.times[i], self.free[i]
+
+    def earliest(self, now, duration, k, limit=None):
+        """
+        Earliest start >= now with k CPUs free for `duration`, in one pass
+        over the breakpoints; None if there is none before `limit`.
+        """
+        times, free = self.times, self.free
+        j = bisect_right(times, now) - 1
+        start = now
+        last = len(times) - 1
+        while True:
+            if limit is not None and start >= limit:
+                return None
+            if free[j] < k:
+                j += 1
+                start = times[j]
+            elif j == last or times[j + 1] >= start + duration:
+                return start
+            else:
+                j += 1
+
+
+def job_fields(p, cpus):
+    """(arrival, burst, width, estimate) of a job, validated against the machine size."""
+    arrival = p.get("arrival_time", p.get("arrival", 0))
+    burst = p.get("burst_time", p.get("burst", 0))
+    width = p.get("cpus", 1)
+    estimate = p.get("estimate", burst)
+    if width < 1 or int(width) != width:
+        raise ValueError(f"{p.get('pid')}: cpus must be a positive integer")
+    if width > cpus:
+        raise ValueError(f"{p.get('pid')}: needs {width} CPUs, the machine has {cpus}")
+    if estimate < 0 or burst < 0:
+        raise ValueError(f"{p.get('pid')}: burst and estimate must be non-negative")
+    return arrival, burst, int(width), estimate
+
+
+def bounded_slowdown(response, runtime, tau=SLOWDOWN_TAU):
+    return max(1.0, response / max(runtime, tau))
+
+
+def run_backfill(processes, cpus=1, mode="easy", progress=None):
+    """
+    Batch scheduling of rigid jobs on `cpus` CPUs (see the module docstring).
+    mode: "fcfs", "easy" or "conservative"
+    progress: optional callback(completed, total) invoked as jobs finish
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown backfilling mode {mode!r}")
+    if cpus < 1:
+        raise ValueError("cpus must be >= 1")
+    fields = [job_fields(p, cpus) for p in processes]
+    order = sorted(range(len(processes)), key=lambda i: fields[i][0])
+    n = len(order)
+    arrival = [fields[i][0] for i in order]
+    width = [fields[i][2] for i in order]
+    estimate = [fields[i][3] for i in order]
+    runtime = [min(fields[i][1], fields[i][3]) for i in order]
+    start = [None] * n
+    reserved = [None] * n           # conservative: reserved start of each queued job
+    backfilled = [False] * n
+
+    probe = instrument.active
+    profile = Profile(cpus, arrival[0] if n else 0)
+    free_ids = list(range(cpus - 1, -1, -1))    # CPU ids, lowest on top
+    free_now = cpus
+    ending = []                     # heap of (actual end, job, cpu ids)
+    due = []                        # conservative: heap of (reserved start, job); stale entries skipped
+    queue = deque()                 # waiting jobs in arrival order
+    queued_widths = Counter()       # widths in the queue, to skip hopeless backfill scans
+    segments = []
+    completed = 0
+    nxt = 0
+
+    def launch(j, now):
+        nonlocal free_now
+        start[j] = now
+        free_now -= width[j]
+        queued_widths[width[j]] -= 1
+        if not queued_widths[width[j]]:
+            del queued_widths[width[j]]
+        ids = free_ids[-width[j]:]
+        del free_ids[-width[j]:]
+        if mode != "conservative":
+            profile.reserve(now, now + estimate[j], width[j])
+        p = processes[order[j]]
+        end = now + runtime[j]
+        for cpu in ids:
+            segments.append({
+                "pid": p["pid"],
+                "arrival_time": arrival[j],
+                "burst_time": runtime[j],
+                "priority": p.get("priority", 1),
+                "start": now,
+                "finish": end,
+                "cpu": cpu,
+                "cpus": width[j],
+                "is_rogue": p.get("is_rogue", False),
+                "throttled": p.get("throttled", False),
+                "terminated": p.get("terminated", False) or runtime[j] < fields[order[j]][1]
+            })
+        heapq.heappush(ending, (end, j, ids))
+        if probe is not None:
+            probe.count("context_switches")
+            probe.count("heap_pushes")
+
+    def start_ready(now):
+        """Start every queued job the policy allows at `now`; returns the jobs left waiting."""
+        if mode == "conservative":
+            if not due or due[0][0] > now:
+                return queue
+            while due and due[0][0] <= now:
+                heapq.heappop(due)
+            waiting = deque()
+            for j in queue:
+                if reserved[j] <= now:
+                    backfilled[j] = bool(waiting)
+                    launch(j, now)
+                else:
+                    waiting.append(j)
+            return waiting
+
+        while queue and width[queue[0]] <= free_now:
+            launch(queue.popleft(), now)
+        if mode == "fcfs" or len(queue) < 2 or not free_now or min(queued_widths) > free_now:
+            return queue
+        waiting = queue
+        shadow, extra = profile.shadow(width[waiting[0]])
+        extra -= width[waiting[0]]
+        kept = deque()
+        for j in waiting:
+            if not free_now or j == waiting[0]:
+                kept.append(j)
+                continue
+            if width[j] <= free_now:
+                if now + estimate[j] <= shadow:
+                    launch(j, now)
+                    backfilled[j] = True
+                    continue
+                if width[j] <= extra:
+                    extra -= width[j]
+                    launch(j, now)
+                    backfilled[j] = True
+                    continue
+            kept.append(j)
+        if probe is not None:
+            probe.count("queue_ops", len(waiting))
+        return kept
+
+    def reserve_queued(j, at):
+        reserved[j] = at
+        profile.reserve(at, at + estimate[j], width[j])
+        heapq.heappush(due, (at, j))
+
+    while completed < n:
+        # next event: a job end, an arrival or (conservative) a reserved start;
+        # a reservation may fall where no job ends, when the job it waited for ended early
+        while due and (start[due[0][1]] is not None or reserved[due[0][1]] != due[0][0]):
+            heapq.heappop(due)
+        now = ending[0][0] if ending else arrival[nxt] if nxt < n else due[0][0]
+        if nxt < n and arrival[nxt] < now:
+            now = arrival[nxt]
+        if due and due[0][0] < now:
+            now = due[0][0]
+        profile.advance(now)
+
+        early = False
+        while ending and ending[0][0] <= now:
+            end, j, ids = heapq.heappop(ending)
+            free_now += width[j]
+            free_ids.extend(reversed(ids))
+            if end < start[j] + estimate[j]:
+                profile.release(end, start[j] + estimate[j], width[j])
+                early = True
+            completed += 1
+            if probe is not None:
+                probe.count("heap_pops")
+            if progress is not None:
+                progress(completed, n)
+
+        if mode == "conservative" and early:
+            # compress: every reservation may move earlier, in queue order
+            for j in queue:
+                old = reserved[j]
+                profile.release(old, old + estimate[j], width[j])
+                new = profile.earliest(now, estimate[j], width[j], old)
+                if new is None:
+                    profile.reserve(old, old + estimate[j], width[j])
+                else:
+                    reserve_queued(j, new)
+        while nxt < n and arrival[nxt] <= now:
+            queue.append(nxt)
+            queued_widths[width[nxt]] += 1
+            if mode == "conservative":
+                reserve_queued(nxt, profile.earliest(now, estimate[nxt], width[nxt]))
+            nxt += 1
+            if probe is not None:
+                probe.count("queue_ops")
+
+        queue = start_ready(now)
+
+    summary = []
+    busy = 0
+    slowdowns = []
+    for j, i in enumerate(order):
+        q = dict(processes[i])
+        finish = start[j] + runtime[j]
+        q["start"] = start[j]
+        q["finish"] = finish
+        q["turnaround"] = finish - arrival[j]
+        q["waiting"] = start[j] - arrival[j]
+        q["bounded_slowdown"] = bounded_slowdown(q["turnaround"], runtime[j])
+        q["backfilled"] = backfilled[j]
+        q["terminated"] = q.get("terminated", False) or runtime[j] < fields[i][1]
+        summary.append(q)
+        busy += width[j] * runtime[j]
+        slowdowns.append(q["bounded_slowdown"])
+
+    makespan = max((q["finish"] for q in summary), default=0) - (arrival[0] if n else 0)
+    batch = {
+        "utilization": round(100.0 * busy / (cpus * makespan), 2) if makespan > 0 else 0.0,
+        "mean_bounded_slowdown": round(sum(slowdowns) / n, 3) if n else 0.0,
+        "max_bounded_slowdown": round(max(slowdowns), 3) if n else 0.0,
+        "backfilled": sum(backfilled),
+        "killed": sum(1 for j in range(n) if runtime[j] < fields[order[j]][1]),
+        "makespan": makespan,
+    }
+    return {"processes": segments, "summary": summary, "batch": batch}
+
+
+def run_easy(processes, cpus=1, progress=None):
+    """EASY backfilling (reservation for the queue head only)."""
+    return run_backfill(processes, cpus, "easy", progress)
+
+
+def run_conservative(processes, cpus=1, progress=None):
+    """Conservative backfilling (a reservation for every queued job)."""
+    return run_backfill(processes, cpus, "conservative", progress)
@@ -0,0 +1,58 @@
+# scheduler/checkpoint.py
+
+"""
+Compact binary checkpoints of engine state.
+
+File layout:
+    header  struct "<4sHHII": magic b"CPUC", version, reserved,
+            payload length, CRC32 of the payload
+    payload zlib-compressed JSON of Engine.state()
+
+JSON keeps ints as ints and writes floats with repr(), so a state
+round-trips exactly and a resumed run finishes bit-identical to an
+uninterrupted one. Files are written to a temporary name and renamed
+into place, so a crash mid-write leaves the previous checkpoint intact.
+"""
+
+import json
+import os
+import struct
+import zlib
+
+MAGIC = b"CPUC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+
+def dumps(state):
+    payload = zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"), 6)
+    return HEADER.pack(MAGIC, VERSION, 0, len(payload), zlib.crc32(payload)) + payload
+
+
+def loads(data):
+    if len(data) < HEADER.size:
+        raise ValueError("Truncated checkpoint")
+    magic, version, _, length, crc = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an engine checkpoint")
+    if version != VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version}")
+    payload = data[HEADER.size:HEADER.size + length]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError("Corrupt checkpoint")
+    return json.loads(zlib.decompress(payload))
+
+
+def save(state, path):
+    """Atomically write `state` to `path`."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(state))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,58 @@
+# scheduler/cost_model.py
+
+"""
+Dispatch cost model.
+
+The run_* schedulers assume dispatching is free. A CostModel charges, on
+every dispatch of a task that was not the last one on that CPU:
+ - context_switch: fixed overhead
+ - cache_refill: cache warm-up. A task's cache footprint decays while it is
+   off the CPU, so the penalty is cache_refill * (1 - exp(-gap / cache_decay))
+   where gap is the time since the task last ran; tasks that never ran
+   (or migrated) pay the full refill
+ - migration: extra penalty when the task last ran on a different CPU
+
+The engine charges the total as an explicit overhead segment before the
+task's useful work starts.
+"""
+
+import math
+
+
+class CostModel:
+    def __init__(self, context_switch=0.0, cache_refill=0.0, cache_decay=10.0, migration=0.0):
+        if min(context_switch, cache_refill, migration) < 0 or cache_decay <= 0:
+            raise ValueError("Costs must be non-negative and cache_decay positive")
+        self.context_switch = context_switch
+        self.cache_refill = cache_refill
+        self.cache_decay = cache_decay
+        self.migration = migration
+
+    def __repr__(self):
+        return (f"CostModel(context_switch={self.context_switch}, cache_refill={self.cache_refill}, "
+                f"cache_decay={self.cache_decay}, migration={self.migration})")
+
+    def dispatch_cost(self, now, cpu, cpu_last_task, task, task_last_end, task_last_cpu):
+        """
+        Overhead breakdown for dispatching `task` on `cpu` at time `now`.
+        Returns {"context_switch": .., "cache": .., "migration": ..}.
+        """
+        if cpu_last_task == task:
+            return {"context_switch": 0.0, "cache": 0.0, "migration": 0.0}
+        migration = 0.0
+        if task_last_end is None:
+            cache = self.cache_refill
+        elif task_last_cpu is not None and task_last_cpu != cpu:
+            migration = self.migration
+            cache = self.cache_refill
+        else:
+            cache = self.cache_refill * (1.0 - math.exp(-(now - task_last_end) / self.cache_decay))
+        return {"context_switch": self.context_switch, "cache": cache, "migration": migration}
+
+    def to_dict(self):
+        return {"context_switch": self.context_switch, "cache_refill": self.cache_refill,
+                "cache_decay": self.cache_decay, "migration": self.migration}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**{k: d[k] for k in ("context_switch", "cache_refill", "cache_decay", "migration") if k in d})
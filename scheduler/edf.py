@@ -0,0 +1,15 @@
+# scheduler/edf.py
+
+from scheduler.realtime import run_realtime
+
+
+def run_edf(processes, horizon=None, progress=None):
+    """
+    Earliest Deadline First (Preemptive)
+    The released job with the earliest absolute deadline runs; jobs without
+    a deadline run only when no job with one is ready.
+    horizon: stop releasing periodic jobs at this time (default: latest
+             arrival + hyperperiod)
+    progress: optional callback(completed, total) invoked as jobs finish
+    """
+    return run_realtime(processes, lambda p, release, deadline: deadline, horizon, progress)
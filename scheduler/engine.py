@@ -0,0 +1,679 @@
+# scheduler/engine.py
+
+"""
+Event-driven scheduling engine.
+
+One discrete-event core for the five policies (FCFS, SJF, SRTF, RR,
+PRIORITY) on one or more CPUs. Slice ends are kept in an event heap and
+ready processes in a per-policy priority queue (a FIFO for RR), so a run
+costs O(n log n) instead of scanning every process at every tick.
+
+With cpus=1 and no cost model the schedule matches the run_* schedulers
+on integer workloads, including their tie-breaking. On top of that the
+engine can:
+ - charge dispatch overhead from a CostModel as explicit overhead segments
+ - run several CPUs, preferring to put a task back on the CPU it last used
+ - scale CPU speed with a PowerModel (scheduler.power_model): a governor
+   picks each slice's P-state, bursts stretch at lower frequencies, idle
+   CPUs sit in C-states whose exit latency is charged as "wakeup"
+   overhead, and energy is accounted per segment and per process
+
+Processes may also alternate CPU and I/O bursts: "bursts" is
+[cpu, io, cpu, ..., cpu] and the optional "devices" names the device of
+each I/O burst (default 0). A process blocks when a CPU burst ends, waits
+in its device's FCFS queue, and wakes up ready when the I/O completes;
+device completions share the event heap with slice ends. SJF orders by the
+length of the next CPU burst.
+
+Output (same shape as run_roundrobin):
+ - result["processes"]: one dict per segment (pid, arrival_time, burst_time,
+   priority, start, finish, cpu, flags); overhead segments carry
+   "kind": "overhead" and the cost breakdown
+ - result["summary"]: one dict per process with start, finish, waiting, turnaround
+ - result["overhead_time"]: total time charged by the cost model
+ - with I/O: result["io_segments"] (pid, device, start, finish per I/O
+   burst) and result["devices"]; summary entries carry io_time (device
+   queueing + service), so waiting is ready-queue time only. CPU segments
+   carry the io_time accrued when they were recorded, so a process's last
+   segment has its total even if earlier ones were spilled to disk
+ - with a power model: segments carry "energy", and run segments "freq"
+   and "stretch" (time beyond the work done, from running below the top
+   frequency; not counted as waiting); summary entries carry energy, and
+   result["energy"] has the active, idle and total energy
+
+Timer events (slice ends, I/O completions) go through a pluggable event
+queue (scheduler.event_queue): a binary heap, or a hierarchical timing
+wheel for integer times. event_queue="auto" picks one from the workload's
+event times and the number of CPUs and devices. Arrivals never enter the
+queue: they are read in order from the sorted process list.
+
+With memory_budget set, segments go to a scheduler.segment_store.
+SegmentStore that spills compressed chunks to disk over the budget, and
+result()["processes"] is that store, in slice-completion order (start
+order on one CPU) rather than sorted. Such runs cannot be checkpointed
+or snapshotted.
+
+Long runs can write periodic checkpoints (scheduler.checkpoint) of the
+full engine state; resume() continues from the latest one and produces
+exactly the result the uninterrupted run would have. Lighter in-memory
+snapshots at arrival boundaries let scheduler.incremental re-run only the
+part of a schedule an edit can affect.
+"""
+
+import heapq
+from collections import deque
+from operator import itemgetter
+
+from scheduler import instrument, checkpoint
+from scheduler.progress import SimulationCancelled
+from scheduler.cost_model import CostModel
+from scheduler.power_model import PowerModel
+from scheduler.event_queue import make_queue, select_queue
+from scheduler.segment_store import SegmentStore
+
+# policy -> (initial order key, ready key(p, current burst, remaining), preemptive on arrival, time-sliced)
+# Ready keys end with the process index so ties go to the earlier process
+# of the initial order, as in the run_* schedulers.
+POLICIES = {
+    "FCFS": (lambda p: p["arrival"], None, False, False),
+    "SJF": (lambda p: (p["arrival"], p["burst"]), lambda p, cur, rem: cur, False, False),
+    "SRTF": (lambda p: p["arrival"], lambda p, cur, rem: rem, True, False),
+    "RR": (lambda p: p["arrival"], None, False, True),
+    "PRIORITY": (lambda p: (p["arrival"], p["priority"]), lambda p, cur, rem: p["priority"], False, False),
+}
+
+ALIASES = {"ROUND ROBIN": "RR"}
+
+_DONE = 0       # slice ends with the process complete
+_EXPIRE = 1     # slice ends with work remaining (quantum expiry)
+_QUEUE_SAMPLE = 1000    # processes sampled to pick the event queue
+_CANCEL_EVERY = 1024    # steps between checks of a cancel_event
+
+
+def normalize(processes):
+    """Engine view of the input: one flat dict per process (copies)."""
+    out = []
+    for p in processes:
+        q = dict(p)
+        q["arrival"] = p.get("arrival_time", p.get("arrival", 0))
+        q["burst"] = p.get("burst_time", p.get("burst", 0))
+        q["priority"] = p.get("priority", 1)
+        bursts = p.get("bursts")
+        if bursts:
+            if len(bursts) % 2 == 0:
+                raise ValueError(f"{q.get('pid')}: bursts must alternate cpu, io, ..., cpu")
+            q["bursts"] = list(bursts)
+            q["burst"] = sum(bursts[0::2])
+            q["devices"] = list(p.get("devices") or [0] * (len(bursts) // 2))
+            if len(q["devices"]) != len(bursts) // 2:
+                raise ValueError(f"{q.get('pid')}: one device per I/O burst")
+        else:
+            q.pop("bursts", None)
+        out.append(q)
+    return out
+
+
+class Engine:
+    """Single run of one policy over one workload."""
+
+    def __init__(self, processes, policy="FCFS", quantum=3, cpus=1, cost_model=None, devices=None,
+                 presorted=False, event_queue="auto", memory_budget=None, spill_dir=None, power_model=None):
+        """
+        presorted: `processes` is already normalized and in engine order (used as is)
+        power_model: scheduler.power_model.PowerModel for DVFS and energy
+        event_queue: "heap", "wheel" or "auto" (see scheduler.event_queue)
+        memory_budget / spill_dir: keep segments in a SegmentStore with this
+                                   many bytes resident, spilling to spill_dir
+        """
+        policy = ALIASES.get(policy.upper(), policy.upper())
+        if policy not in POLICIES:
+            raise ValueError("Invalid algorithm")
+        if cpus < 1:
+            raise ValueError("cpus must be >= 1")
+        order_key, ready_key, preemptive, sliced = POLICIES[policy]
+        if sliced and quantum <= 0:
+            raise ValueError("quantum must be positive")
+
+        self.policy = policy
+        self.quantum = quantum
+        self.cost_model = cost_model
+        self.power_model = power_model
+        self.ready_key = ready_key
+        self.preemptive = preemptive
+        self.sliced = sliced
+
+        self.order_key = order_key
+        self.procs = list(processes) if presorted else sorted(normalize(processes), key=order_key)
+        n = len(self.procs)
+        self.remaining = [p["bursts"][0] if "bursts" in p else p["burst"] for p in self.procs]
+        self.cur_burst = list(self.remaining)       # length of the current CPU burst
+        self.phase = [0] * n                        # index into "bursts"
+        self.first_start = [None] * n
+        self.finish = [None] * n
+        self.last_end = [None] * n          # when each task last left a CPU
+        self.last_cpu = [None] * n
+
+        self.time = 0
+        self.next_arrival = 0               # index of the next process to arrive
+        self.completed = 0
+        self.ready = deque() if sliced else []
+        self.events = None                  # event queue of (time, seq, slot, token)
+        self.seq = 0
+
+        # per-CPU state; running is a process index or None
+        self.running = [None] * cpus
+        self.oh_start = [0] * cpus          # dispatch time (overhead starts)
+        self.run_start = [0] * cpus         # useful work starts
+        self.slice_kind = [_DONE] * cpus
+        self.token = [0] * cpus             # invalidates events of preempted slices
+        self.cpu_last = [None] * cpus       # last task each CPU ran
+        self.overhead = [None] * cpus       # cost breakdown of the current dispatch
+
+        self.segments = [] if memory_budget is None else SegmentStore(memory_budget, spill_dir=spill_dir)
+        self.overhead_time = 0.0
+
+        # power: each CPU's P-state and utilization, and since when it is idle
+        top = power_model.top if power_model is not None else 0
+        self.pstate = [top] * cpus
+        self.util = [0.0] * cpus
+        self.idle_since = [self.procs[0]["arrival"] if self.procs else 0] * cpus
+        self.energy = [0.0] * n
+        self.stretch = [0] * n              # run time beyond the work done (below top frequency)
+        self.active_energy = 0.0
+        self.idle_energy = 0.0
+
+        # I/O devices: FCFS queues; device d's events use slot cpus + d
+        used = [d for p in self.procs for d in p.get("devices", ())]
+        if devices is None:
+            devices = max(used) + 1 if used else 0
+        if used and (min(used) < 0 or max(used) >= devices):
+            raise ValueError("device index out of range")
+        self.cpus = cpus
+        self.devices = devices
+        self.token += [0] * devices
+        self.dev_busy = [None] * devices
+        self.dev_start = [0] * devices
+        self.dev_queue = [deque() for _ in range(devices)]
+        self.io_queued = [0] * n            # when the current I/O request was made
+        self.io_time = [0] * n
+        self.io_wait = [0] * n
+        self.io_segments = []
+
+        if event_queue == "auto":
+            event_queue = self._select_queue()
+        self.event_queue = event_queue
+        self.events = make_queue(event_queue)
+
+        # arrival-boundary snapshots, enabled by scheduler.incremental
+        self.snapshots = None               # list of (arrival time, snapshot)
+        self.snapshot_every = 1             # arrivals between snapshots
+        self._snapshot_due = 0
+
+    def _select_queue(self):
+        if self.cost_model is not None or self.power_model is not None:
+            return "heap"               # dispatch costs / scaled bursts make event times fractional
+        sample = self.procs[:_QUEUE_SAMPLE]
+        times = [p["arrival"] for p in sample]
+        times += [b for p in sample for b in p.get("bursts", (p["burst"],))]
+        if self.sliced:
+            times.append(self.quantum)
+        return select_queue(times, self.cpus + self.devices)
+
+    # ---------------- ready queue ----------------
+    def _enqueue(self, idx, probe):
+        if self.sliced:
+            self.ready.append(idx)
+            if probe is not None:
+                probe.count("queue_ops")
+            return
+        key = idx if self.ready_key is None else self.ready_key(
+            self.procs[idx], self.cur_burst[idx], self.remaining[idx])
+        heapq.heappush(self.ready, (key, idx))
+        if probe is not None:
+            probe.count("heap_pushes")
+
+    def _dequeue(self, probe):
+        if self.sliced:
+            if probe is not None:
+                probe.count("queue_ops")
+            return self.ready.popleft()
+        if probe is not None:
+            probe.count("heap_pops")
+        return heapq.heappop(self.ready)[1]
+
+    # ---------------- slices ----------------
+    def _start(self, cpu, idx, t, probe):
+        if self.cpu_last[cpu] != idx and probe is not None:
+            probe.count("context_switches")
+        cost = 0.0
+        breakdown = None
+        if self.cost_model is not None:
+            breakdown = self.cost_model.dispatch_cost(
+                t, cpu, self.cpu_last[cpu], idx, self.last_end[idx], self.last_cpu[idx])
+            cost = sum(breakdown.values())
+        length = self.remaining[idx]
+        pm = self.power_model
+        if pm is not None:
+            wake = self._wake(cpu, t)
+            if wake > 0:
+                breakdown = dict(breakdown or {}, wakeup=wake)
+                cost += wake
+            self.pstate[cpu] = pm.select(self.util[cpu])
+            length = length / pm.speeds[self.pstate[cpu]]
+        run_start = t + cost
+        kind = _DONE
+        if self.sliced and length > self.quantum:
+            length = self.quantum
+            kind = _EXPIRE
+
+        self.running[cpu] = idx
+        self.oh_start[cpu] = t
+        self.run_start[cpu] = run_start
+        self.slice_kind[cpu] = kind
+        self.overhead[cpu] = breakdown if cost > 0 else None
+        self.cpu_last[cpu] = idx
+        self.token[cpu] += 1
+        if self.first_start[idx] is None:
+            self.first_start[idx] = run_start
+        self.seq += 1
+        self.events.push((run_start + length, self.seq, cpu, self.token[cpu]))
+        if probe is not None:
+            probe.count("heap_pushes")
+
+    def _wake(self, cpu, t):
+        """Account the idle period of `cpu` ending at t; returns the C-state exit latency."""
+        pm = self.power_model
+        idle = t - self.idle_since[cpu]
+        if idle <= 0:
+            return 0.0
+        self.idle_energy += pm.idle_energy(idle)
+        self.util[cpu] = pm.decay(self.util[cpu], False, idle)
+        self.idle_since[cpu] = t
+        return pm.cstate(idle).exit_latency
+
+    def _speed(self, cpu):
+        return 1 if self.power_model is None else self.power_model.speeds[self.pstate[cpu]]
+
+    def _end_slice(self, cpu, t, done):
+        """Close the slice on `cpu` at time t and record its segments."""
+        idx = self.running[cpu]
+        p = self.procs[idx]
+        pm = self.power_model
+        power = pm.pstates[self.pstate[cpu]].power if pm is not None else None
+        oh_end = min(t, self.run_start[cpu])
+        if self.overhead[cpu] is not None and oh_end > self.oh_start[cpu]:
+            seg = {"pid": p["pid"], "kind": "overhead", "start": self.oh_start[cpu], "finish": oh_end,
+                   "cpu": cpu}
+            seg.update(self.overhead[cpu])
+            if pm is not None:
+                seg["energy"] = (oh_end - self.oh_start[cpu]) * power
+            self.segments.append(seg)
+            self.overhead_time += oh_end - self.oh_start[cpu]
+
+        ran = max(0, t - self.run_start[cpu])
+        work = ran * self._speed(cpu)
+        if done:
+            self.remaining[idx] = 0
+        else:
+            self.remaining[idx] -= work
+        if pm is not None:
+            busy = t - self.oh_start[cpu]
+            self.energy[idx] += busy * power
+            self.active_energy += busy * power
+            self.stretch[idx] += ran - work
+            self.util[cpu] = pm.decay(self.util[cpu], True, busy)
+            self.idle_since[cpu] = t
+        if ran > 0 or done:
+            seg = {
+                "pid": p["pid"],
+                "arrival_time": p["arrival"],
+                "burst_time": p["burst"],
+                "priority": p["priority"],
+                "start": self.run_start[cpu] if ran > 0 else t,
+                "finish": t,
+                "cpu": cpu,
+                "is_rogue": p.get("is_rogue", False),
+                "throttled": p.get("throttled", False),
+                "terminated": p.get("terminated", False)
+            }
+            if pm is not None:
+                seg["freq"] = pm.pstates[self.pstate[cpu]].freq
+                seg["energy"] = ran * power
+                seg["stretch"] = ran - work
+            if "bursts" in p:
+                seg["io_time"] = self.io_time[idx]
+            self.segments.append(seg)
+        self.last_end[idx] = t
+        self.last_cpu[idx] = cpu
+        self.running[cpu] = None
+        self.token[cpu] += 1
+        return idx
+
+    # ---------------- I/O ----------------
+    def _block(self, idx, t):
+        """CPU burst done with I/O to follow: request the burst's device."""
+        self.phase[idx] += 1
+        d = self.procs[idx]["devices"][self.phase[idx] // 2]
+        self.io_queued[idx] = t
+        if self.dev_busy[d] is None:
+            self._start_io(d, idx, t)
+        else:
+            self.dev_queue[d].append(idx)
+
+    def _start_io(self, d, idx, t):
+        slot = self.cpus + d
+        self.dev_busy[d] = idx
+        self.dev_start[d] = t
+        self.io_wait[idx] += t - self.io_queued[idx]
+        self.seq += 1
+        self.events.push((t + self.procs[idx]["bursts"][self.phase[idx]], self.seq, slot, self.token[slot]))
+
+    def _end_io(self, d, t):
+        """I/O on device d completes at t; returns the process that wakes up."""
+        idx = self.dev_busy[d]
+        self.io_segments.append({"pid": self.procs[idx]["pid"], "device": d,
+                                 "start": self.dev_start[d], "finish": t})
+        self.io_time[idx] += t - self.io_queued[idx]
+        self.phase[idx] += 1
+        self.remaining[idx] = self.cur_burst[idx] = self.procs[idx]["bursts"][self.phase[idx]]
+        self.dev_busy[d] = None
+        if self.dev_queue[d]:
+            self._start_io(d, self.dev_queue[d].popleft(), t)
+        return idx
+
+    # ---------------- main loop ----------------
+    def _next_time(self, probe):
+        events = self.events
+        token = self.token
+        t = None
+        while events:
+            head = events.peek()
+            if head[3] == token[head[2]]:
+                t = head[0]
+                break
+            events.pop()                    # stale: slice was preempted
+            if probe is not None:
+                probe.count("heap_pops")
+        if self.next_arrival < len(self.procs):
+            a = self.procs[self.next_arrival]["arrival"]
+            if t is None or a < t:
+                if probe is not None and not events and not self.ready and a > self.time:
+                    probe.count("idle_gaps")
+                t = max(a, self.time)
+        return t
+
+    def step(self, probe=None):
+        """Advance to the next event time and handle everything due then."""
+        t = self._next_time(probe)
+        procs = self.procs
+        if (self.snapshots is not None and self.next_arrival >= self._snapshot_due
+                and self.next_arrival < len(procs) and procs[self.next_arrival]["arrival"] <= t):
+            # nothing at or after t has happened yet
+            self.snapshots.append((t, self.snapshot()))
+            self._snapshot_due = self.next_arrival + self.snapshot_every
+        self.time = t
+
+        # 1. slices and I/O bursts ending now
+        expired = []
+        woken = []
+        events = self.events
+        while events and events.peek()[0] <= t:
+            _, _, slot, token = events.pop()
+            if probe is not None:
+                probe.count("heap_pops")
+            if token != self.token[slot]:
+                continue
+            if slot >= self.cpus:
+                woken.append(self._end_io(slot - self.cpus, t))
+                continue
+            done = self.slice_kind[slot] == _DONE
+            idx = self._end_slice(slot, t, done)
+            if not done:
+                expired.append(idx)
+            elif "bursts" in self.procs[idx] and self.phase[idx] + 1 < len(self.procs[idx]["bursts"]):
+                self._block(idx, t)
+            else:
+                self.finish[idx] = t
+                self.completed += 1
+
+        # 2. arrivals and wake-ups up to now (enqueued before requeued slices, as in RR)
+        first_new = self.next_arrival
+        while self.next_arrival < len(procs) and procs[self.next_arrival]["arrival"] <= t:
+            self._enqueue(self.next_arrival, probe)
+            self.next_arrival += 1
+        for idx in woken:
+            self._enqueue(idx, probe)
+
+        # 3. requeue expired slices
+        for idx in expired:
+            self._enqueue(idx, probe)
+            if probe is not None:
+                probe.count("preemptions")
+
+        # 4. preemption on arrival
+        if self.preemptive and (self.next_arrival > first_new or woken):
+            self._preempt(t, probe)
+
+        # 5. dispatch idle CPUs
+        self._dispatch(t, probe)
+
+    def _preempt(self, t, probe):
+        """Replace the worst running task while a better one is ready."""
+        while self.ready and None not in self.running:
+            best_key = self.ready[0]
+            worst_cpu = None
+            worst_key = None
+            for cpu, idx in enumerate(self.running):
+                rem = self.remaining[idx] - max(0, t - self.run_start[cpu]) * self._speed(cpu)
+                key = (self.ready_key(self.procs[idx], self.cur_burst[idx], rem), idx)
+                if worst_key is None or key > worst_key:
+                    worst_cpu, worst_key = cpu, key
+            if best_key >= worst_key:
+                return
+            idx = self._end_slice(worst_cpu, t, False)
+            self._enqueue(idx, probe)
+            if probe is not None:
+                probe.count("preemptions")
+            self._dispatch(t, probe)
+
+    def _dispatch(self, t, probe):
+        idle = [cpu for cpu, idx in enumerate(self.running) if idx is None]
+        while idle and self.ready:
+            idx = self._dequeue(probe)
+            cpu = self.last_cpu[idx] if self.last_cpu[idx] in idle else idle[0]
+            idle.remove(cpu)
+            self._start(cpu, idx, t, probe)
+
+    def run(self, progress=None, checkpoint_path=None, checkpoint_every=10000, cancel_event=None):
+        """
+        Run to completion and return result().
+        checkpoint_path: save the engine state there every `checkpoint_every` steps
+        cancel_event: threading.Event checked every few steps, so a run stops
+                      promptly even while no process completes; raises
+                      SimulationCancelled once it is set
+        """
+        probe = instrument.active
+        n = len(self.procs)
+        steps = 0
+        while self.completed < n:
+            before = self.completed
+            self.step(probe)
+            if progress is not None and self.completed != before:
+                progress(self.completed, n)
+            steps += 1
+            if cancel_event is not None and steps % _CANCEL_EVERY == 0 and cancel_event.is_set():
+                raise SimulationCancelled()
+            if checkpoint_path is not None and steps % checkpoint_every == 0 and self.completed < n:
+                checkpoint.save(self.state(), checkpoint_path)
+        return self.result()
+
+    # ---------------- checkpoints ----------------
+    # dynamic state besides the queues; procs and configuration are saved separately
+    _STATE = ("remaining", "cur_burst", "phase", "first_start", "finish", "last_end", "last_cpu",
+              "time", "next_arrival", "completed", "seq", "running", "oh_start", "run_start",
+              "slice_kind", "token", "cpu_last", "overhead", "segments", "overhead_time",
+              "dev_busy", "dev_start", "io_queued", "io_time", "io_wait", "io_segments",
+              "pstate", "util", "idle_since", "energy", "stretch", "active_energy", "idle_energy")
+
+    def state(self):
+        """
+        JSON-compatible view of the complete engine state. It shares lists
+        with the engine, so serialize it before stepping again.
+        """
+        self._require_list_output("checkpointed")
+        state = {
+            "config": {
+                "policy": self.policy,
+                "quantum": self.quantum,
+                "cpus": self.cpus,
+                "devices": self.devices,
+                "cost_model": self.cost_model.to_dict() if self.cost_model is not None else None,
+                "power_model": self.power_model.to_dict() if self.power_model is not None else None,
+                "event_queue": self.event_queue,
+            },
+            "procs": self.procs,
+            "ready": list(self.ready),
+            "events": self.events.items(),
+            "dev_queue": [list(q) for q in self.dev_queue],
+        }
+        for name in self._STATE:
+            state[name] = getattr(self, name)
+        return state
+
+    def _require_list_output(self, what):
+        if isinstance(self.segments, SegmentStore):
+            raise ValueError(f"A run with a memory budget cannot be {what}")
+
+    # per-process and per-CPU / device state, as saved by snapshot()
+    _PROCESS_STATE = ("remaining", "cur_burst", "phase", "first_start", "finish", "last_end", "last_cpu",
+                      "io_queued", "io_time", "io_wait", "energy", "stretch")
+    _UNIT_STATE = ("running", "oh_start", "run_start", "slice_kind", "token", "cpu_last", "overhead",
+                   "dev_busy", "dev_start", "pstate", "util", "idle_since")
+
+    def snapshot(self):
+        """
+        In-memory snapshot for incremental re-simulation. Per-process state
+        is kept only for arrived, unfinished processes: everything else is
+        either untouched or final, and restore() reads it from the engine
+        that finished the run. Segment lists are recorded by length.
+        """
+        self._require_list_output("snapshotted")
+        active = set(self.ready) if self.sliced else {i for _, i in self.ready}
+        active.update(i for i in self.running if i is not None)
+        active.update(i for i in self.dev_busy if i is not None)
+        for q in self.dev_queue:
+            active.update(q)
+        snap = {name: list(getattr(self, name)) for name in self._UNIT_STATE}
+        active = list(active)
+        snap["active"] = active
+        if len(active) > 1:
+            get = itemgetter(*active)
+            snap["active_state"] = [get(getattr(self, name)) for name in self._PROCESS_STATE]
+        else:
+            snap["active_state"] = [[getattr(self, name)[i] for i in active] for name in self._PROCESS_STATE]
+        snap.update({
+            "time": self.time, "next_arrival": self.next_arrival, "completed": self.completed,
+            "seq": self.seq, "overhead_time": self.overhead_time,
+            "active_energy": self.active_energy, "idle_energy": self.idle_energy,
+            "ready": list(self.ready), "events": self.events.items(),
+            "dev_queue": [list(q) for q in self.dev_queue],
+            "segments": len(self.segments), "io_segments": len(self.io_segments),
+        })
+        return snap
+
+    def restore(self, snap, base):
+        """
+        Continue from `snap`, taken by `base` (a finished engine whose
+        processes before snap["next_arrival"] are the same as ours).
+        """
+        k = snap["next_arrival"]
+        for name, values in zip(self._PROCESS_STATE, snap["active_state"]):
+            arr = getattr(self, name)
+            arr[:k] = getattr(base, name)[:k]
+            for i, v in zip(snap["active"], values):
+                arr[i] = v
+        for name in self._UNIT_STATE:
+            setattr(self, name, list(snap[name]))
+        self.time = snap["time"]
+        self.next_arrival = k
+        self.completed = snap["completed"]
+        self.seq = snap["seq"]
+        self.overhead_time = snap["overhead_time"]
+        self.active_energy = snap["active_energy"]
+        self.idle_energy = snap["idle_energy"]
+        self.ready = deque(snap["ready"]) if self.sliced else list(snap["ready"])
+        self.events = make_queue(self.event_queue, snap["events"])
+        self.dev_queue = [deque(q) for q in snap["dev_queue"]]
+        self.segments = base.segments[:snap["segments"]]
+        self.io_segments = base.io_segments[:snap["io_segments"]]
+        self._snapshot_due = k + self.snapshot_every
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an engine from state() (e.g. after a checkpoint round trip)."""
+        cfg = state["config"]
+        cost_model = CostModel.from_dict(cfg["cost_model"]) if cfg["cost_model"] is not None else None
+        power_model = PowerModel.from_dict(cfg["power_model"]) if cfg.get("power_model") is not None else None
+        engine = cls(state["procs"], cfg["policy"], quantum=cfg["quantum"], cpus=cfg["cpus"],
+                     cost_model=cost_model, devices=cfg["devices"], presorted=True,
+                     event_queue=cfg.get("event_queue", "auto"), power_model=power_model)
+        for name in cls._STATE:
+            setattr(engine, name, state[name])
+        engine.events = make_queue(engine.event_queue, [tuple(e) for e in state["events"]])
+        engine.ready = deque(state["ready"]) if engine.sliced else [tuple(e) for e in state["ready"]]
+        engine.dev_queue = [deque(q) for q in state["dev_queue"]]
+        return engine
+
+    def result(self):
+        summary = []
+        for i, p in enumerate(self.procs):
+            q = dict(p)
+            q["start"] = self.first_start[i]
+            q["finish"] = self.finish[i]
+            if self.finish[i] is not None:
+                q["turnaround"] = self.finish[i] - p["arrival"]
+                q["waiting"] = q["turnaround"] - p["burst"] - self.io_time[i] - self.stretch[i]
+            if self.power_model is not None:
+                q["energy"] = self.energy[i]
+            if "bursts" in p:
+                q["io_time"] = self.io_time[i]
+                q["io_wait"] = self.io_wait[i]
+            summary.append(q)
+        out = {
+            "processes": (self.segments if isinstance(self.segments, SegmentStore)
+                          else sorted(self.segments, key=lambda s: s["start"])),
+            "summary": summary,
+            "overhead_time": self.overhead_time,
+        }
+        if self.devices:
+            out["io_segments"] = self.io_segments
+            out["devices"] = self.devices
+        if self.power_model is not None:
+            # every CPU idles from its last slice to the end of the run
+            idle = self.idle_energy + sum(self.power_model.idle_energy(self.time - since)
+                                          for since in self.idle_since)
+            out["energy"] = {"active": self.active_energy, "idle": idle, "total": self.active_energy + idle}
+        return out
+
+
+def simulate(processes, policy="FCFS", quantum=3, cpus=1, cost_model=None, progress=None, devices=None,
+             checkpoint_path=None, checkpoint_every=10000, event_queue="auto", memory_budget=None,
+             spill_dir=None, power_model=None, cancel_event=None):
+    """
+    Run one policy over `processes` (not mutated) and return the engine result.
+    devices: number of I/O devices (default: highest device used + 1)
+    checkpoint_path / checkpoint_every: periodic checkpoints, see resume()
+    event_queue: "heap", "wheel" or "auto"
+    memory_budget / spill_dir: spill segment output to disk, see SegmentStore
+    power_model: DVFS / C-state model with energy accounting, see PowerModel
+    cancel_event: threading.Event that aborts the run, see Engine.run()
+    """
+    return Engine(processes, policy, quantum=quantum, cpus=cpus, cost_model=cost_model, devices=devices,
+                  event_queue=event_queue, memory_budget=memory_budget, spill_dir=spill_dir,
+                  power_model=power_model).run(progress, checkpoint_path, checkpoint_every, cancel_event)
+
+
+def resume(checkpoint_path, progress=None, checkpoint_every=10000):
+    """Continue the run saved at `checkpoint_path`, still checkpointing there."""
+    engine = Engine.from_state(checkpoint.load(checkpoint_path))
+    return engine.run(progress, checkpoint_path, checkpoint_every)
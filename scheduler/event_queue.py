@@ -0,0 +1,283 @@
+# scheduler/event_queue.py
+
+"""
+Pluggable event queues for the event-driven engine.
+
+Events are tuples whose first field is the event time; queues pop them in
+tuple order (time first, then the remaining fields), exactly like heapq,
+so swapping the queue never changes a schedule.
+
+ - HeapQueue: binary heap (heapq). O(log n) push / pop, any time values
+ - TimingWheel: hierarchical timing wheel for integer times. `levels`
+   wheels of 2^bits slots; level k slot j holds events whose time shares
+   every digit above k with the current time and has digit j at k. Push
+   is O(1), and popping moves the cursor to the next occupied slot
+   (found with a bitmap) and cascades a higher-level bucket into the
+   wheels below, so every event is moved at most `levels` times:
+   amortized O(1). Times beyond the top wheel wait in an overflow heap.
+   All events at the current time sit in one sorted list. peek() may move
+   the cursor past times the caller can still schedule at; such events
+   go to a small heap that is drained first
+
+Both support cancel(item), which removes one pending event equal to
+`item`: O(n) on the heap, O(bucket) on the wheel, whose bucket follows
+from the event time. The engine itself never cancels: it drops events of
+preempted slices lazily, by token, as they reach the front.
+
+select_queue() picks the queue from the event times a run will see and
+how many events it keeps pending; make_queue() builds one by name.
+Measured crossover points come from benchmarks/event_queue.py.
+"""
+
+import heapq
+from bisect import insort
+
+# the wheel needs this many pending events (on integer times) to beat heapq:
+# on CPython it trails the C heap up to ~10^6 pending and breaks even near 3 * 10^6
+WHEEL_MIN_PENDING = 1 << 22
+# ... and the events must not be spread so thinly that most pops cascade
+WHEEL_MAX_SPAN_PER_EVENT = 1 << 16
+
+
+class HeapQueue:
+    """heapq-backed event queue."""
+
+    kind = "heap"
+
+    def __init__(self, items=()):
+        self.heap = list(items)
+        heapq.heapify(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item):
+        heapq.heappush(self.heap, item)
+
+    def pop(self):
+        return heapq.heappop(self.heap)
+
+    def peek(self):
+        return self.heap[0]
+
+    def cancel(self, item):
+        heap = self.heap
+        i = heap.index(item)            # ValueError if not pending
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            heapq.heapify(heap)
+
+    def items(self):
+        """Pending events in pop order."""
+        return sorted(self.heap)
+
+
+class TimingWheel:
+    """Hierarchical timing wheel over integer event times (floats with integer values are accepted)."""
+
+    kind = "wheel"
+
+    def __init__(self, items=(), bits=12, levels=3, start=0):
+        self.bits = bits
+        self.levels = levels
+        self.mask = (1 << bits) - 1
+        self.now = start                    # every pending event is at or after now
+        self.wheels = [[[] for _ in range(1 << bits)] for _ in range(levels)]
+        self.occupied = [0] * levels        # bitmap of non-empty slots per level
+        self.overflow = []                  # heap of (time, item) beyond the top wheel
+        self.current = []                   # sorted events at time `now`
+        self.head = 0                       # next unpopped index into current
+        self.early = []                     # heap of events pushed before now
+        self.count = 0
+        items = sorted(items)
+        if items:
+            self.now = min(self.now, self._time(items[0]))
+        for item in items:
+            self.push(item)
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _time(item):
+        t = item[0]
+        k = int(t)
+        if k != t:
+            raise ValueError(f"TimingWheel needs integer event times, got {t!r}")
+        return k
+
+    def push(self, item):
+        t = item[0]
+        if t.__class__ is not int:
+            t = self._time(item)
+        now = self.now
+        self.count += 1
+        if t > now:
+            diff = t ^ now
+            if diff <= self.mask:
+                self.wheels[0][t & self.mask].append(item)
+                self.occupied[0] |= 1 << (t & self.mask)
+            else:
+                self._place(t, item)
+        elif t == now:
+            insort(self.current, item, self.head)
+        else:
+            heapq.heappush(self.early, item)
+
+    def _place(self, t, item):
+        bits = self.bits
+        level = ((t ^ self.now).bit_length() - 1) // bits
+        if level >= self.levels:
+            heapq.heappush(self.overflow, (t, item))
+            return
+        slot = (t >> (level * bits)) & self.mask
+        self.wheels[level][slot].append(item)
+        self.occupied[level] |= 1 << slot
+
+    def _advance(self):
+        """Move `now` to the next event time and load its events into current."""
+        mask = self.mask
+        occupied = self.occupied
+        # fast path: the next event time is in the current level-0 span
+        pos = self.now & mask
+        later = occupied[0] >> (pos + 1)
+        if later:
+            slot = pos + (later & -later).bit_length()
+            occupied[0] ^= 1 << slot
+            wheel = self.wheels[0]
+            current = wheel[slot]
+            wheel[slot] = []
+            self.now = (self.now & ~mask) | slot
+            if len(current) > 1:
+                current.sort()
+            self.current = current
+            self.head = 0
+            return
+
+        current = []
+        bits = self.bits
+        while not current:
+            for level in range(self.levels):
+                shift = level * bits
+                pos = (self.now >> shift) & mask
+                later = occupied[level] >> (pos + 1)
+                if not later:
+                    continue
+                slot = pos + (later & -later).bit_length()
+                bucket = self.wheels[level][slot]
+                self.wheels[level][slot] = []
+                occupied[level] ^= 1 << slot
+                # start of that slot's span; every lower wheel is empty
+                top = shift + bits
+                now = self.now = ((self.now >> top) << top) | (slot << shift)
+                if level == 0:
+                    current = bucket
+                else:
+                    place = self._place
+                    for item in bucket:
+                        t = int(item[0])
+                        if t == now:
+                            current.append(item)
+                        else:
+                            place(t, item)
+                break
+            else:
+                # wheels empty: refill them from the overflow heap
+                t, item = heapq.heappop(self.overflow)
+                self.now = t
+                current.append(item)
+                span = self.levels * bits
+                while self.overflow and self.overflow[0][0] >> span == t >> span:
+                    t2, item = heapq.heappop(self.overflow)
+                    if t2 == t:
+                        current.append(item)
+                    else:
+                        self._place(t2, item)
+        if len(current) > 1:
+            current.sort()
+        self.current = current
+        self.head = 0
+
+    def pop(self):
+        head = self.head
+        if head < len(self.current) and not self.early:
+            self.head = head + 1
+            self.count -= 1
+            return self.current[head]
+        if self.early:
+            self.count -= 1
+            return heapq.heappop(self.early)
+        if not self.count:
+            raise IndexError("pop from an empty TimingWheel")
+        self._advance()
+        self.head = 1
+        self.count -= 1
+        return self.current[0]
+
+    def peek(self):
+        if self.early:
+            return self.early[0]
+        if self.head >= len(self.current):
+            if not self.count:
+                raise IndexError("peek into an empty TimingWheel")
+            self._advance()
+        return self.current[self.head]
+
+    def cancel(self, item):
+        t = self._time(item)
+        if t > self.now:
+            level = ((t ^ self.now).bit_length() - 1) // self.bits
+            if level >= self.levels:
+                self.overflow.remove((t, item))
+                heapq.heapify(self.overflow)
+            else:
+                slot = (t >> (level * self.bits)) & self.mask
+                bucket = self.wheels[level][slot]
+                bucket.remove(item)
+                if not bucket:
+                    self.occupied[level] &= ~(1 << slot)
+        elif item in self.early:
+            self.early.remove(item)
+            heapq.heapify(self.early)
+        else:
+            i = self.current.index(item, self.head)
+            del self.current[i]
+        self.count -= 1
+
+    def items(self):
+        """Pending events in pop order."""
+        out = self.early + self.current[self.head:]
+        for wheel in self.wheels:
+            for bucket in wheel:
+                out.extend(bucket)
+        out.extend(item for _, item in self.overflow)
+        return sorted(out)
+
+
+QUEUES = {"heap": HeapQueue, "wheel": TimingWheel}
+
+
+def make_queue(kind="heap", items=()):
+    if kind not in QUEUES:
+        raise ValueError(f"Unknown event queue {kind!r}")
+    return QUEUES[kind](items)
+
+
+def select_queue(times, pending):
+    """
+    "wheel" when every event time in `times` (a sample is enough) is an
+    integer, about `pending` events are kept queued at once, and they are
+    dense enough in time that the wheel rarely cascades; else "heap".
+    """
+    if pending < WHEEL_MIN_PENDING:
+        return "heap"
+    lo = hi = None
+    for t in times:
+        if int(t) != t:
+            return "heap"
+        lo = t if lo is None or t < lo else lo
+        hi = t if hi is None or t > hi else hi
+    if lo is None or (hi - lo) / pending > WHEEL_MAX_SPAN_PER_EVENT:
+        return "heap"
+    return "wheel"
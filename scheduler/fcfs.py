@@ -1,15 +1,27 @@
-def run_fcfs(processes):
+from scheduler import instrument
+
+
+def run_fcfs(processes, progress=None):
     """
     First Come First Serve Scheduling (Non-Preemptive)
+    progress: optional callback(completed, total) invoked as processes finish
     """
     processes.sort(key=lambda x: x['arrival'])
     time = 0
-    for p in processes:
+    total = len(processes)
+    probe = instrument.active
+    for done, p in enumerate(processes, 1):
         if time < p['arrival']:
             time = p['arrival']
+            if probe is not None:
+                probe.count("idle_gaps")
+        if probe is not None:
+            probe.count("context_switches")
         p['start'] = time
         p['finish'] = time + p['burst']
         p['turnaround'] = p['finish'] - p['arrival']
         p['waiting'] = p['turnaround'] - p['burst']
         time = p['finish']
+        if progress is not None:
+            progress(done, total)
     return {"processes": processes}
@@ -0,0 +1,349 @@
+# scheduler/gang.py
+
+"""
+Gang scheduling (co-scheduling) of multi-threaded processes.
+
+A process may declare "threads" (default 1): that many threads which only
+make progress while all of them run at once, each needing the process's
+"burst" of CPU time. Gangs are placed in an Ousterhout matrix: rows are
+time slots, columns are CPUs, and a gang takes `threads` adjacent
+columns of one row. Rows run in turn for one quantum each; a slot ends
+early once every gang in it has finished.
+
+Reducing fragmentation (holes: columns no gang of the row uses):
+ - packing: where an arriving gang goes. "first_fit" takes the first row
+   with a wide enough hole, "best_fit" the tightest such hole (fewest
+   columns left over), opening a new row only when nothing fits
+ - fill: alternative scheduling. Holes of the running row are filled with
+   whole gangs from the other rows, taken in the order the rows would run
+ - repack: when gangs leave, gangs of later rows move into holes of
+   earlier rows and emptied rows are dropped, so the cycle gets shorter
+
+result["gang"] reports how much CPU time is lost to the gang constraint:
+ - fragmentation: % of CPU time left as holes at dispatch while threads of
+   other gangs were waiting for their row
+ - gang_idle: % of CPU time any CPU idled while threads were waiting:
+   the holes, plus CPUs freed by a gang finishing mid-slot and gangs
+   arriving during a slot
+ - slots, max_rows and mean_rows of the matrix
+run_independent() schedules the same threads one by one (RR on the
+engine), the baseline for what the gang constraint costs in throughput.
+"""
+
+from scheduler import instrument
+from scheduler.engine import simulate
+
+PACKINGS = ("first_fit", "best_fit")
+
+
+def _holes(cells):
+    """(start column, width) of every run of free columns in a row."""
+    holes = []
+    start = None
+    for col, g in enumerate(cells):
+        if g is None:
+            if start is None:
+                start = col
+        elif start is not None:
+            holes.append((start, col - start))
+            start = None
+    if start is not None:
+        holes.append((start, len(cells) - start))
+    return holes
+
+
+class Matrix:
+    """Ousterhout matrix: rows of `cpus` cells, each a gang index or None."""
+
+    def __init__(self, cpus, packing="first_fit"):
+        if packing not in PACKINGS:
+            raise ValueError(f"Unknown packing {packing!r}")
+        self.cpus = cpus
+        self.packing = packing
+        self.rows = []
+        self.where = {}             # gang -> (row, first column, width)
+        self.free = {}              # id(row) -> free columns, to skip full rows
+        self.threads = 0            # columns taken over all rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _fit(self, k, rows):
+        """(row, column) of the hole the packing picks for a gang of width k, or None."""
+        best = None
+        for row in rows:
+            if self.free[id(row)] < k:
+                continue
+            for col, width in _holes(row):
+                if width < k:
+                    continue
+                if self.packing == "first_fit":
+                    return row, col
+                if best is None or width - k < best[0]:
+                    best = (width - k, row, col)
+                    if width == k:
+                        return row, col
+        return None if best is None else best[1:]
+
+    def _put(self, g, k, row, col):
+        row[col:col + k] = [g] * k
+        self.where[g] = (row, col, k)
+        self.free[id(row)] -= k
+        self.threads += k
+
+    def _take(self, g):
+        row, col, k = self.where.pop(g)
+        row[col:col + k] = [None] * k
+        self.free[id(row)] += k
+        self.threads -= k
+        return row
+
+    def _drop_empty(self):
+        for row in self.rows:
+            if self.free[id(row)] == self.cpus:
+                del self.free[id(row)]
+        self.rows = [r for r in self.rows if id(r) in self.free]
+
+    def place(self, g, k):
+        spot = self._fit(k, self.rows)
+        if spot is None:
+            spot = ([None] * self.cpus, 0)
+            self.rows.append(spot[0])
+            self.free[id(spot[0])] = self.cpus
+        self._put(g, k, *spot)
+
+    def remove(self, g):
+        if self.free[id(self._take(g))] == self.cpus:
+            self._drop_empty()
+
+    def gangs(self, row):
+        """Gangs of a row, in column order."""
+        out = []
+        for g in row:
+            if g is not None and (not out or out[-1] != g):
+                out.append(g)
+        return out
+
+    def repack(self):
+        """Move gangs of later rows into holes of earlier rows; drop emptied rows. Returns the moves."""
+        moves = 0
+        # moving gangs only fills earlier holes, so the rows with holes are found once
+        holey = [(i, row) for i, row in enumerate(self.rows) if self.free[id(row)]]
+        for i in range(len(self.rows) - 1, 0, -1):
+            row = self.rows[i]
+            targets = [r for j, r in holey if j < i and self.free[id(r)]]
+            if not targets:
+                break
+            for g in self.gangs(row):
+                k = self.where[g][2]
+                spot = self._fit(k, targets)
+                if spot is not None:
+                    self._take(g)
+                    self._put(g, k, *spot)
+                    moves += 1
+        self._drop_empty()
+        return moves
+
+
+def job_fields(p, cpus):
+    """(arrival, burst, threads) of a process, validated against the machine size."""
+    arrival = p.get("arrival_time", p.get("arrival", 0))
+    burst = p.get("burst_time", p.get("burst", 0))
+    threads = p.get("threads", 1)
+    if threads < 1 or int(threads) != threads:
+        raise ValueError(f"{p.get('pid')}: threads must be a positive integer")
+    if threads > cpus:
+        raise ValueError(f"{p.get('pid')}: has {threads} threads, the machine has {cpus} CPUs")
+    if burst < 0:
+        raise ValueError(f"{p.get('pid')}: burst must be non-negative")
+    return arrival, burst, int(threads)
+
+
+def run_gang(processes, cpus=1, quantum=3, packing="first_fit", fill=True, repack=True, progress=None):
+    """
+    Gang-schedule `processes` on `cpus` CPUs (see the module docstring).
+    quantum: length of one slot of the matrix
+    packing / fill / repack: fragmentation reduction, see the module docstring
+    progress: optional callback(completed, total) invoked as processes finish
+    """
+    if cpus < 1 or quantum <= 0:
+        raise ValueError("cpus must be >= 1 and quantum > 0")
+    fields = [job_fields(p, cpus) for p in processes]
+    order = sorted(range(len(processes)), key=lambda i: fields[i][0])
+    n = len(order)
+    arrival = [fields[i][0] for i in order]
+    threads = [fields[i][2] for i in order]
+    remaining = [fields[i][1] for i in order]
+    start = [None] * n
+    finish = [None] * n
+    dispatches = [0] * n
+
+    probe = instrument.active
+    matrix = Matrix(cpus, packing)
+    segments = []
+    completed = 0
+    nxt = 0
+    pos = 0                         # index of the next row to run
+    t = arrival[0] if n else 0
+    slots = 0
+    row_time = 0.0                  # integral of the row count over scheduled time
+    scheduled = 0.0
+    hole_time = 0.0
+    gang_idle = 0.0
+    max_rows = 0
+
+    def admit(now):
+        nonlocal nxt
+        while nxt < n and arrival[nxt] <= now:
+            if remaining[nxt] > 0:
+                matrix.place(nxt, threads[nxt])
+            else:
+                start[nxt] = finish[nxt] = arrival[nxt]
+                finished()
+            nxt += 1
+            if probe is not None:
+                probe.count("queue_ops")
+
+    def finished():
+        nonlocal completed
+        completed += 1
+        if progress is not None:
+            progress(completed, n)
+
+    while completed < n:
+        admit(t)
+        if not matrix.rows:
+            t = arrival[nxt]
+            continue
+        max_rows = max(max_rows, len(matrix))
+        rows = matrix.rows
+        pos %= len(rows)
+        row = rows[pos]
+
+        # the row's own gangs on their columns, then whole gangs of the
+        # following rows in the holes
+        running = [(g, list(range(matrix.where[g][1], matrix.where[g][1] + threads[g])))
+                   for g in matrix.gangs(row)]
+        free = [col for col, cell in enumerate(row) if cell is None]
+        if fill and free:
+            for other in rows[pos + 1:] + rows[:pos]:
+                for g in matrix.gangs(other):
+                    if threads[g] <= len(free):
+                        running.append((g, free[:threads[g]]))
+                        del free[:threads[g]]
+                if not free:
+                    break
+        waiting = matrix.threads - sum(threads[g] for g, _ in running)
+
+        length = min(quantum, max(remaining[g] for g, _ in running))
+        end = t + length
+        runs = []
+        for g, cols in running:
+            run = min(length, remaining[g])
+            runs.append(run)
+            if start[g] is None:
+                start[g] = t
+            p = processes[order[g]]
+            for cpu in cols:
+                segments.append({
+                    "pid": p["pid"],
+                    "arrival_time": arrival[g],
+                    "burst_time": fields[order[g]][1],
+                    "priority": p.get("priority", 1),
+                    "start": t,
+                    "finish": t + run,
+                    "cpu": cpu,
+                    "threads": threads[g],
+                    "is_rogue": p.get("is_rogue", False),
+                    "throttled": p.get("throttled", False),
+                    "terminated": p.get("terminated", False)
+                })
+            remaining[g] -= run
+            dispatches[g] += 1
+            if probe is not None:
+                probe.count("context_switches", threads[g])
+
+        # CPUs idle while threads wait: piecewise over the slot, as gangs
+        # finish and new gangs arrive
+        hole_time += min(len(free), waiting) * length
+        late = []
+        j = nxt
+        while j < n and arrival[j] < end:
+            if remaining[j] > 0:
+                late.append(j)
+            j += 1
+        edges = sorted({t, end} | {t + run for run in runs} | {arrival[j] for j in late})
+        for a, b in zip(edges, edges[1:]):
+            busy = sum(threads[g] for (g, _), run in zip(running, runs) if t + run > a)
+            ready = waiting + sum(threads[j] for j in late if arrival[j] <= a)
+            gang_idle += min(cpus - busy, ready) * (b - a)
+
+        done = []
+        for (g, _), run in zip(running, runs):
+            if remaining[g] <= 0:
+                finish[g] = t + run
+                done.append(g)
+        slots += 1
+        scheduled += length
+        row_time += len(rows) * length
+        t = end
+
+        # departures, then the next row in cycle order among the rows that survive
+        old = list(rows)
+        for g in done:
+            matrix.remove(g)
+            finished()
+        if done and repack:
+            moved = matrix.repack()
+            if probe is not None and moved:
+                probe.count("queue_ops", moved)
+        alive = {id(r) for r in matrix.rows}
+        following = [r for r in old[pos + 1:] if id(r) in alive]
+        pos = next((i for i, r in enumerate(matrix.rows) if following and r is following[0]), len(matrix.rows))
+
+    summary = []
+    for g, i in enumerate(order):
+        q = dict(processes[i])
+        q["start"] = start[g]
+        q["finish"] = finish[g]
+        q["turnaround"] = finish[g] - arrival[g]
+        q["waiting"] = q["turnaround"] - fields[i][1]
+        q["threads"] = threads[g]
+        q["dispatches"] = dispatches[g]
+        summary.append(q)
+
+    makespan = max(finish, default=0) - (arrival[0] if n else 0)
+    capacity = cpus * makespan
+    gang = {
+        "fragmentation": round(100.0 * hole_time / capacity, 2) if capacity > 0 else 0.0,
+        "gang_idle": round(100.0 * gang_idle / capacity, 2) if capacity > 0 else 0.0,
+        "slots": slots,
+        "max_rows": max_rows,
+        "mean_rows": round(row_time / scheduled, 3) if scheduled > 0 else 0.0,
+    }
+    return {"processes": segments, "summary": summary, "gang": gang}
+
+
+def run_independent(processes, cpus=1, quantum=3):
+    """
+    The baseline without the gang constraint: every thread of every process
+    is its own process, Round Robin on `cpus` CPUs (the event-driven
+    engine). Segments carry the pid of their process, so metrics.compute
+    gives per-process waiting and turnaround (a process finishes with its
+    last thread).
+    """
+    owner = {}
+    threads = []
+    for p in processes:
+        job_fields(p, cpus)
+        for k in range(p.get("threads", 1)):
+            q = dict(p)
+            q["pid"] = f"{p['pid']}#{k}"
+            q.pop("threads", None)
+            owner[q["pid"]] = p["pid"]
+            threads.append(q)
+    result = simulate(threads, "RR", quantum=quantum, cpus=cpus)
+    for seg in result["processes"]:
+        if "pid" in seg and seg["pid"] in owner:
+            seg["pid"] = owner[seg["pid"]]
+    return result
@@ -0,0 +1,136 @@
+# scheduler/incremental.py
+
+"""
+Incremental re-simulation for interactive what-if edits.
+
+An IncrementalSimulation keeps one engine run of a workload together with
+snapshots taken at arrival boundaries. Nothing a process arriving at time
+t does can affect the schedule before t, so when a process is added,
+edited or removed, the new run restores the last snapshot at or before
+the earliest affected arrival and only simulates from there. The cached
+prefix (segments, finished processes) is reused as is.
+
+About max_snapshots snapshots are kept per run, so a resume replays at
+most ~n / max_snapshots arrivals before the edit point. A snapshot only
+stores the processes that are active at that moment, so memory stays
+small. The result is always identical to a fresh engine.simulate() over
+the same processes.
+"""
+
+from bisect import bisect_right
+
+from scheduler.engine import ALIASES, POLICIES, Engine, normalize
+
+DEFAULT_MAX_SNAPSHOTS = 256
+
+
+class IncrementalSimulation:
+    """One policy over an editable workload; edits re-run only the affected suffix."""
+
+    def __init__(self, processes=(), policy="FCFS", quantum=3, cpus=1, cost_model=None,
+                 max_snapshots=DEFAULT_MAX_SNAPSHOTS, progress=None, index=None, cancel_event=None):
+        """
+        index: a scheduler.workload_index.WorkloadIndex of `processes`, shared
+               between policies so the workload is normalized and sorted once
+        progress / cancel_event: as for Engine.run(), here and for every edit
+        """
+        self.policy = ALIASES.get(policy.upper(), policy.upper())
+        if self.policy not in POLICIES:
+            raise ValueError("Invalid algorithm")
+        self.quantum = quantum
+        self.cpus = cpus
+        self.cost_model = cost_model
+        self.max_snapshots = max_snapshots
+        self.order_key = POLICIES[self.policy][0]
+        self.procs = []             # normalized, in engine order
+        self.keys = []              # order key of each entry of procs
+        if index is not None:
+            self.procs = list(index.order(self.policy))
+            self.keys = [self.order_key(p) for p in self.procs]
+        else:
+            for p in normalize(processes):
+                self._insert(p)
+        self.engine = None
+        self._result = None
+        self.resumed_at = None      # arrival time the last run resumed from (None = from scratch)
+        self._run(None, progress, cancel_event)
+
+    def __len__(self):
+        return len(self.procs)
+
+    # ---------------- edits ----------------
+    def add(self, processes, progress=None, cancel_event=None):
+        """Add processes (dicts) and re-simulate; returns result()."""
+        new = normalize(processes)
+        if not new:
+            return self.result()
+        procs, keys = list(self.procs), list(self.keys)
+        for p in new:
+            self._insert(p, procs, keys)
+        return self._commit(procs, keys, min(p["arrival"] for p in new), progress, cancel_event)
+
+    def replace(self, pid, process, progress=None, cancel_event=None):
+        """Replace the process with `pid` by `process` and re-simulate."""
+        procs, keys = list(self.procs), list(self.keys)
+        old = self._pop(pid, procs, keys)
+        new = normalize([process])[0]
+        self._insert(new, procs, keys)
+        return self._commit(procs, keys, min(old["arrival"], new["arrival"]), progress, cancel_event)
+
+    def remove(self, pid, progress=None, cancel_event=None):
+        """Remove the process with `pid` and re-simulate."""
+        procs, keys = list(self.procs), list(self.keys)
+        old = self._pop(pid, procs, keys)
+        return self._commit(procs, keys, old["arrival"], progress, cancel_event)
+
+    def result(self):
+        if self._result is None:
+            self._result = self.engine.result()
+        return self._result
+
+    # ---------------- internals ----------------
+    def _insert(self, p, procs=None, keys=None):
+        """Insert after existing entries with an equal key, like a stable sort of an appended item."""
+        procs = self.procs if procs is None else procs
+        keys = self.keys if keys is None else keys
+        key = self.order_key(p)
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        procs.insert(i, p)
+
+    @staticmethod
+    def _pop(pid, procs, keys):
+        for i, p in enumerate(procs):
+            if p["pid"] == pid:
+                del keys[i]
+                return procs.pop(i)
+        raise KeyError(pid)
+
+    def _commit(self, procs, keys, since, progress, cancel_event):
+        # the old run stays in place until the new one has completed
+        previous = (self.procs, self.keys)
+        self.procs, self.keys = procs, keys
+        try:
+            self._run(since, progress, cancel_event)
+        except BaseException:
+            self.procs, self.keys = previous
+            raise
+        return self.result()
+
+    def _run(self, since, progress, cancel_event):
+        engine = Engine(self.procs, self.policy, quantum=self.quantum, cpus=self.cpus,
+                        cost_model=self.cost_model, presorted=True)
+        engine.snapshot_every = max(1, len(self.procs) // self.max_snapshots)
+        engine.snapshots = []
+        base = self.engine
+        self.resumed_at = None
+        if base is not None and since is not None and base.devices == engine.devices:
+            times = [t for t, _ in base.snapshots]
+            pos = bisect_right(times, since) - 1
+            if pos >= 0:
+                engine.restore(base.snapshots[pos][1], base)
+                engine.snapshots = base.snapshots[:pos + 1]
+                self.resumed_at = times[pos]
+        engine.run(progress, cancel_event=cancel_event)
+        self.engine = engine
+        self._result = None
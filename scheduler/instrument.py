@@ -0,0 +1,140 @@
+# scheduler/instrument.py
+
+"""
+Hot-path instrumentation for the scheduler package.
+
+A Probe collects:
+ - counters: context switches, queue operations, heap pushes / pops,
+   preemptions and idle gaps, incremented by the schedulers themselves
+ - phase timers (perf_counter_ns): security pre-pass, scheduling,
+   metrics, rendering
+ - optional cProfile and tracemalloc captures for the whole run
+ - the process's peak resident set size (peak_rss_kb), for sizing batch
+   nodes; unlike tracemalloc it costs nothing and includes the interpreter
+
+Instrumentation is off unless a run is wrapped in instrumented(). The
+schedulers read the module-level `active` probe once per call; when it is
+None every hook is a single `is not None` test, and phase() is a no-op.
+The profilers are imported only when requested, to keep CLI start-up fast.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:     # not available on Windows
+    resource = None
+
+COUNTERS = (
+    "context_switches",
+    "queue_ops",
+    "heap_pushes",
+    "heap_pops",
+    "preemptions",
+    "idle_gaps",
+)
+PHASES = ("security", "scheduling", "metrics", "rendering")
+PROFILE_LINES = 15
+
+# Probe of the run in progress, or None when instrumentation is disabled
+active = None
+
+
+class Probe:
+    """Counters, phase timers and optional profiler state for one run."""
+
+    def __init__(self, profile=False, trace_memory=False):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases_ns = {}
+        if profile:
+            import cProfile
+            self.profile = cProfile.Profile()
+        else:
+            self.profile = None
+        self.trace_memory = trace_memory
+        self.profile_text = None
+        self.peak_memory_kb = None
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.phases_ns[name] = self.phases_ns.get(name, 0) + time.perf_counter_ns() - t0
+
+    def report(self):
+        out = {
+            "counters": dict(self.counters),
+            "phases_ms": {k: round(v / 1e6, 3) for k, v in self.phases_ns.items()},
+        }
+        if self.profile_text is not None:
+            out["profile"] = self.profile_text
+        if self.peak_memory_kb is not None:
+            out["peak_memory_kb"] = self.peak_memory_kb
+        rss = peak_rss_kb()
+        if rss is not None:
+            out["peak_rss_kb"] = rss
+        return out
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process so far in KB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@contextmanager
+def instrumented(profile=False, trace_memory=False):
+    """
+    Enable instrumentation for the enclosed run and yield its Probe.
+    profile: capture a cProfile of the run (top functions by cumulative time)
+    trace_memory: record the tracemalloc peak in KB
+    """
+    global active
+    if trace_memory:
+        import tracemalloc
+    probe = Probe(profile=profile, trace_memory=trace_memory)
+    previous = active
+    active = probe
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif trace_memory:
+        tracemalloc.reset_peak()
+    if probe.profile is not None:
+        probe.profile.enable()
+    try:
+        yield probe
+    finally:
+        if probe.profile is not None:
+            probe.profile.disable()
+            import io
+            import pstats
+            buf = io.StringIO()
+            pstats.Stats(probe.profile, stream=buf).sort_stats("cumulative").print_stats(PROFILE_LINES)
+            probe.profile_text = buf.getvalue()
+        if trace_memory:
+            probe.peak_memory_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            if started_tracing:
+                tracemalloc.stop()
+        active = previous
+
+
+@contextmanager
+def phase(name):
+    """Time a phase on the active probe; a no-op when instrumentation is off."""
+    probe = active
+    if probe is None:
+        yield
+        return
+    with probe.phase(name):
+        yield
@@ -0,0 +1,82 @@
+# scheduler/lottery.py
+
+import random
+
+from scheduler.proportional import run_proportional
+
+
+class FenwickTree:
+    """Prefix sums over integer weights with O(log n) update and search."""
+
+    def __init__(self, n):
+        self.n = n
+        self.tree = [0] * (n + 1)
+        self.total = 0
+        self.top = 1 << max(0, n.bit_length() - 1) if n else 0
+
+    def add(self, i, delta):
+        """weights[i] += delta (0-based i)."""
+        self.total += delta
+        i += 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, r):
+        """Smallest 0-based i with weights[0] + ... + weights[i] > r (0 <= r < total)."""
+        pos = 0
+        step = self.top
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] <= r:
+                pos = nxt
+                r -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+
+class LotterySelector:
+    """
+    Lottery draws over a Fenwick tree indexed by process: a ticket number in
+    [0, total) is drawn and located by a binary descent of the tree instead of
+    a linear scan of cumulative sums. Arrivals, completions and ticket changes
+    are single point updates.
+    """
+
+    def __init__(self, n, rng):
+        self.tree = FenwickTree(n)
+        self.tickets = [0] * n
+        self.rng = rng
+
+    def add(self, i, tickets):
+        self.tickets[i] = tickets
+        self.tree.add(i, tickets)
+
+    def remove(self, i):
+        self.tree.add(i, -self.tickets[i])
+        self.tickets[i] = 0
+
+    def change(self, i, tickets):
+        self.tree.add(i, tickets - self.tickets[i])
+        self.tickets[i] = tickets
+
+    def pick(self):
+        # run_proportional counts the pick as a queue op
+        return self.tree.find(self.rng.randrange(self.tree.total))
+
+    def charge(self, i, ran):
+        pass
+
+
+def run_lottery(processes, quantum=1, seed=None, ticket_changes=None, progress=None, sample_every=None):
+    """
+    Lottery Scheduling (randomized proportional share)
+    Each quantum goes to the holder of a randomly drawn ticket; tickets come
+    from "tickets" or priority (see scheduler.proportional).
+    seed: seed of the private random.Random used for the draws
+    ticket_changes: [(time, pid, tickets)] applied while running
+    sample_every: time between share-deviation samples (default: ~100 over the run)
+    progress: optional callback(completed, total) invoked as processes finish
+    """
+    selector = LotterySelector(len(processes), random.Random(seed))
+    return run_proportional(processes, selector, quantum, ticket_changes, progress, sample_every)
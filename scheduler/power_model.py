@@ -0,0 +1,157 @@
+# scheduler/power_model.py
+
+"""
+Per-CPU frequency (DVFS) and power model.
+
+A PowerModel gives every CPU:
+ - P-states: discrete (frequency, active power) operating points. Bursts
+   are measured at the highest frequency, so a burst of b runs for
+   b * f_max / f at frequency f
+ - C-states: idle states (name, power, entry latency, exit latency, target
+   residency). An idle period of length d is spent in the deepest state
+   whose target residency fits in d, as a menu-style idle governor with a
+   perfect prediction would choose: the entry latency burns C0 power and
+   the exit latency delays the next dispatch, charged as "wakeup" overhead
+ - a governor choosing the P-state at every dispatch:
+    - performance: always the highest frequency
+    - powersave: always the lowest
+    - ondemand: the highest frequency above up_threshold utilization, else
+      the lowest frequency that covers the utilization with headroom
+   Utilization is an exponential moving average of the CPU's busy time
+   with time constant `window`, updated at every scheduler event
+
+Energy is power * time: joules when one tick is one second. The engine
+charges active power during work and overhead, C-state power while
+idle, and reports energy per segment, per process and in total (see
+metrics.compute).
+"""
+
+import math
+from collections import namedtuple
+
+PState = namedtuple("PState", "freq power")
+CState = namedtuple("CState", "name power entry_latency exit_latency target_residency")
+
+# GHz / W, roughly a 5-step laptop core
+DEFAULT_PSTATES = (PState(1.0, 2.0), PState(1.6, 3.8), PState(2.2, 6.5), PState(2.8, 10.5), PState(3.4, 16.0))
+DEFAULT_CSTATES = (
+    CState("C0", 1.5, 0.0, 0.0, 0.0),
+    CState("C1", 0.8, 0.0, 0.002, 0.01),
+    CState("C3", 0.3, 0.03, 0.05, 0.5),
+    CState("C6", 0.05, 0.1, 0.15, 2.0),
+)
+
+
+class PerformanceGovernor:
+    name = "performance"
+
+    def select(self, pstates, util):
+        return len(pstates) - 1
+
+    def to_dict(self):
+        return {"name": self.name}
+
+
+class PowersaveGovernor:
+    name = "powersave"
+
+    def select(self, pstates, util):
+        return 0
+
+    def to_dict(self):
+        return {"name": self.name}
+
+
+class OndemandGovernor:
+    name = "ondemand"
+
+    def __init__(self, up_threshold=0.8):
+        if not 0 < up_threshold <= 1:
+            raise ValueError("up_threshold must be in (0, 1]")
+        self.up_threshold = up_threshold
+
+    def select(self, pstates, util):
+        top = len(pstates) - 1
+        if util >= self.up_threshold:
+            return top
+        target = pstates[top].freq * util / self.up_threshold
+        for i, p in enumerate(pstates):
+            if p.freq >= target:
+                return i
+        return top
+
+    def to_dict(self):
+        return {"name": self.name, "up_threshold": self.up_threshold}
+
+
+GOVERNORS = {g.name: g for g in (PerformanceGovernor, PowersaveGovernor, OndemandGovernor)}
+
+
+def make_governor(spec):
+    """Governor from a name, a to_dict() dict, or an object with select(pstates, util)."""
+    if isinstance(spec, str):
+        spec = {"name": spec}
+    if isinstance(spec, dict):
+        spec = dict(spec)
+        name = spec.pop("name")
+        if name not in GOVERNORS:
+            raise ValueError(f"Unknown governor {name!r}")
+        return GOVERNORS[name](**spec)
+    return spec
+
+
+class PowerModel:
+    def __init__(self, pstates=DEFAULT_PSTATES, cstates=DEFAULT_CSTATES, governor="performance", window=10.0):
+        pstates = sorted(PState(*p) for p in pstates)
+        cstates = sorted((CState(*c) for c in cstates), key=lambda c: c.target_residency)
+        if not pstates or pstates[0].freq <= 0 or min(p.power for p in pstates) < 0:
+            raise ValueError("Need at least one P-state with positive frequency and non-negative power")
+        if not cstates or cstates[0].target_residency != 0:
+            raise ValueError("Need a C-state with zero target residency (the shallowest idle state)")
+        if min(min(c.power, c.entry_latency, c.exit_latency) for c in cstates) < 0 or window <= 0:
+            raise ValueError("C-state power and latencies must be non-negative and window positive")
+        self.pstates = tuple(pstates)
+        self.cstates = tuple(cstates)
+        self.governor = make_governor(governor)
+        self.window = window
+        self.top = len(pstates) - 1
+        self.speeds = tuple(p.freq / pstates[-1].freq for p in pstates)
+
+    def __repr__(self):
+        return (f"PowerModel(pstates={list(self.pstates)}, cstates={list(self.cstates)}, "
+                f"governor={self.governor.to_dict()}, window={self.window})")
+
+    def select(self, util):
+        """P-state index for the next slice on a CPU with utilization `util`."""
+        return self.governor.select(self.pstates, util)
+
+    def decay(self, util, busy, dt):
+        """Utilization after `dt` more time busy (busy=True) or idle."""
+        if dt <= 0:
+            return util
+        target = 1.0 if busy else 0.0
+        return target + (util - target) * math.exp(-dt / self.window)
+
+    def cstate(self, idle):
+        """Deepest C-state worth entering for an idle period of length `idle`."""
+        chosen = self.cstates[0]
+        for c in self.cstates:
+            if c.target_residency <= idle and c.entry_latency + c.exit_latency <= idle:
+                chosen = c
+        return chosen
+
+    def idle_energy(self, idle):
+        """Energy of an idle period of length `idle` (entry latency at C0 power)."""
+        if idle <= 0:
+            return 0.0
+        c = self.cstate(idle)
+        entry = min(c.entry_latency, idle)
+        return entry * self.cstates[0].power + (idle - entry) * c.power
+
+    def to_dict(self):
+        return {"pstates": [list(p) for p in self.pstates], "cstates": [list(c) for c in self.cstates],
+                "governor": self.governor.to_dict(), "window": self.window}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**{k: d[k] for k in ("pstates", "cstates", "governor", "window") if k in d})
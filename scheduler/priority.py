@@ -1,25 +1,42 @@
-def run_priority(processes):
+from scheduler import instrument
+
+
+def run_priority(processes, progress=None):
     """
     Priority Scheduling (Lower number = Higher priority)
+    progress: optional callback(completed, total) invoked as processes finish
     """
     processes.sort(key=lambda x: (x['arrival'], x['priority']))
     completed = []
     ready = []
     time = 0
+    idle = False
+    probe = instrument.active
 
     while len(completed) < len(processes):
         for p in processes:
             if p not in completed and p['arrival'] <= time and p not in ready:
                 ready.append(p)
+                if probe is not None:
+                    probe.count("queue_ops")
         if not ready:
+            if probe is not None and not idle:
+                probe.count("idle_gaps")
+            idle = True
             time += 1
             continue
+        idle = False
         ready.sort(key=lambda x: x['priority'])
         current = ready.pop(0)
+        if probe is not None:
+            probe.count("queue_ops", 2)     # sort + pop
+            probe.count("context_switches")
         current['start'] = time
         time += current['burst']
         current['finish'] = time
         current['turnaround'] = current['finish'] - current['arrival']
         current['waiting'] = current['turnaround'] - current['burst']
         completed.append(current)
+        if progress is not None:
+            progress(len(completed), len(processes))
     return {"processes": completed}
@@ -0,0 +1,36 @@
+# scheduler/progress.py
+
+"""
+Progress reporting and cancellation for long scheduler runs.
+
+Every run_* scheduler accepts progress=callback(completed, total), called
+each time a process finishes. A callback may raise SimulationCancelled to
+stop the run partway through; the scheduler lets it propagate. The
+event-driven engine also takes the cancel event itself and checks it every
+few steps, so a run stops promptly even while no process completes.
+"""
+
+
+class SimulationCancelled(Exception):
+    """Raised from a progress callback to abort a running simulation."""
+
+
+def make_progress(report, cancel_event=None, offset=0.0, scale=1.0, step=0.01):
+    """
+    Build a scheduler progress callback.
+
+    - report: called with the overall fraction done (0..1), at most once per `step`
+    - cancel_event: threading.Event; when set, the callback raises SimulationCancelled
+    - offset/scale: map this run into a slice of a multi-algorithm run
+    """
+    last = [-1.0]
+
+    def callback(completed, total):
+        if cancel_event is not None and cancel_event.is_set():
+            raise SimulationCancelled()
+        fraction = offset + scale * (completed / total if total else 1.0)
+        if fraction - last[0] >= step or completed == total:
+            last[0] = fraction
+            report(fraction)
+
+    return callback
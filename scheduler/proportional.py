@@ -0,0 +1,215 @@
+# scheduler/proportional.py
+
+"""
+Shared core of the proportional-share schedulers (scheduler.stride,
+scheduler.lottery).
+
+Every process holds tickets and should get CPU time in proportion to its
+tickets among the processes competing with it. Tickets come from the
+"tickets" field, or else from priority as TICKET_BASE // priority
+(priority 1 -> 100, 2 -> 50, 3 -> 33, ...), so lower numbers still mean
+more CPU.
+
+The run is time-sliced: a selector picks the next process for one
+quantum (or less if it finishes), is charged for every slice, and is
+told about arrivals, completions and ticket changes.
+ticket_changes = [(time, pid, tickets)] are applied at the first slice
+boundary at or after `time`. Selectors update their structures in place;
+nothing is rebuilt.
+
+Fairness is tracked against the ideal fluid share. A global virtual time
+V advances by slice / total active tickets, so a process's ideal CPU
+time is tickets * (V at leave - V at join), folded at each ticket
+change. This is O(1) per slice. Deviation = received - ideal; it is
+sampled over the competing processes every `sample_every` time units
+(by default about DEFAULT_SAMPLES times over the run, since a sample
+costs O(competing processes)).
+
+Output (same shape as run_roundrobin):
+ - result["processes"]: one dict per run of consecutive slices
+ - result["shares"]: per-process tickets / received / ideal, max and mean
+   absolute deviation, and the sampled series [(time, max_abs, mean_abs)]
+"""
+
+from scheduler import instrument
+
+TICKET_BASE = 100
+DEFAULT_SAMPLES = 100
+
+
+def tickets_for(p):
+    tickets = p.get("tickets")
+    if tickets is None:
+        tickets = TICKET_BASE // max(1, p.get("priority", 1))
+    if tickets < 1 or int(tickets) != tickets:
+        raise ValueError(f"{p.get('pid')}: tickets must be a positive integer")
+    return int(tickets)
+
+
+class ShareTracker:
+    """Ideal fluid-share accounting with a global virtual time."""
+
+    def __init__(self, n):
+        self.v = 0.0
+        self.total = 0                  # tickets of the competing processes
+        self.tickets = [0] * n
+        self.mark = [0.0] * n           # V when the current ticket count took effect
+        self.ideal = [0.0] * n          # ideal CPU time accumulated before mark
+        self.active = set()
+
+    def join(self, i, tickets):
+        self.tickets[i] = tickets
+        self.mark[i] = self.v
+        self.total += tickets
+        self.active.add(i)
+
+    def change(self, i, tickets):
+        if i in self.active:
+            self.ideal[i] += self.tickets[i] * (self.v - self.mark[i])
+            self.mark[i] = self.v
+            self.total += tickets - self.tickets[i]
+        self.tickets[i] = tickets
+
+    def leave(self, i):
+        self.ideal[i] += self.tickets[i] * (self.v - self.mark[i])
+        self.total -= self.tickets[i]
+        self.active.discard(i)
+
+    def advance(self, elapsed):
+        if self.total:
+            self.v += elapsed / self.total
+
+    def ideal_of(self, i):
+        if i in self.active:
+            return self.ideal[i] + self.tickets[i] * (self.v - self.mark[i])
+        return self.ideal[i]
+
+
+def run_proportional(processes, selector, quantum=1, ticket_changes=None, progress=None, sample_every=None):
+    """
+    Time-sliced run driven by `selector`, which implements
+    add(i, tickets), remove(i), change(i, tickets), pick() -> i and
+    charge(i, ran) (after every slice, before remove() on completion).
+    `processes` is normalized and sorted by arrival in place.
+    """
+    if quantum <= 0:
+        raise ValueError("quantum must be positive")
+    for p in processes:
+        p["arrival_time"] = p.get("arrival_time", p.get("arrival", 0))
+        p["burst_time"] = p.get("burst_time", p.get("burst", 0))
+        p["priority"] = p.get("priority", 1)
+    processes.sort(key=lambda x: x["arrival_time"])
+
+    n = len(processes)
+    index = {p["pid"]: i for i, p in enumerate(processes)}
+    tickets = [tickets_for(p) for p in processes]
+    remaining = [p["burst_time"] for p in processes]
+    received = [0] * n
+    changes = sorted(ticket_changes or (), key=lambda c: c[0])
+    tracker = ShareTracker(n)
+    probe = instrument.active
+
+    segments = []
+    samples = []
+    max_dev = 0.0
+    dev_sum = 0.0
+    dev_count = 0
+    if not sample_every and n:
+        span = processes[-1]["arrival_time"] + sum(remaining)
+        sample_every = max(quantum, span / DEFAULT_SAMPLES)
+    next_sample = sample_every
+
+    def deviation_sample(now):
+        nonlocal max_dev, dev_sum, dev_count
+        if not tracker.active:
+            return
+        devs = [abs(received[i] - tracker.ideal_of(i)) for i in tracker.active]
+        worst = max(devs)
+        mean = sum(devs) / len(devs)
+        max_dev = max(max_dev, worst)
+        dev_sum += mean
+        dev_count += 1
+        samples.append((now, round(worst, 6), round(mean, 6)))
+
+    time = 0
+    arrived = 0
+    ch = 0
+    completed = 0
+    last = None
+    while completed < n:
+        while arrived < n and processes[arrived]["arrival_time"] <= time:
+            selector.add(arrived, tickets[arrived])
+            tracker.join(arrived, tickets[arrived])
+            arrived += 1
+        while ch < len(changes) and changes[ch][0] <= time:
+            _, pid, t = changes[ch]
+            ch += 1
+            i = index[pid]
+            t = tickets_for({"pid": pid, "tickets": t})
+            if i < arrived and remaining[i] > 0:
+                selector.change(i, t)
+            tickets[i] = t
+            tracker.change(i, t)
+
+        if not tracker.active:
+            # idle until the next arrival
+            if probe is not None:
+                probe.count("idle_gaps")
+            time = processes[arrived]["arrival_time"]
+            continue
+
+        i = selector.pick()
+        if probe is not None:
+            probe.count("queue_ops")
+            if i != last:
+                probe.count("context_switches")
+        ran = min(quantum, remaining[i])
+        tracker.advance(ran)
+        received[i] += ran
+        remaining[i] -= ran
+
+        p = processes[i]
+        if last == i and segments and segments[-1]["finish"] == time:
+            segments[-1]["finish"] = time + ran
+        else:
+            segments.append({
+                "pid": p["pid"],
+                "arrival_time": p["arrival_time"],
+                "burst_time": p["burst_time"],
+                "priority": p["priority"],
+                "tickets": tickets[i],
+                "start": time,
+                "finish": time + ran,
+                "is_rogue": p.get("is_rogue", False),
+                "throttled": p.get("throttled", False),
+                "terminated": p.get("terminated", False)
+            })
+        last = i
+        time += ran
+
+        selector.charge(i, ran)
+        if remaining[i] <= 0:
+            selector.remove(i)
+            tracker.leave(i)
+            p["finish"] = time
+            p["turnaround"] = time - p["arrival_time"]
+            p["waiting"] = p["turnaround"] - p["burst_time"]
+            completed += 1
+            if progress is not None:
+                progress(completed, n)
+
+        while next_sample <= time:
+            deviation_sample(next_sample)
+            next_sample += sample_every
+
+    per_process = {
+        p["pid"]: {"tickets": tickets[i], "received": received[i], "ideal": round(tracker.ideal_of(i), 6)}
+        for i, p in enumerate(processes)
+    }
+    shares = {
+        "per_process": per_process,
+        "max_abs_deviation": round(max_dev, 6),
+        "mean_abs_deviation": round(dev_sum / dev_count, 6) if dev_count else 0.0,
+        "samples": samples,
+    }
+    return {"processes": segments, "shares": shares}
@@ -0,0 +1,23 @@
+# scheduler/rate_monotonic.py
+
+import math
+
+from scheduler.realtime import task_fields, run_realtime
+
+
+def rm_key(p, release=None, deadline=None):
+    """Static priority: shorter period first, aperiodic processes last."""
+    _, _, period, _ = task_fields(p)
+    return math.inf if period is None else period
+
+
+def run_rate_monotonic(processes, horizon=None, progress=None):
+    """
+    Rate-Monotonic Scheduling (Preemptive, fixed priority)
+    The task with the shortest period has the highest priority; processes
+    without a period run in arrival order when no periodic job is ready.
+    horizon: stop releasing periodic jobs at this time (default: latest
+             arrival + hyperperiod)
+    progress: optional callback(completed, total) invoked as jobs finish
+    """
+    return run_realtime(processes, rm_key, horizon, progress)
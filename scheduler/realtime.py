@@ -0,0 +1,207 @@
+# scheduler/realtime.py
+
+"""
+Shared core of the real-time schedulers (scheduler.edf, scheduler.rate_monotonic).
+
+Real-time fields on a process:
+ - period: the process is a periodic task releasing a job every `period`
+   time units from its arrival, until the horizon
+ - deadline: relative deadline of each job (defaults to the period;
+   processes with neither run with no deadline)
+
+Jobs are generated lazily: each periodic task is a generator, and only
+the next release of every task sits in a heap, so a run over a long
+hyperperiod never holds more than one pending job per task besides the
+ready queue. Ready jobs are kept in a heap ordered by the policy's key, and
+a job is preempted as soon as a released job has a smaller key. Late jobs
+still run to completion (soft real-time); misses are reported.
+
+Output:
+ - result["processes"]: one dict per execution segment. Jobs of periodic
+   tasks get pid "<task>.<k>"; every segment carries "task", arrival_time
+   (the release), burst_time, the absolute "deadline", start and finish
+ - result["jobs"]: one dict per job with task, release, deadline, start,
+   finish, response, lateness (finish - deadline) and missed
+"""
+
+import heapq
+import math
+from functools import reduce
+from itertools import count
+
+from scheduler import instrument
+
+
+def task_fields(p):
+    """(arrival, burst, period or None, relative deadline or None) of a process."""
+    arrival = p.get("arrival_time", p.get("arrival", 0))
+    burst = p.get("burst_time", p.get("burst", 0))
+    period = p.get("period")
+    deadline = p.get("deadline", period)
+    if period is not None and period <= 0:
+        raise ValueError(f"{p.get('pid')}: period must be positive")
+    return arrival, burst, period, deadline
+
+
+def hyperperiod(processes):
+    """LCM of the (integer) periods of the periodic tasks, or None if there are none."""
+    periods = [p["period"] for p in processes if p.get("period") is not None]
+    if not periods:
+        return None
+    if any(int(t) != t for t in periods):
+        raise ValueError("Hyperperiod needs integer periods; pass horizon explicitly")
+    return reduce(lambda a, b: a * b // math.gcd(a, b), (int(t) for t in periods))
+
+
+def default_horizon(processes):
+    """Latest arrival plus one hyperperiod."""
+    h = hyperperiod(processes)
+    if h is None:
+        return None
+    return max(task_fields(p)[0] for p in processes) + h
+
+
+def _jobs(task_index, p, horizon):
+    """Lazily yield (release, k, absolute deadline) of one task's jobs."""
+    arrival, _, period, deadline = task_fields(p)
+    if period is None:
+        yield arrival, 0, (arrival + deadline if deadline is not None else math.inf)
+        return
+    k = 0
+    release = arrival
+    while release < horizon:
+        yield release, k, (release + deadline if deadline is not None else math.inf)
+        k += 1
+        release = arrival + k * period
+
+
+def job_count(processes, horizon):
+    """Number of jobs a run up to `horizon` releases (without generating them)."""
+    total = 0
+    for p in processes:
+        arrival, _, period, _ = task_fields(p)
+        if period is None:
+            total += 1
+        elif arrival < horizon:
+            total += math.ceil((horizon - arrival) / period)
+    return total
+
+
+def run_realtime(processes, key, horizon=None, progress=None):
+    """
+    Preemptive single-CPU run where the ready job with the smallest
+    key(task, release, absolute_deadline) runs. Ties go to the earlier
+    release, then to the earlier task in input order.
+    progress: optional callback(completed, total) invoked as jobs finish
+    """
+    if horizon is None:
+        horizon = default_horizon(processes)
+    if horizon is None:
+        horizon = math.inf      # aperiodic only: one job per process
+    probe = instrument.active
+    total = job_count(processes, horizon)
+
+    # next pending release of every task: (release, task index, k, abs deadline, generator)
+    sources = []
+    for i, p in enumerate(processes):
+        gen = _jobs(i, p, horizon)
+        first = next(gen, None)
+        if first is not None:
+            sources.append((first[0], i, first[1], first[2], gen))
+    heapq.heapify(sources)
+
+    seq = count()
+    ready = []                  # heap of (key, release, task index, seq, job)
+    segments = []
+    jobs = []
+    time = 0
+    current = None              # job dict
+    current_key = None
+    seg_start = None
+    last_job = None
+
+    def release_due(now):
+        while sources and sources[0][0] <= now:
+            release, i, k, deadline, gen = heapq.heappop(sources)
+            p = processes[i]
+            _, burst, period, _ = task_fields(p)
+            job = {"task_index": i, "k": k, "release": release, "deadline": deadline,
+                   "remaining": burst, "burst": burst, "start": None,
+                   "pid": f"{p['pid']}.{k}" if period is not None else p["pid"]}
+            heapq.heappush(ready, (key(p, release, deadline), release, i, next(seq), job))
+            if probe is not None:
+                probe.count("heap_pushes")
+            nxt = next(gen, None)
+            if nxt is not None:
+                heapq.heappush(sources, (nxt[0], i, nxt[1], nxt[2], gen))
+
+    def close_segment(job, end):
+        p = processes[job["task_index"]]
+        segments.append({
+            "pid": job["pid"],
+            "task": p["pid"],
+            "arrival_time": job["release"],
+            "burst_time": job["burst"],
+            "priority": p.get("priority", 1),
+            "period": p.get("period"),
+            "deadline": job["deadline"],
+            "start": seg_start,
+            "finish": end,
+            "is_rogue": p.get("is_rogue", False),
+            "throttled": p.get("throttled", False),
+            "terminated": p.get("terminated", False)
+        })
+
+    completed = 0
+    while sources or ready or current is not None:
+        if current is None:
+            if not ready:
+                if probe is not None:
+                    probe.count("idle_gaps")
+                time = max(time, sources[0][0])
+                release_due(time)
+            current_key, _, _, _, current = heapq.heappop(ready)
+            if probe is not None:
+                probe.count("heap_pops")
+                if current is not last_job:
+                    probe.count("context_switches")
+            last_job = current
+            seg_start = time
+            if current["start"] is None:
+                current["start"] = time
+
+        # run until the job completes or the next release, whichever is first
+        end = time + current["remaining"]
+        if sources and sources[0][0] < end:
+            end = sources[0][0]
+        current["remaining"] -= end - time
+        time = end
+
+        if current["remaining"] <= 0:
+            close_segment(current, time)
+            p = processes[current["task_index"]]
+            lateness = time - current["deadline"]
+            jobs.append({
+                "pid": current["pid"], "task": p["pid"], "k": current["k"],
+                "release": current["release"], "deadline": current["deadline"],
+                "start": current["start"], "finish": time,
+                "response": time - current["release"],
+                "lateness": lateness,
+                "missed": lateness > 0,
+            })
+            current = None
+            completed += 1
+            if progress is not None:
+                progress(completed, total)
+        release_due(time)
+
+        if current is not None and ready and ready[0][0] < current_key:
+            # preempted by a more urgent release
+            close_segment(current, time)
+            heapq.heappush(ready, (current_key, current["release"], current["task_index"], next(seq), current))
+            current = None
+            if probe is not None:
+                probe.count("preemptions")
+                probe.count("heap_pushes")
+
+    return {"processes": segments, "jobs": jobs, "horizon": horizon}
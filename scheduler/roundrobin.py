@@ -1,9 +1,18 @@
-def run_roundrobin(processes, quantum=3):
+from scheduler import instrument
+from scheduler.segment_store import SegmentStore
+
+
+def run_roundrobin(processes, quantum=3, progress=None, memory_budget=None, spill_dir=None):
     """
     Round Robin Scheduling (Preemptive)
     Works for GUI (multiple segments)
     Works for terminal tests (complete timeline)
+    progress: optional callback(completed, total) invoked as processes finish
+    memory_budget: emit segments into a SegmentStore (scheduler.segment_store)
+                   as slices run, spilling to spill_dir beyond this many bytes,
+                   instead of collecting them per process
     """
+    store = None if memory_budget is None else SegmentStore(memory_budget, spill_dir=spill_dir)
 
     # normalize
     for p in processes:
@@ -20,6 +29,9 @@ def run_roundrobin(processes, quantum=3):
     i = 0
     n = len(processes)
     queue = []
+    completed = 0
+    previous = None
+    probe = instrument.active
 
     while i < n or queue:
 
@@ -27,12 +39,21 @@ def run_roundrobin(processes, quantum=3):
         while i < n and processes[i]["arrival_time"] <= time:
             queue.append(processes[i])
             i += 1
+            if probe is not None:
+                probe.count("queue_ops")
 
         if not queue:
             time = processes[i]["arrival_time"]
+            if probe is not None:
+                probe.count("idle_gaps")
             continue
 
         current = queue.pop(0)
+        if probe is not None:
+            probe.count("queue_ops")
+            if current is not previous:
+                probe.count("context_switches")
+        previous = current
 
         # Run slice
         slice_start = time
@@ -41,8 +62,11 @@ def run_roundrobin(processes, quantum=3):
         slice_end = time
 
         # Record this RR segment
-        current["start_times"].append(slice_start)
-        current["finish_times"].append(slice_end)
+        if store is None:
+            current["start_times"].append(slice_start)
+            current["finish_times"].append(slice_end)
+        else:
+            store.append(_segment(current, slice_start, slice_end))
 
         current["remaining"] -= run_time
 
@@ -50,23 +74,42 @@ def run_roundrobin(processes, quantum=3):
         while i < n and processes[i]["arrival_time"] <= time:
             queue.append(processes[i])
             i += 1
+            if probe is not None:
+                probe.count("queue_ops")
 
         # If still pending → requeue
         if current["remaining"] > 0:
             queue.append(current)
+            if probe is not None:
+                probe.count("queue_ops")
+                probe.count("preemptions")
+        else:
+            completed += 1
+            if progress is not None:
+                progress(completed, n)
+
+    if store is not None:
+        # slices were recorded in execution order, which is start order
+        return {"processes": store}
 
     # Build gantt output (one entry per slice)
     gantt = []
     for p in processes:
         for s, f in zip(p["start_times"], p["finish_times"]):
-            gantt.append({
-                "pid": p["pid"],
-                "arrival_time": p["arrival_time"],
-                "burst_time": p["burst_time"],
-                "priority": p["priority"],
-                "start": s,
-                "finish": f,
-                "is_rogue": p.get("is_rogue", False)
-            })
+            gantt.append(_segment(p, s, f))
 
     return {"processes": sorted(gantt, key=lambda x: x["start"])}
+
+
+def _segment(p, start, finish):
+    return {
+        "pid": p["pid"],
+        "arrival_time": p["arrival_time"],
+        "burst_time": p["burst_time"],
+        "priority": p["priority"],
+        "start": start,
+        "finish": finish,
+        "is_rogue": p.get("is_rogue", False),
+        "throttled": p.get("throttled", False),
+        "terminated": p.get("terminated", False)
+    }
@@ -0,0 +1,169 @@
+# scheduler/schedulability.py
+
+"""
+Schedulability pre-checks for periodic task sets on one CPU.
+
+Each periodic process is a task with C = burst, T = period and
+D = deadline (default T). Processes without a period are one-shot jobs
+and are left out of the analysis. The tests assume synchronous release
+(every task may release at the same instant), which is the worst case,
+so a task set that passes is schedulable for any arrival offsets.
+
+ - EDF: U <= 1 is exact when every D >= T. With constrained deadlines the
+   density test (sum C / min(D, T) <= 1) is tried first, then the
+   processor-demand criterion dbf(t) <= t at every absolute deadline up
+   to the Baruah-Rosier-Howell bound
+ - RM: U <= n (2^(1/n) - 1) (Liu & Layland) accepts immediately when
+   every D >= T; otherwise exact response-time analysis,
+   w = (k + 1) C_i + sum over higher-priority j of ceil(w / T_j) C_j,
+   iterated to a fixed point for the jobs k = 0, 1, ... of the level-i
+   busy period (while w > (k + 1) T_i, i.e. job k delays job k + 1, which
+   only happens when R_i can exceed T_i), R_i = max over k of w - k T_i,
+   checked against D_i
+"""
+
+import heapq
+import math
+
+
+class Unschedulable(ValueError):
+    """Raised by require_schedulable() with the failing analysis report."""
+
+    def __init__(self, report):
+        super().__init__(f"{report['policy']}: task set is not schedulable ({report['test']})")
+        self.report = report
+
+
+def periodic_tasks(processes):
+    """[(pid, C, T, D)] of the periodic processes, in input order."""
+    tasks = []
+    for p in processes:
+        period = p.get("period")
+        if period is None:
+            continue
+        burst = p.get("burst_time", p.get("burst", 0))
+        tasks.append((p.get("pid"), burst, period, p.get("deadline", period)))
+    return tasks
+
+
+def utilization(processes):
+    return sum(c / t for _, c, t, _ in periodic_tasks(processes))
+
+
+def liu_layland_bound(n):
+    return n * (2 ** (1 / n) - 1) if n else 1.0
+
+
+def demand_bound(tasks, t):
+    """Processor demand of jobs with release and deadline inside [0, t]."""
+    return sum(max(0, math.floor((t - d) / p) + 1) * c for _, c, p, d in tasks)
+
+
+def _deadlines_up_to(tasks, limit):
+    """Absolute deadlines D + kT <= limit, in increasing order."""
+    heap = [(d, i) for i, (_, _, _, d) in enumerate(tasks) if d <= limit]
+    heapq.heapify(heap)
+    last = None
+    while heap:
+        t, i = heapq.heappop(heap)
+        if t != last:
+            yield t
+            last = t
+        nxt = t + tasks[i][2]
+        if nxt <= limit:
+            heapq.heappush(heap, (nxt, i))
+
+
+def edf_test(processes):
+    tasks = periodic_tasks(processes)
+    u = sum(c / t for _, c, t, _ in tasks)
+    report = {"policy": "EDF", "tasks": len(tasks), "utilization": round(u, 6)}
+    if u > 1 + 1e-12:
+        return dict(report, schedulable=False, test="utilization > 1")
+    if all(d >= t for _, _, t, d in tasks):
+        return dict(report, schedulable=True, test="utilization <= 1 (implicit deadlines)")
+    density = sum(c / min(d, t) for _, c, t, d in tasks)
+    if density <= 1 + 1e-12:
+        return dict(report, schedulable=True, test="density <= 1")
+
+    # processor demand criterion up to the Baruah-Rosier-Howell bound
+    d_max = max(d for _, _, _, d in tasks)
+    limit = None
+    if u < 1:
+        limit = max(d_max, sum((t - d) * c / t for _, c, t, d in tasks) / (1 - u))
+    if all(int(t) == t for _, _, t, _ in tasks):
+        h = 1
+        for _, _, t, _ in tasks:
+            h = h * int(t) // math.gcd(h, int(t))
+        limit = h + d_max if limit is None else min(limit, h + d_max)
+    if limit is None:
+        return dict(report, schedulable=None, test="inconclusive (non-integer periods at U = 1)")
+    for t in _deadlines_up_to(tasks, limit):
+        if demand_bound(tasks, t) > t + 1e-9:
+            return dict(report, schedulable=False, test=f"processor demand exceeds supply at t={t}")
+    return dict(report, schedulable=True, test="processor demand criterion")
+
+
+def response_times(tasks):
+    """
+    Worst-case response time of each task under rate-monotonic priorities
+    (shorter period first, ties in input order), in the order of `tasks`;
+    None where it exceeds D.
+    """
+    order = sorted(range(len(tasks)), key=lambda i: tasks[i][2])
+    out = [None] * len(tasks)
+    for rank, i in enumerate(order):
+        _, c, t, d = tasks[i]
+        higher = [tasks[j] for j in order[:rank]]
+        worst = 0
+        k = 0
+        w = c + sum(hc for _, hc, _, _ in higher)
+        while worst is not None:
+            # completion time of job k, released at k * t
+            while True:
+                nxt = (k + 1) * c + sum(math.ceil(w / ht) * hc for _, hc, ht, _ in higher)
+                if nxt - k * t > d:
+                    worst = None
+                    break
+                if nxt == w:
+                    worst = max(worst, w - k * t)
+                    break
+                w = nxt
+            if worst is None or w <= (k + 1) * t:
+                break
+            k += 1                  # the busy period runs into the next job
+            w += c
+        out[i] = worst
+    return out
+def rm_test(processes):
+    tasks = periodic_tasks(processes)
+    u = sum(c / t for _, c, t, _ in tasks)
+    bound = liu_layland_bound(len(tasks))
+    report = {"policy": "RM", "tasks": len(tasks), "utilization": round(u, 6), "bound": round(bound, 6)}
+    if u > 1 + 1e-12:
+        return dict(report, schedulable=False, test="utilization > 1")
+    if u <= bound and all(d >= t for _, _, t, d in tasks):
+        return dict(report, schedulable=True, test="Liu & Layland bound")
+    rt = response_times(tasks)
+    ok = all(r is not None for r in rt)
+    return dict(report, schedulable=ok, test="response-time analysis",
+                response_times=[[pid, r] for (pid, _, _, _), r in zip(tasks, rt)])
+
+
+TESTS = {"EDF": edf_test, "RM": rm_test}
+
+
+def check(processes, policy):
+    """Schedulability report for `policy` ("EDF" or "RM")."""
+    policy = policy.upper()
+    if policy not in TESTS:
+        raise ValueError(f"No schedulability test for {policy}")
+    return TESTS[policy](processes)
+
+
+def require_schedulable(processes, policy):
+    """Return the report, or raise Unschedulable if the task set fails the test."""
+    report = check(processes, policy)
+    if report["schedulable"] is False:
+        raise Unschedulable(report)
+    return report
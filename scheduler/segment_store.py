@@ -0,0 +1,140 @@
+# scheduler/segment_store.py
+
+"""
+Memory-budgeted segment output.
+
+A SegmentStore is an append-only list of segment dicts for schedules too
+large to keep in RAM. Segments are collected in fixed-size chunks; once
+the estimated size of the resident chunks exceeds the memory budget, the
+oldest full chunks are pickled, zlib-compressed and appended to one spill
+file (in spill_dir, or the system temp directory). Iterating reads the
+spilled chunks back sequentially, then the resident ones, so consumers
+see segments in append order while holding one chunk at a time.
+
+metrics.compute() and the trace exporters (visualization.trace_export)
+accept a SegmentStore wherever they accept a list of segments.
+
+The spill file is deleted by close(), on leaving a `with` block, or when
+the store is garbage collected.
+"""
+
+import os
+import sys
+import weakref
+import zlib
+
+DEFAULT_CHUNK_SIZE = 4096
+COMPRESS_LEVEL = 1
+
+
+def segment_bytes(seg):
+    """Rough in-memory size of one segment dict (shared values are counted too)."""
+    return sys.getsizeof(seg) + sum(sys.getsizeof(v) for v in seg.values())
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SegmentStore:
+    """Append-only segment sequence that spills compressed chunks to disk over budget."""
+
+    def __init__(self, memory_budget, chunk_size=DEFAULT_CHUNK_SIZE, spill_dir=None):
+        """memory_budget: bytes of resident segments before chunks are spilled"""
+        if memory_budget < 0 or chunk_size < 1:
+            raise ValueError("memory_budget must be >= 0 and chunk_size >= 1")
+        self.memory_budget = memory_budget
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.buffer = []            # chunk being filled
+        self.resident = []          # full chunks in memory: (segments, estimated bytes)
+        self.resident_bytes = 0
+        self.spilled = []           # (offset, length, count) of chunks in the spill file
+        self.spilled_bytes = 0
+        self.count = 0
+        self.path = None
+        self._file = None
+        self._finalizer = None
+
+    def __len__(self):
+        return self.count
+
+    def append(self, seg):
+        self.buffer.append(seg)
+        self.count += 1
+        if len(self.buffer) >= self.chunk_size:
+            self._seal()
+
+    def extend(self, segs):
+        for seg in segs:
+            self.append(seg)
+
+    def _seal(self):
+        chunk = self.buffer
+        self.buffer = []
+        size = segment_bytes(chunk[0]) * len(chunk) + sys.getsizeof(chunk)
+        self.resident.append((chunk, size))
+        self.resident_bytes += size
+        while self.resident and self.resident_bytes > self.memory_budget:
+            chunk, size = self.resident.pop(0)
+            self.resident_bytes -= size
+            self._spill(chunk)
+
+    def _spill(self, chunk):
+        # pickle and tempfile are only needed once something spills; keep them off the start-up path
+        import pickle
+        import tempfile
+        if self._file is None:
+            fd, self.path = tempfile.mkstemp(suffix=".segments", dir=self.spill_dir)
+            self._file = os.fdopen(fd, "w+b")
+            self._finalizer = weakref.finalize(self, _remove, self.path)
+        payload = zlib.compress(pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL), COMPRESS_LEVEL)
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(payload)
+        self.spilled.append((offset, len(payload), len(chunk)))
+        self.spilled_bytes += len(payload)
+
+    def __iter__(self):
+        if self.spilled:
+            import pickle
+            self._file.flush()
+            with open(self.path, "rb") as f:
+                for offset, length, _ in self.spilled:
+                    f.seek(offset)
+                    yield from pickle.loads(zlib.decompress(f.read(length)))
+        for chunk, _ in self.resident:
+            yield from chunk
+        yield from self.buffer
+
+    def stats(self):
+        return {
+            "segments": self.count,
+            "chunk_size": self.chunk_size,
+            "resident_chunks": len(self.resident),
+            "resident_bytes": self.resident_bytes,
+            "spilled_chunks": len(self.spilled),
+            "spilled_segments": sum(c for _, _, c in self.spilled),
+            "spilled_bytes": self.spilled_bytes,
+        }
+
+    def close(self):
+        """Drop all segments and delete the spill file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._finalizer()
+        self.buffer = []
+        self.resident = []
+        self.resident_bytes = 0
+        self.spilled = []
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
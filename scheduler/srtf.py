@@ -1,6 +1,10 @@
-def run_srtf(processes):
+from scheduler import instrument
+
+
+def run_srtf(processes, progress=None):
     """
     Shortest Remaining Time First (Preemptive)
+    progress: optional callback(completed, total) invoked as processes finish
     """
     processes.sort(key=lambda x: x['arrival'])
     n = len(processes)
@@ -8,26 +12,42 @@ def run_srtf(processes):
     completed = 0
     time = 0
     last_proc = -1
+    idle = False
+    done = [False] * n
+    probe = instrument.active
 
     while completed < n:
         # Pick process with minimum remaining time
-        ready = [i for i, p in enumerate(processes) if p['arrival'] <= time and remaining[i] > 0]
+        ready = [i for i, p in enumerate(processes) if p['arrival'] <= time and not done[i]]
         if not ready:
+            if probe is not None and not idle:
+                probe.count("idle_gaps")
+            idle = True
             time += 1
             continue
+        idle = False
         idx = min(ready, key=lambda i: remaining[i])
 
         if last_proc != idx:
+            if probe is not None:
+                probe.count("context_switches")
+                if last_proc != -1 and remaining[last_proc] > 0:
+                    probe.count("preemptions")
             processes[idx]['start'] = time
             last_proc = idx
 
-        remaining[idx] -= 1
-        time += 1
+        # zero-length bursts complete on dispatch without taking a tick
+        if remaining[idx] > 0:
+            remaining[idx] -= 1
+            time += 1
 
-        if remaining[idx] == 0:
+        if remaining[idx] <= 0:
+            done[idx] = True
             completed += 1
             processes[idx]['finish'] = time
             processes[idx]['turnaround'] = time - processes[idx]['arrival']
             processes[idx]['waiting'] = processes[idx]['turnaround'] - processes[idx]['burst']
+            if progress is not None:
+                progress(completed, n)
 
     return {"processes": processes}
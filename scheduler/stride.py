@@ -0,0 +1,82 @@
+# scheduler/stride.py
+
+import heapq
+
+from scheduler import instrument
+from scheduler.proportional import run_proportional
+
+STRIDE1 = 1 << 20
+
+
+class StrideSelector:
+    """
+    Pass-value heap (Waldspurger & Weihl). Each process advances its pass
+    by stride = STRIDE1 / tickets per quantum it runs; the lowest pass runs
+    next. A global pass, advanced by STRIDE1 / total tickets, places new
+    arrivals and rescales the remaining pass on ticket changes. Stale heap
+    entries are skipped lazily, so changes cost O(log n).
+    """
+
+    def __init__(self, quantum):
+        self.quantum = quantum
+        self.heap = []              # (pass, index, version)
+        self.pass_ = {}
+        self.stride = {}
+        self.tickets = {}
+        self.version = {}
+        self.total = 0
+        self.global_pass = 0.0
+
+    def _push(self, i):
+        self.version[i] = self.version.get(i, 0) + 1
+        heapq.heappush(self.heap, (self.pass_[i], i, self.version[i]))
+        probe = instrument.active
+        if probe is not None:
+            probe.count("heap_pushes")
+
+    def add(self, i, tickets):
+        self.stride[i] = STRIDE1 / tickets
+        self.tickets[i] = tickets
+        self.total += tickets
+        self.pass_[i] = self.global_pass + self.stride[i]
+        self._push(i)
+
+    def remove(self, i):
+        self.total -= self.tickets.pop(i)
+        del self.stride[i], self.pass_[i]
+        self.version[i] += 1
+
+    def change(self, i, tickets):
+        new_stride = STRIDE1 / tickets
+        remain = self.pass_[i] - self.global_pass
+        self.pass_[i] = self.global_pass + remain * new_stride / self.stride[i]
+        self.stride[i] = new_stride
+        self.total += tickets - self.tickets[i]
+        self.tickets[i] = tickets
+        self._push(i)
+
+    def pick(self):
+        probe = instrument.active
+        while True:
+            _, i, version = heapq.heappop(self.heap)
+            if probe is not None:
+                probe.count("heap_pops")
+            if self.version.get(i) == version:
+                return i
+
+    def charge(self, i, ran):
+        if self.total:
+            self.global_pass += STRIDE1 / self.total * ran / self.quantum
+        self.pass_[i] += self.stride[i] * ran / self.quantum
+        self._push(i)
+
+
+def run_stride(processes, quantum=1, ticket_changes=None, progress=None, sample_every=None):
+    """
+    Stride Scheduling (deterministic proportional share)
+    Tickets come from "tickets" or priority (see scheduler.proportional).
+    ticket_changes: [(time, pid, tickets)] applied while running
+    sample_every: time between share-deviation samples (default: ~100 over the run)
+    progress: optional callback(completed, total) invoked as processes finish
+    """
+    return run_proportional(processes, StrideSelector(quantum), quantum, ticket_changes, progress, sample_every)
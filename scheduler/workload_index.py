@@ -0,0 +1,182 @@
+# scheduler/workload_index.py
+
+"""
+Precomputed workload index shared by every policy of a multi-algorithm run.
+
+Running several policies over one workload used to normalize and sort it
+once per policy. A WorkloadIndex does that work once:
+ - procs: the normalized processes (scheduler.engine.normalize), input order
+ - arrival_order / burst_order: stable permutations of procs by arrival and
+   by burst; every engine order key is derived from them (order())
+ - burst_prefix: prefix sums of bursts in arrival order, so the work
+   arriving in any arrival range is work(lo, hi)
+ - periods: the single-CPU busy periods as (lo, hi, start, end) ranges of
+   arrival order. Every engine policy is work-conserving, so on one CPU
+   the CPU is busy from the first arrival of a period until all of its
+   work is done, whatever the policy; only the order inside a period
+   differs
+
+Processes of different busy periods never meet: the ready queue is empty
+at every period boundary. simulate_indexed() can therefore simulate
+groups of periods independently, in worker processes, and concatenate the
+results, which are identical to a single engine run. Splitting is only
+used where periods are exact: one CPU, no cost model, no I/O bursts and
+integer times (float sums could place a boundary differently from the
+engine).
+"""
+
+import os
+from bisect import bisect_right
+from itertools import accumulate
+
+from scheduler.engine import ALIASES, POLICIES, Engine, normalize
+
+CHUNKS_PER_WORKER = 4
+
+# index of the run in progress: inherited by forked workers instead of
+# pickled, or sent once to each worker where processes are not forked
+_shared = None
+
+
+def _share(index):
+    global _shared
+    _shared = index
+
+
+class WorkloadIndex:
+    """Normalized workload with the orderings and busy periods every policy needs."""
+
+    def __init__(self, processes):
+        procs = self.procs = normalize(processes)
+        arrival = [p["arrival"] for p in procs]
+        burst = [p["burst"] for p in procs]
+        self.arrival_order = sorted(range(len(procs)), key=arrival.__getitem__)
+        self.burst_order = sorted(range(len(procs)), key=burst.__getitem__)
+        self.arrivals = [arrival[i] for i in self.arrival_order]
+        self.burst_prefix = [0] + list(accumulate(burst[i] for i in self.arrival_order))
+        self.has_io = any("bursts" in p for p in procs)
+        self.integral = all(int(a) == a for a in arrival) and all(int(b) == b for b in burst)
+        self.periods = self._busy_periods()
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.procs)
+
+    def _busy_periods(self):
+        periods = []
+        arrivals = self.arrivals
+        prefix = self.burst_prefix
+        lo = 0
+        start = end = None
+        for pos, a in enumerate(arrivals):
+            if end is not None and a > end:
+                periods.append((lo, pos, start, end))
+                lo = pos
+                end = None
+            if end is None:
+                start = a
+                end = a + prefix[pos + 1] - prefix[pos]
+            else:
+                end += prefix[pos + 1] - prefix[pos]
+        if end is not None:
+            periods.append((lo, len(arrivals), start, end))
+        return periods
+
+    def work(self, lo, hi):
+        """Total burst of arrival-order positions [lo, hi)."""
+        return self.burst_prefix[hi] - self.burst_prefix[lo]
+
+    def arrived_by(self, t):
+        """Number of processes arriving at or before t."""
+        return bisect_right(self.arrivals, t)
+
+    def order(self, policy):
+        """The processes in the engine order of `policy` (shared dicts; do not mutate)."""
+        policy = ALIASES.get(policy.upper(), policy.upper())
+        if policy not in POLICIES:
+            raise ValueError("Invalid algorithm")
+        if policy not in self._orders:
+            procs = self.procs
+            if policy == "SJF":
+                # stable: burst-sorted ties keep input order, so this is (arrival, burst, input)
+                perm = sorted(self.burst_order, key=lambda i: procs[i]["arrival"])
+            elif policy == "PRIORITY":
+                # the arrival order is already sorted on the leading key, so this is a near-linear merge
+                perm = sorted(self.arrival_order, key=lambda i: (procs[i]["arrival"], procs[i]["priority"]))
+            else:
+                perm = self.arrival_order
+            self._orders[policy] = [procs[i] for i in perm]
+        return self._orders[policy]
+
+    def splittable(self, cpus=1, cost_model=None):
+        """True when busy periods can be simulated independently."""
+        return cpus == 1 and cost_model is None and not self.has_io and self.integral
+
+
+def _run_chunk(task):
+    policy, quantum, lo, hi = task
+    procs = _shared.order(policy)[lo:hi]
+    return Engine(procs, policy, quantum=quantum, presorted=True).run()
+
+
+def simulate_indexed(index, policy="FCFS", quantum=3, cpus=1, cost_model=None, progress=None,
+                     workers=1, chunks=None, power_model=None):
+    """
+    Engine result for `policy` over a WorkloadIndex.
+    workers: processes to spread busy periods over (None = all cores); the
+             run is split only when index.splittable()
+    chunks: groups of consecutive busy periods to simulate separately
+            (default CHUNKS_PER_WORKER per worker; 1 with a single worker)
+    power_model: see scheduler.power_model; such runs are never split, as
+                 utilization and idle energy carry over between periods
+    """
+    global _shared
+    workers = workers or os.cpu_count() or 1
+    if chunks is None:
+        chunks = 1 if workers == 1 else workers * CHUNKS_PER_WORKER
+    chunks = min(chunks, len(index.periods))
+    if chunks <= 1 or power_model is not None or not index.splittable(cpus, cost_model):
+        return Engine(index.order(policy), policy, quantum=quantum, cpus=cpus, cost_model=cost_model,
+                      presorted=True, power_model=power_model).run(progress)
+
+    # split at period boundaries into chunks of about equal work; engine-order
+    # positions of a period match its arrival-order positions, since every
+    # order key leads with the arrival time and periods are separated by idle time
+    total = index.work(0, len(index))
+    bounds = [0]
+    for lo, _, _, _ in index.periods[1:]:
+        if len(bounds) < chunks and index.work(0, lo) * chunks >= total * len(bounds):
+            bounds.append(lo)
+    bounds.append(len(index))
+    tasks = [(policy, quantum, bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+    index.order(policy)         # build the order once, before workers get the index
+    previous, _shared = _shared, index
+    try:
+        if workers == 1:
+            parts = _collect(tasks, map(_run_chunk, tasks), len(index), progress)
+        else:
+            from multiprocessing import get_context
+            ctx = get_context()     # fork on Linux, spawn on macOS and Windows
+            init = () if ctx.get_start_method() == "fork" else (_share, (index,))
+            with ctx.Pool(min(workers, len(tasks)), *init) as pool:
+                parts = _collect(tasks, pool.imap(_run_chunk, tasks), len(index), progress)
+    finally:
+        _shared = previous
+
+    return {
+        "processes": [seg for part in parts for seg in part["processes"]],
+        "summary": [q for part in parts for q in part["summary"]],
+        "overhead_time": sum(part["overhead_time"] for part in parts),
+    }
+
+
+def _collect(tasks, results, total, progress):
+    parts = []
+    done = 0
+    for (_, _, lo, hi), part in zip(tasks, results):
+        parts.append(part)
+        done += hi - lo
+        if progress is not None:
+            progress(done, total)
+    return parts
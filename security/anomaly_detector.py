@@ -11,6 +11,7 @@ def detect_and_mitigate(processes, burst_threshold=8, priority_threshold=2):
     """
     for p in processes:
         p['is_rogue'] = False  # default
+        p['throttled'] = False
 
         # --- Detection Rules ---
         if p['burst'] > burst_threshold:
@@ -22,6 +23,10 @@ def detect_and_mitigate(processes, burst_threshold=8, priority_threshold=2):
         if p['is_rogue']:
             #  Throttling: reduce effective burst by 50%
             p['burst'] = max(1, p['burst'] // 2)
+            if p.get('bursts'):
+                # CPU / I/O processes: halve every CPU burst, keep the I/O
+                p['bursts'] = [max(1, b // 2) if i % 2 == 0 else b for i, b in enumerate(p['bursts'])]
+            p['throttled'] = True
 
             #  Priority Demotion: increase numerical priority (lower priority)
             if 'priority' in p:
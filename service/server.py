@@ -0,0 +1,503 @@
+# service/server.py
+
+"""
+Local HTTP/JSON simulation service.
+
+Wraps main.run_scheduler so other tools can run simulations without
+shelling out to main.py. Pure asyncio + stdlib; binds to 127.0.0.1 by
+default.
+
+Endpoints:
+    POST /simulate   one request object, or a JSON array of them (a sweep).
+                     The response is NDJSON: one line per request (chunked
+                     for a sweep, in completion order), tagged with its "index"
+    GET  /health     {"status": "ok", ...}
+    GET  /stats      queue depth, in-flight, coalesced, batches, rejected ...
+
+Request object:
+    {"algorithm": "RR", "quantum": 2, "secure": false, "cpus": 1,
+     "processes": [{"pid": "P1", "arrival_time": 0, "burst_time": 5, ...}]
+       or "generate": N with optional "seed" / "io_bursts",
+     "cost_model": {"context_switch": .., "cache_refill": .., ...},
+     "schedule": false}
+Each line carries the same fields as a main.py JSON record, plus the
+full schedule under "processes" when "schedule" is true, or "error".
+
+How a request runs:
+ - the event loop only parses and validates; simulations run in a
+   process pool, so the loop is never blocked
+ - identical requests that are in flight at the same time (same canonical
+   JSON) share one computation, unless they are random: unseeded
+   "generate" or LOTTERY requests always run on their own
+ - jobs up to `small_job` processes are micro-batched: the dispatcher
+   collects up to `max_batch` of them for `batch_window` seconds and sends
+   them to a worker as one task, saving per-task IPC
+ - the job queue is bounded (`max_queue`) and at most 2 * workers tasks
+   are handed to the pool at once. A single request that finds the queue
+   full gets 503 with Retry-After; a sweep is admitted while there is room
+   and then fed into the queue as it drains, so a burst of sweeps slows
+   down instead of buffering without limit. Bodies over `max_body` bytes
+   get 413
+
+Usage (from the repository root):
+    python service/server.py --port 8765 --workers 4
+    curl -s localhost:8765/simulate -d '{"algorithm": "RR", "generate": 50, "seed": 1}'
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import ALGORITHMS, EXPLICIT, run_scheduler
+from process_generator import generate_processes
+from scheduler.cost_model import CostModel
+
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_MAX_BATCH = 32
+DEFAULT_BATCH_WINDOW = 0.005
+DEFAULT_SMALL_JOB = 200
+DEFAULT_MAX_BODY = 64 << 20
+COST_FIELDS = ("context_switch", "cache_refill", "cache_decay", "migration")
+
+
+class Overloaded(RuntimeError):
+    """The job queue is full."""
+
+
+# ---------------- requests (event loop side) ----------------
+def normalize_request(req):
+    """Validated, canonical form of one request object; raises ValueError."""
+    if not isinstance(req, dict):
+        raise ValueError("request must be a JSON object")
+    algorithm = str(req.get("algorithm", "FCFS")).upper()
+    if algorithm not in ALGORITHMS + EXPLICIT:
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    spec = {
+        "algorithm": algorithm,
+        "quantum": req.get("quantum", 3),
+        "secure": bool(req.get("secure", False)),
+        "cpus": req.get("cpus", 1),
+        "seed": req.get("seed"),
+        "schedule": bool(req.get("schedule", False)),
+    }
+    if not isinstance(spec["quantum"], int) or spec["quantum"] <= 0:
+        raise ValueError("quantum must be a positive integer")
+    if not isinstance(spec["cpus"], int) or spec["cpus"] <= 0:
+        raise ValueError("cpus must be a positive integer")
+    if "processes" in req:
+        if not isinstance(req["processes"], list) or not all(isinstance(p, dict) for p in req["processes"]):
+            raise ValueError("processes must be a list of objects")
+        spec["processes"] = req["processes"]
+    elif "generate" in req:
+        if not isinstance(req["generate"], int) or req["generate"] <= 0:
+            raise ValueError("generate must be a positive integer")
+        spec["generate"] = req["generate"]
+        spec["io_bursts"] = req.get("io_bursts", 0)
+    else:
+        raise ValueError("request needs 'processes' or 'generate'")
+    cost = req.get("cost_model")
+    if cost is not None:
+        if not isinstance(cost, dict) or set(cost) - set(COST_FIELDS):
+            raise ValueError(f"cost_model fields are {', '.join(COST_FIELDS)}")
+        spec["cost_model"] = cost
+    return spec
+
+
+def request_key(spec):
+    """
+    Coalescing key of a normalized request, or None when two identical
+    requests need not give the same record: without a seed, "generate"
+    draws a fresh workload and LOTTERY fresh tickets on every run.
+    """
+    if spec["seed"] is None and ("generate" in spec or spec["algorithm"] == "LOTTERY"):
+        return None
+    return hashlib.sha1(json.dumps(spec, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def job_size(spec):
+    return len(spec["processes"]) if "processes" in spec else spec["generate"]
+
+
+# ---------------- simulations (worker side) ----------------
+def run_request(spec):
+    if "processes" in spec:
+        processes = spec["processes"]
+    else:
+        processes = generate_processes(num_processes=spec["generate"], seed=spec["seed"],
+                                       io_bursts=spec["io_bursts"])
+    cost_model = CostModel(**spec["cost_model"]) if "cost_model" in spec else None
+    result = run_scheduler(spec["algorithm"], processes, quantum=spec["quantum"], secure=spec["secure"],
+                           cost_model=cost_model, cpus=spec["cpus"], seed=spec["seed"])
+    record = {
+        "algorithm": spec["algorithm"],
+        "num_processes": len(processes),
+        "secure": spec["secure"],
+        "cpus": spec["cpus"],
+        "metrics": result["metrics"],
+    }
+    if spec["algorithm"] in ("RR", "STRIDE", "LOTTERY"):
+        record["quantum"] = spec["quantum"]
+    if spec["schedule"]:
+        record["processes"] = result["processes"]
+    return record
+
+
+def run_batch(specs):
+    """Run a micro-batch in one worker; failures are reported per request."""
+    out = []
+    for spec in specs:
+        try:
+            out.append(run_request(spec))
+        except Exception as e:
+            out.append({"error": f"{type(e).__name__}: {e}"})
+    return out
+
+
+# ---------------- service ----------------
+class SimulationService:
+    """Coalescing, micro-batching front end to a process pool."""
+
+    def __init__(self, workers=None, max_queue=DEFAULT_MAX_QUEUE, max_batch=DEFAULT_MAX_BATCH,
+                 batch_window=DEFAULT_BATCH_WINDOW, small_job=DEFAULT_SMALL_JOB, executor=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.small_job = small_job
+        self.executor = executor
+        self._own_executor = executor is None
+        self.queue = None
+        self.inflight = {}          # request key -> future of its record
+        self.counters = dict.fromkeys(
+            ("requests", "coalesced", "rejected", "jobs", "batches", "batched_jobs", "errors"), 0)
+        self._slots = None
+        self._dispatcher = None
+        self._tasks = set()
+
+    async def start(self):
+        if self.executor is None:
+            # a forked worker would inherit the listening and client sockets
+            # (the pool forks on its first task, inside the running server),
+            # so a client reading to EOF would wait on the worker's copy
+            method = "forkserver" if "forkserver" in get_all_start_methods() else None
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=get_context(method))
+        self.queue = asyncio.Queue(self.max_queue)
+        self._slots = asyncio.Semaphore(2 * self.workers)
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def close(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for fut in self.inflight.values():
+            if not fut.done():
+                fut.set_exception(RuntimeError("service closed"))
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def has_room(self, n=1):
+        return self.queue.qsize() + n <= self.max_queue
+
+    def stats(self):
+        return dict(self.counters, queued=self.queue.qsize(), inflight=len(self.inflight),
+                    workers=self.workers, max_queue=self.max_queue)
+
+    async def submit(self, spec, wait=True):
+        """
+        Record for a normalized request. Joins an identical in-flight
+        request if there is one. wait=False raises Overloaded instead of
+        waiting for queue room.
+        """
+        self.counters["requests"] += 1
+        key = request_key(spec)
+        fut = None if key is None else self.inflight.get(key)
+        if fut is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        job = (spec, job_size(spec), fut)
+        if not wait:
+            try:
+                self.queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self.counters["rejected"] += 1
+                raise Overloaded("simulation queue is full") from None
+            self._register(key, fut)
+        else:
+            self._register(key, fut)
+            try:
+                await self.queue.put(job)
+            except BaseException:
+                # withdrawn before it was queued; release any coalesced waiters
+                if not fut.done():
+                    fut.set_exception(Overloaded("request withdrawn"))
+                raise
+        return await asyncio.shield(fut)
+
+    def _register(self, key, fut):
+        if key is None:
+            key = object()          # still counted in flight, never joined
+        self.inflight[key] = fut
+        fut.add_done_callback(lambda _: self.inflight.pop(key, None))
+
+    async def stream(self, specs):
+        """
+        Async generator of (index, record) over normalized requests (or
+        ValueError instances, reported as errors) in completion order. At
+        most max_queue of them are pending at once.
+        """
+        pending = set()
+
+        async def one(i, spec):
+            if isinstance(spec, Exception):
+                return i, {"error": str(spec)}
+            try:
+                return i, await self.submit(spec)
+            except Exception as e:
+                return i, {"error": f"{type(e).__name__}: {e}"}
+
+        try:
+            for i, spec in enumerate(specs):
+                pending.add(asyncio.ensure_future(one(i, spec)))
+                while len(pending) >= self.max_queue:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # ---------------- dispatch ----------------
+    async def _dispatch(self):
+        while True:
+            job = await self.queue.get()
+            if job[1] > self.small_job:
+                await self._send([job])
+                continue
+            batch = [job]
+            await self._drain(batch)
+            if len(batch) < self.max_batch and self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+                await self._drain(batch)
+            await self._send(batch)
+
+    async def _drain(self, batch):
+        while len(batch) < self.max_batch:
+            try:
+                job = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if job[1] > self.small_job:
+                await self._send([job])
+            else:
+                batch.append(job)
+
+    async def _send(self, jobs):
+        await self._slots.acquire()
+        self.counters["jobs"] += len(jobs)
+        if len(jobs) > 1:
+            self.counters["batches"] += 1
+            self.counters["batched_jobs"] += len(jobs)
+        task = asyncio.ensure_future(self._execute(jobs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, jobs):
+        try:
+            records = await asyncio.get_running_loop().run_in_executor(
+                self.executor, run_batch, [spec for spec, _, _ in jobs])
+        except Exception as e:
+            records = [{"error": f"{type(e).__name__}: {e}"}] * len(jobs)
+        finally:
+            self._slots.release()
+        for (_, _, fut), record in zip(jobs, records):
+            if "error" in record:
+                self.counters["errors"] += 1
+            if not fut.done():
+                fut.set_result(record)
+
+
+# ---------------- HTTP ----------------
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_request(reader, max_body):
+    """(method, path, body bytes) of one HTTP/1.1 request."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > max_body:
+        raise HTTPError(413, f"body over {max_body} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], body
+
+
+def write_head(writer, status, content_type, extra=()):
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Type: {content_type}", "Connection: close"]
+    lines.extend(extra)
+    writer.write(("\r\n".join(lines) + "\r\n").encode("latin-1"))
+
+
+def write_json(writer, status, obj, extra=()):
+    body = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    write_head(writer, status, "application/json", [f"Content-Length: {len(body)}", *extra])
+    writer.write(b"\r\n" + body)
+
+
+def write_chunk(writer, data):
+    writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+
+
+class SimulationServer:
+    """HTTP front end of a SimulationService."""
+
+    def __init__(self, service, max_body=DEFAULT_MAX_BODY):
+        self.service = service
+        self.max_body = max_body
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        await self.service.start()
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.service.close()
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                request = await read_request(reader, self.max_body)
+                if request is not None:
+                    await self.route(writer, *request)
+            except HTTPError as e:
+                write_json(writer, e.status, {"error": str(e)})
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass                    # client went away; its pending jobs still finish for others
+        finally:
+            writer.close()
+
+    async def route(self, writer, method, path, body):
+        if path in ("/health", "/stats"):
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            stats = self.service.stats()
+            write_json(writer, 200, dict(status="ok", **stats) if path == "/health" else stats)
+            return
+        if path != "/simulate":
+            raise HTTPError(404, f"no route {path}")
+        if method != "POST":
+            raise HTTPError(405, "use POST")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError as e:
+            raise HTTPError(400, f"invalid JSON: {e}") from None
+        if isinstance(payload, list):
+            await self.simulate_many(writer, payload)
+        else:
+            await self.simulate_one(writer, payload)
+
+    async def simulate_one(self, writer, req):
+        try:
+            spec = normalize_request(req)
+        except ValueError as e:
+            raise HTTPError(400, str(e)) from None
+        try:
+            record = await self.service.submit(spec, wait=False)
+        except Overloaded as e:
+            write_json(writer, 503, {"error": str(e)}, ["Retry-After: 1"])
+            return
+        body = json.dumps(dict(record, index=0), separators=(",", ":")).encode("utf-8") + b"\n"
+        write_head(writer, 200, "application/x-ndjson", [f"Content-Length: {len(body)}"])
+        writer.write(b"\r\n" + body)
+
+    async def simulate_many(self, writer, reqs):
+        if not self.service.has_room():
+            self.service.counters["rejected"] += 1
+            write_json(writer, 503, {"error": "simulation queue is full"}, ["Retry-After: 1"])
+            return
+        specs = []
+        for req in reqs:
+            try:
+                specs.append(normalize_request(req))
+            except ValueError as e:
+                specs.append(e)
+        write_head(writer, 200, "application/x-ndjson", ["Transfer-Encoding: chunked"])
+        writer.write(b"\r\n")
+        async for i, record in self.service.stream(specs):
+            write_chunk(writer, json.dumps(dict(record, index=i), separators=(",", ":")).encode("utf-8") + b"\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+
+async def serve(host="127.0.0.1", port=8765, **options):
+    max_body = options.pop("max_body", DEFAULT_MAX_BODY)
+    server = SimulationServer(SimulationService(**options), max_body=max_body)
+    host, port = await server.start(host, port)
+    print(f"simulation service on http://{host}:{port}", file=sys.stderr)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve run_scheduler over local HTTP/JSON.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=None, help="simulation processes (default: CPU count)")
+    ap.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE, help="bounded job queue size")
+    ap.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="jobs per micro-batch")
+    ap.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW,
+                    help="seconds to wait for a micro-batch to fill")
+    ap.add_argument("--small-job", type=int, default=DEFAULT_SMALL_JOB,
+                    help="jobs with at most this many processes are batched")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+                          max_batch=args.max_batch, batch_window=args.batch_window,
+                          small_job=args.small_job))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# tests/conftest.py
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_workload(n, seed, gap=8, burst=(1, 6), priority=(1, 3), threads=None, shuffle=False):
+    """
+    n processes whose arrivals are 0..gap apart, with burst, priority and
+    threads uniform over the given inclusive ranges (priority=None leaves
+    it out; threads is only set when given).
+    """
+    rng = random.Random(seed)
+    t = 0
+    out = []
+    for i in range(n):
+        t += rng.randint(0, gap)
+        p = {"pid": f"P{i + 1}", "arrival": t, "burst": rng.randint(*burst)}
+        if priority is not None:
+            p["priority"] = rng.randint(*priority)
+        if threads is not None:
+            p["threads"] = rng.randint(*threads)
+        out.append(p)
+    if shuffle:
+        rng.shuffle(out)
+    return out
+
+
+@pytest.fixture
+def workload():
+    """The random_workload() generator."""
+    return random_workload
@@ -0,0 +1,327 @@
+# tests/differential.py
+
+"""
+Property-based differential harness.
+
+The run_* schedulers (fcfs, sjf, srtf, roundrobin, priority) define the
+reference semantics. Every optimized engine must reproduce them exactly
+on integer single-CPU workloads:
+ - engine:      scheduler.engine.simulate
+ - wheel:       the same engine on the timing-wheel event queue
+ - incremental: scheduler.incremental.IncrementalSimulation, built from
+                the early arrivals and then extended, so the second run
+                resumes from a snapshot
+ - resumed:     an Engine on the timing wheel stopped half way,
+                checkpointed through scheduler.checkpoint.dumps/loads
+                and resumed
+ - spilled:     the engine with a zero memory budget, so every full chunk
+                of segments goes through a SegmentStore spill file
+ - periods:     scheduler.workload_index.simulate_indexed, with the busy
+                periods split into separately simulated chunks
+
+Workloads come from seeded adversarial generators (GENERATORS): ties,
+simultaneous arrivals, zero bursts, long idle gaps and large counts. For
+every workload, per-process finish / turnaround / waiting, the
+(pid, start, finish) timeline and metrics.compute() are compared with ==.
+A mismatch is shrunk (fewer processes, then smaller fields) to a minimal
+workload that still fails, and reported as a JSON reproducer.
+
+The reference SRTF only records each process's final dispatch, so for
+SRTF the timeline compares (pid, start of the last run, finish) and the
+metrics that depend on busy intervals are skipped (SRTF_SKIPPED_METRICS).
+
+Run under pytest (tests/test_differential.py) or directly for longer
+campaigns:
+    python tests/differential.py --trials 2000 --seed 1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from metrics import metrics
+from scheduler import checkpoint
+from scheduler.engine import Engine, simulate
+from scheduler.fcfs import run_fcfs
+from scheduler.incremental import IncrementalSimulation
+from scheduler.priority import run_priority
+from scheduler.roundrobin import run_roundrobin
+from scheduler.sjf import run_sjf
+from scheduler.srtf import run_srtf
+from scheduler.workload_index import WorkloadIndex, simulate_indexed
+
+POLICIES = ("FCFS", "SJF", "SRTF", "RR", "PRIORITY")
+REFERENCES = {"FCFS": run_fcfs, "SJF": run_sjf, "SRTF": run_srtf, "PRIORITY": run_priority}
+SRTF_SKIPPED_METRICS = ("throughput", "cpu_utilization", "effective_cpu_utilization")
+
+# largest "huge" workload per policy; the reference SJF / PRIORITY scans are O(n^3)
+HUGE = {"FCFS": 20000, "RR": 20000, "SRTF": 400, "SJF": 250, "PRIORITY": 250}
+
+
+# ---------------- workload generators ----------------
+def _workload(arrivals, bursts, priorities):
+    return [{"pid": f"P{i + 1}", "arrival": a, "burst": b, "priority": pr}
+            for i, (a, b, pr) in enumerate(zip(arrivals, bursts, priorities))]
+
+
+def gen_random(rng, policy):
+    n = rng.randint(1, 12)
+    return _workload([rng.randint(0, 15) for _ in range(n)], [rng.randint(1, 7) for _ in range(n)],
+                     [rng.randint(1, 3) for _ in range(n)])
+
+
+def gen_ties(rng, policy):
+    """Few distinct arrivals, bursts and priorities, so most decisions are ties."""
+    n = rng.randint(2, 12)
+    return _workload([rng.choice((0, 2, 4)) for _ in range(n)], [rng.choice((2, 3)) for _ in range(n)],
+                     [rng.choice((1, 1, 2)) for _ in range(n)])
+
+
+def gen_simultaneous(rng, policy):
+    n = rng.randint(1, 12)
+    t = rng.choice((0, rng.randint(1, 20)))
+    return _workload([t] * n, [rng.randint(1, 9) for _ in range(n)], [rng.randint(1, 5) for _ in range(n)])
+
+
+def gen_zero_bursts(rng, policy):
+    n = rng.randint(1, 12)
+    return _workload([rng.randint(0, 10) for _ in range(n)],
+                     [0 if rng.random() < 0.4 else rng.randint(1, 4) for _ in range(n)],
+                     [rng.randint(1, 3) for _ in range(n)])
+
+
+def gen_idle_gaps(rng, policy):
+    n = rng.randint(1, 12)
+    arrivals = []
+    t = rng.randint(0, 300)
+    for _ in range(n):
+        arrivals.append(t)
+        t += rng.randint(0, 2) if rng.random() < 0.5 else rng.randint(20, 300)
+    rng.shuffle(arrivals)
+    return _workload(arrivals, [rng.randint(1, 6) for _ in range(n)], [rng.randint(1, 3) for _ in range(n)])
+
+
+def gen_huge(rng, policy):
+    n = HUGE[policy]
+    arrivals = []
+    t = 0
+    for _ in range(n):
+        t += rng.choice((0, 0, 1, 2, 5))
+        arrivals.append(t)
+    return _workload(arrivals, [rng.randint(0, 9) for _ in range(n)], [rng.randint(1, 4) for _ in range(n)])
+
+
+GENERATORS = {
+    "random": gen_random,
+    "ties": gen_ties,
+    "simultaneous": gen_simultaneous,
+    "zero_bursts": gen_zero_bursts,
+    "idle_gaps": gen_idle_gaps,
+    "huge": gen_huge,
+}
+
+
+# ---------------- reference and optimized runs ----------------
+def run_reference(policy, processes, quantum):
+    """Reference output: per-process records, or RR's per-slice segments."""
+    procs = [dict(p) for p in processes]
+    if policy == "RR":
+        return run_roundrobin(procs, quantum=quantum)["processes"]
+    return REFERENCES[policy](procs)["processes"]
+
+
+def run_engine(policy, processes, quantum):
+    return simulate(processes, policy, quantum=quantum)
+
+
+def run_incremental(policy, processes, quantum):
+    cut = sorted(p["arrival"] for p in processes)[len(processes) // 2]
+    sim = IncrementalSimulation([p for p in processes if p["arrival"] < cut], policy, quantum=quantum,
+                                max_snapshots=8)
+    return sim.add([p for p in processes if p["arrival"] >= cut])
+
+
+def run_resumed(policy, processes, quantum):
+    engine = Engine(processes, policy, quantum=quantum, event_queue="wheel")
+    while engine.completed < len(processes) // 2:
+        engine.step()
+    state = checkpoint.loads(checkpoint.dumps(engine.state()))
+    return Engine.from_state(state).run()
+
+
+def run_wheel(policy, processes, quantum):
+    return simulate(processes, policy, quantum=quantum, event_queue="wheel")
+
+
+def run_spilled(policy, processes, quantum):
+    return simulate(processes, policy, quantum=quantum, memory_budget=0)
+
+
+def run_periods(policy, processes, quantum):
+    return simulate_indexed(WorkloadIndex(processes), policy, quantum=quantum, chunks=3)
+
+
+ENGINES = {"engine": run_engine, "wheel": run_wheel, "incremental": run_incremental, "resumed": run_resumed,
+           "spilled": run_spilled, "periods": run_periods}
+
+
+# ---------------- comparison ----------------
+def reference_outcome(policy, processes, quantum):
+    out = run_reference(policy, processes, quantum)
+    if policy == "RR":
+        per_process = {}
+        info = {p["pid"]: p for p in processes}
+        for seg in out:
+            per_process[seg["pid"]] = max(per_process.get(seg["pid"], seg["finish"]), seg["finish"])
+        per_process = {pid: (f, f - info[pid]["arrival"], f - info[pid]["arrival"] - info[pid]["burst"])
+                       for pid, f in per_process.items()}
+    else:
+        per_process = {p["pid"]: (p["finish"], p["turnaround"], p["waiting"]) for p in out}
+    timeline = sorted((s["start"], s["finish"], s["pid"]) for s in out)
+    return per_process, timeline, metrics.compute(out)
+
+
+def engine_outcome(policy, result):
+    per_process = {p["pid"]: (p["finish"], p["turnaround"], p["waiting"]) for p in result["summary"]}
+    segments = result["processes"]
+    if policy == "SRTF":
+        last = {}
+        for s in sorted(segments, key=lambda s: s["start"]):
+            last[s["pid"]] = (s["start"], s["finish"], s["pid"])
+        timeline = sorted(last.values())
+    else:
+        timeline = sorted((s["start"], s["finish"], s["pid"]) for s in segments)
+    return per_process, timeline, metrics.compute(segments)
+
+
+def mismatch(policy, processes, quantum, engine="engine"):
+    """First difference between the reference and `engine`, or None."""
+    if not processes:
+        return None
+    try:
+        ref = reference_outcome(policy, processes, quantum)
+        got = engine_outcome(policy, ENGINES[engine](policy, processes, quantum))
+    except Exception as e:
+        return f"raised {type(e).__name__}: {e}"
+
+    ref_pp, ref_tl, ref_m = ref
+    got_pp, got_tl, got_m = got
+    for pid in sorted(set(ref_pp) | set(got_pp)):
+        if ref_pp.get(pid) != got_pp.get(pid):
+            return f"{pid}: (finish, turnaround, waiting) {ref_pp.get(pid)} != {got_pp.get(pid)}"
+    if ref_tl != got_tl:
+        for a, b in zip(ref_tl, got_tl):
+            if a != b:
+                return f"timeline: {a} != {b}"
+        return f"timeline: {len(ref_tl)} != {len(got_tl)} segments"
+    for key, value in ref_m.items():
+        if policy == "SRTF" and key in SRTF_SKIPPED_METRICS:
+            continue
+        if got_m.get(key) != value:
+            return f"metric {key}: {value} != {got_m.get(key)}"
+    return None
+
+
+# ---------------- shrinking ----------------
+def _smaller(field, value):
+    floor = 1 if field == "priority" else 0
+    out = []
+    for v in (floor, value // 2, value - 1):
+        if floor <= v < value and v not in out:
+            out.append(v)
+    return out
+
+
+def _renumber(processes):
+    return [dict(p, pid=f"P{i + 1}") for i, p in enumerate(processes)]
+
+
+def shrink(processes, fails):
+    """
+    Greedy shrink of a failing workload: drop chunks of processes (halving
+    the chunk size), then lower arrival / burst / priority one field at a
+    time, until no single step keeps `fails` true.
+    """
+    current = [dict(p) for p in processes]
+    changed = True
+    while changed:
+        changed = False
+        size = len(current) // 2
+        while size >= 1:
+            i = 0
+            while i < len(current):
+                candidate = current[:i] + current[i + size:]
+                if candidate and fails(candidate):
+                    current = candidate
+                    changed = True
+                else:
+                    i += size
+            size //= 2
+        low = min(p["arrival"] for p in current)
+        if low > 0:
+            candidate = [dict(p, arrival=p["arrival"] - low) for p in current]
+            if fails(candidate):
+                current = candidate
+                changed = True
+        for i in range(len(current)):
+            for field in ("arrival", "burst", "priority"):
+                for value in _smaller(field, current[i][field]):
+                    candidate = current[:i] + [dict(current[i], **{field: value})] + current[i + 1:]
+                    if fails(candidate):
+                        current = candidate
+                        changed = True
+                        break
+    candidate = _renumber(current)
+    return candidate if fails(candidate) else current
+
+
+def reproducer(policy, engine, quantum, processes):
+    return json.dumps({"policy": policy, "engine": engine, "quantum": quantum, "processes": processes})
+
+
+def check(policy, engine, generator, trials, seed):
+    """Raise AssertionError with a shrunk reproducer on the first mismatch."""
+    rng = random.Random(seed)
+    gen = GENERATORS[generator]
+    for _ in range(trials):
+        quantum = rng.randint(1, 4)
+        processes = gen(rng, policy)
+        problem = mismatch(policy, processes, quantum, engine)
+        if problem is None:
+            continue
+        minimal = shrink(processes, lambda ps: mismatch(policy, ps, quantum, engine) is not None)
+        raise AssertionError(f"{policy} / {engine} / {generator}: "
+                             f"{mismatch(policy, minimal, quantum, engine)}\n"
+                             f"reproducer: {reproducer(policy, engine, quantum, minimal)}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Differential test of the optimized engines against run_*.")
+    ap.add_argument("--trials", type=int, default=200, help="workloads per policy / engine / generator")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--policies", nargs="+", default=list(POLICIES), type=str.upper, choices=POLICIES)
+    ap.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    ap.add_argument("--generators", nargs="+", default=[g for g in GENERATORS if g != "huge"],
+                    choices=list(GENERATORS))
+    args = ap.parse_args(argv)
+    failures = 0
+    for policy in args.policies:
+        for engine in args.engines:
+            for generator in args.generators:
+                trials = 1 if generator == "huge" else args.trials
+                try:
+                    check(policy, engine, generator, trials, args.seed)
+                    print(f"ok   {policy:<8} {engine:<11} {generator}")
+                except AssertionError as e:
+                    failures += 1
+                    print(f"FAIL {e}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
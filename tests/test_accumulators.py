@@ -0,0 +1,99 @@
+# tests/test_accumulators.py
+
+import random
+import statistics
+
+import pytest
+
+from experiments.fleet import generate_fleet, run_fleet
+from metrics.accumulators import MetricAccumulator, QuantileSketch, RunningStats, merge_all
+from scheduler.engine import simulate
+
+
+def _samples(n, seed):
+    rng = random.Random(seed)
+    return [rng.choice((0, 1, -1)) * rng.lognormvariate(2, 1.5) for _ in range(n)]
+
+
+def _shards(xs, k, seed):
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(xs)), k - 1))
+    return [xs[a:b] for a, b in zip([0] + cuts, cuts + [len(xs)])]
+
+
+def test_running_stats_merge_matches_one_pass():
+    xs = _samples(5000, seed=1)
+    single = RunningStats()
+    for x in xs:
+        single.push(x)
+    merged = RunningStats()
+    for shard in _shards(xs, 7, seed=2) + [[]]:
+        part = RunningStats()
+        for x in shard:
+            part.push(x)
+        merged.merge(part)
+    assert (merged.n, merged.min, merged.max) == (single.n, single.min, single.max) == (len(xs), min(xs), max(xs))
+    assert merged.mean == pytest.approx(single.mean, rel=1e-12)
+    assert merged.variance == pytest.approx(single.variance, rel=1e-12)
+    assert single.variance == pytest.approx(statistics.variance(xs), rel=1e-9)
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_sketch_quantiles_within_relative_accuracy(accuracy):
+    xs = _samples(20000, seed=3)
+    sketch = QuantileSketch(accuracy)
+    for x in xs:
+        sketch.push(x)
+    ordered = sorted(xs)
+    for q in (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999, 1):
+        true = ordered[int(q * (len(xs) - 1))]
+        assert abs(sketch.quantile(q) - true) <= accuracy * abs(true) + 1e-9
+
+
+def test_sketch_is_independent_of_sharding():
+    xs = _samples(6000, seed=4)
+    whole = QuantileSketch(0.02)
+    for x in xs:
+        whole.push(x)
+    for k, seed in ((2, 5), (13, 6)):
+        parts = []
+        for shard in _shards(xs, k, seed):
+            part = QuantileSketch(0.02)
+            for x in shard:
+                part.push(x)
+            parts.append(part)
+        merged = QuantileSketch(0.02)
+        for part in reversed(parts):
+            merged.merge(part)
+        assert (merged.positive, merged.negative, merged.zero, merged.count) == \
+            (whole.positive, whole.negative, whole.zero, whole.count)
+        assert [merged.quantile(q / 100) for q in range(101)] == [whole.quantile(q / 100) for q in range(101)]
+    with pytest.raises(ValueError):
+        whole.merge(QuantileSketch(0.05))
+
+
+def test_merge_all_combines_by_name():
+    a, b = {"x": MetricAccumulator()}, {"x": MetricAccumulator(), "y": MetricAccumulator()}
+    a["x"].push(1)
+    b["x"].push(3)
+    b["y"].push(5)
+    merged = merge_all([a, b])
+    assert merged["x"].summary()["mean"] == 2 and merged["y"].summary()["count"] == 1
+
+
+def test_fleet_is_independent_of_workers():
+    one = run_fleet(generate_fleet(40, 25, seed=1), "RR", quantum=2, workers=1)
+    two = run_fleet(generate_fleet(40, 25, seed=1), "RR", quantum=2, workers=2)
+    assert (one["tenants"], one["processes"]) == (two["tenants"], two["processes"]) == (40, 1000)
+    assert one["metrics"].keys() == two["metrics"].keys()
+    for name, summary in one["metrics"].items():
+        other = two["metrics"][name]
+        assert {k: v for k, v in summary.items() if k not in ("mean", "stddev")} == \
+            {k: v for k, v in other.items() if k not in ("mean", "stddev")}
+        assert summary["mean"] == pytest.approx(other["mean"], abs=1e-3)
+        assert summary["stddev"] == pytest.approx(other["stddev"], abs=1e-3)
+    # ... and agrees with simulating the tenants one by one
+    waits = [q["waiting"] for w in generate_fleet(40, 25, seed=1)
+             for q in simulate(w.to_dicts(), "RR", quantum=2)["summary"]]
+    assert one["metrics"]["process.waiting"]["mean"] == pytest.approx(statistics.fmean(waits), abs=1e-3)
+    assert one["metrics"]["process.waiting"]["max"] == max(waits)
@@ -0,0 +1,86 @@
+# tests/test_autotune.py
+
+import pytest
+
+from experiments import autotune
+from process_generator import generate_processes
+
+
+def _workload(n=200, seed=1):
+    return generate_processes(num_processes=n, seed=seed)
+
+
+def test_parse_constraint():
+    assert autotune.parse_constraint("cpu_utilization >= 90") == ("cpu_utilization", ">=", 90.0)
+    assert autotune.parse_constraint("context_switches<=1e3") == ("context_switches", "<=", 1000.0)
+    with pytest.raises(ValueError):
+        autotune.parse_constraint("context_switches < 10")
+
+
+def test_fewest_context_switches_picks_the_largest_quantum():
+    report = autotune.tune(_workload(), objective="context_switches", space={"quantum": (1, 2, 4, 8)},
+                           secure=False)
+    assert report["best"]["params"] == {"quantum": 8}
+    assert report["baseline"]["params"] == {"quantum": 2}
+    assert report["feasible"]
+
+
+def test_constraints_rule_out_configurations():
+    space = {"quantum": (1, 2, 4, 8)}
+    free = autotune.tune(_workload(), objective="average_waiting_time", space=space, secure=False)
+    assert free["best"]["params"] == {"quantum": 8}
+    # quantum 8 switches 200 times on this workload, quantum 4 315 times
+    report = autotune.tune(_workload(), objective="average_waiting_time", constraints=["context_switches>=300"],
+                           space=space, secure=False)
+    assert report["best"]["params"] == {"quantum": 4} and report["feasible"]
+    impossible = autotune.tune(_workload(), objective="average_waiting_time",
+                               constraints=["context_switches<=10"], space=space, secure=False)
+    assert not impossible["feasible"] and impossible["best"]["params"] == {"quantum": 8}
+
+
+def test_successive_halving_shrinks_rungs_and_memoizes():
+    processes = _workload(540)
+    memo = {}
+    report = autotune.tune(processes, space={"quantum": (1, 2, 3, 4, 6, 8, 12, 16, 24)}, secure=False, memo=memo)
+    sizes = [r["processes"] for r in report["rungs"]]
+    counts = [r["candidates"] for r in report["rungs"]]
+    assert sizes == sorted(sizes) and sizes[-1] == len(processes) and sizes[0] < len(processes)
+    assert counts == sorted(counts, reverse=True) and counts[0] == 9
+    # a second run over the same memo simulates nothing new
+    evaluated = len(memo)
+    again = autotune.tune(processes, space={"quantum": (1, 2, 3, 4, 6, 8, 12, 16, 24)}, secure=False, memo=memo)
+    assert len(memo) == evaluated and again["cache_hits"] == again["evaluations"]
+    assert again["best"] == report["best"]
+
+
+def test_thresholds_are_tuned_with_the_detector():
+    space = {"quantum": (2,), "burst_threshold": (4, 8), "priority_threshold": (0, 2)}
+    report = autotune.tune(_workload(), space=space, constraints=["detection_rate<=0.5"])
+    assert set(report["best"]["params"]) == {"quantum", "burst_threshold", "priority_threshold"}
+    assert report["best"]["metrics"]["detection_rate"] <= 0.5
+
+
+def test_thresholds_need_a_detection_budget():
+    space = {"quantum": (2,), "burst_threshold": (4, 8), "priority_threshold": (0, 2)}
+    with pytest.raises(ValueError, match="detection_rate"):
+        autotune.tune(_workload(), space=space, constraints=["cpu_utilization>=90"])
+    # without a budget the default space leaves the detector at its defaults
+    report = autotune.tune(_workload(), space=None, max_candidates=3)
+    assert set(report["best"]["params"]) == {"quantum"}
+    assert report["best"]["metrics"]["detection_rate"] == report["baseline"]["metrics"]["detection_rate"]
+
+
+def test_evaluate_falls_back_to_the_defaults():
+    processes = _workload(60)
+    assert autotune.evaluate(processes, {}) == autotune.evaluate(processes, autotune.DEFAULTS)
+
+
+def test_pareto_frontier_drops_dominated_points():
+    points = [
+        {"params": {"q": 1}, "metrics": {"t": 10, "cpu_utilization": 90}},
+        {"params": {"q": 2}, "metrics": {"t": 8, "cpu_utilization": 80}},
+        {"params": {"q": 3}, "metrics": {"t": 12, "cpu_utilization": 85}},    # worse than q=1 on both
+        {"params": {"q": 4}, "metrics": {"t": 10, "cpu_utilization": 90}},    # same as q=1
+    ]
+    frontier = autotune.pareto_frontier(points, ["t", "cpu_utilization"])
+    assert [p["params"]["q"] for p in frontier] == [2, 1]
@@ -0,0 +1,135 @@
+# tests/test_backfill.py
+
+import json
+from collections import Counter, defaultdict
+
+import pytest
+
+import main
+from process_generator import generate_batch_jobs
+from scheduler.backfill import MODES, Profile, run_backfill
+
+
+def _check_schedule(jobs, cpus, out):
+    by_cpu = defaultdict(list)
+    for seg in out["processes"]:
+        assert 0 <= seg["cpu"] < cpus
+        by_cpu[seg["cpu"]].append((seg["start"], seg["finish"]))
+    for spans in by_cpu.values():
+        spans.sort()
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+    widths = Counter(seg["pid"] for seg in out["processes"])
+    summary = {q["pid"]: q for q in out["summary"]}
+    for job in jobs:
+        assert widths[job["pid"]] == job["cpus"]
+        assert summary[job["pid"]]["start"] >= job["arrival"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("seed", [1, 2])
+def test_schedules_are_valid(mode, seed):
+    jobs = generate_batch_jobs(400, cpus=16, load=0.95, seed=seed)
+    _check_schedule(jobs, 16, run_backfill(jobs, cpus=16, mode=mode))
+
+
+def test_fcfs_starts_in_arrival_order():
+    jobs = generate_batch_jobs(300, cpus=16, load=0.95, seed=3)
+    out = run_backfill(jobs, cpus=16, mode="fcfs")
+    starts = [q["start"] for q in out["summary"]]
+    assert starts == sorted(starts)
+    assert out["batch"]["backfilled"] == 0
+
+
+@pytest.mark.parametrize("mode", ["easy", "conservative"])
+def test_backfilling_beats_fcfs(mode):
+    jobs = generate_batch_jobs(1000, cpus=32, load=0.9, seed=4)
+    fcfs = run_backfill(jobs, cpus=32, mode="fcfs")["batch"]
+    out = run_backfill(jobs, cpus=32, mode=mode)["batch"]
+    assert out["backfilled"] > 0
+    assert out["utilization"] > fcfs["utilization"]
+    assert out["mean_bounded_slowdown"] < fcfs["mean_bounded_slowdown"]
+
+
+def test_easy_backfills_short_job_without_delaying_the_head():
+    jobs = [
+        {"pid": "A", "arrival": 0, "burst": 10, "cpus": 2},
+        {"pid": "B", "arrival": 1, "burst": 5, "cpus": 4},     # waits for A: shadow time 10
+        {"pid": "C", "arrival": 2, "burst": 8, "cpus": 2},     # ends by 10: backfilled
+        {"pid": "D", "arrival": 3, "burst": 20, "cpus": 1},    # would delay B: waits
+    ]
+    summary = {q["pid"]: q for q in run_backfill(jobs, cpus=4, mode="easy")["summary"]}
+    assert summary["C"]["start"] == 2 and summary["C"]["backfilled"]
+    assert summary["B"]["start"] == 10
+    assert summary["D"]["start"] == 15 and not summary["D"]["backfilled"]
+
+
+def test_easy_uses_extra_cpus_past_the_shadow_time():
+    jobs = [
+        {"pid": "A", "arrival": 0, "burst": 10, "cpus": 3},
+        {"pid": "B", "arrival": 1, "burst": 5, "cpus": 2},     # shadow 10, one extra CPU then
+        {"pid": "C", "arrival": 2, "burst": 50, "cpus": 1},    # long, but fits the extra CPU
+    ]
+    summary = {q["pid"]: q for q in run_backfill(jobs, cpus=4, mode="easy")["summary"]}
+    assert summary["C"]["start"] == 2 and summary["C"]["backfilled"]
+    assert summary["B"]["start"] == 10
+
+
+def test_conservative_protects_every_reservation():
+    jobs = [
+        {"pid": "A", "arrival": 0, "burst": 10, "cpus": 3},
+        {"pid": "B", "arrival": 1, "burst": 5, "cpus": 2},     # head: reserved at 10
+        {"pid": "C", "arrival": 2, "burst": 5, "cpus": 4},     # reserved at 15, after B
+        {"pid": "D", "arrival": 3, "burst": 100, "cpus": 1},   # fits the CPU B leaves spare
+    ]
+    easy = {q["pid"]: q for q in run_backfill(jobs, cpus=4, mode="easy")["summary"]}
+    cons = {q["pid"]: q for q in run_backfill(jobs, cpus=4, mode="conservative")["summary"]}
+    # EASY only protects the head, so D starts at once and pushes C back by 88
+    assert easy["D"]["start"] == 3 and easy["B"]["start"] == 10 and easy["C"]["start"] == 103
+    assert cons["B"]["start"] == 10 and cons["C"]["start"] == 15 and cons["D"]["start"] == 20
+
+
+def test_conservative_compresses_after_an_early_end():
+    jobs = [
+        {"pid": "A", "arrival": 0, "burst": 2, "estimate": 10, "cpus": 4},
+        {"pid": "B", "arrival": 1, "burst": 3, "cpus": 4},
+    ]
+    summary = {q["pid"]: q for q in run_backfill(jobs, cpus=4, mode="conservative")["summary"]}
+    assert summary["B"]["start"] == 2
+
+
+def test_jobs_are_killed_at_their_estimate():
+    jobs = [{"pid": "A", "arrival": 0, "burst": 9, "estimate": 4, "cpus": 2}]
+    out = run_backfill(jobs, cpus=2, mode="easy")
+    (q,) = out["summary"]
+    assert q["finish"] == 4 and q["terminated"]
+    assert out["batch"]["killed"] == 1
+    assert all(seg["terminated"] for seg in out["processes"])
+
+
+def test_rejects_jobs_wider_than_the_machine():
+    with pytest.raises(ValueError):
+        run_backfill([{"pid": "A", "arrival": 0, "burst": 1, "cpus": 8}], cpus=4)
+    with pytest.raises(ValueError):
+        run_backfill([], cpus=4, mode="lifo")
+
+
+def test_profile_coalesces_and_finds_windows():
+    profile = Profile(4)
+    profile.reserve(0, 10, 2)
+    profile.reserve(10, 20, 2)          # same level: merged with the first step
+    assert profile.times == [0, 20] and profile.free == [2, 4]
+    profile.reserve(5, 8, 2)
+    assert profile.earliest(0, 3, 3) == 20
+    assert profile.earliest(0, 5, 2) == 0
+    assert profile.earliest(1, 5, 2) == 8
+    assert profile.earliest(0, 3, 3, limit=15) is None
+    profile.release(5, 8, 2)
+    assert profile.times == [0, 20] and profile.shadow(3) == (20, 4)
+
+
+def test_main_reports_the_fcfs_baseline(capsys):
+    main.main(["--batch", "200", "--cpus", "8", "--seed", "1", "--algorithms", "EASY"])
+    record = json.loads(capsys.readouterr().out)
+    m = record["metrics"]
+    assert record["algorithm"] == "EASY"
+    assert m["backfilled"] > 0 and m["fcfs_utilization"] <= m["utilization"]
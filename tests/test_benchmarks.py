@@ -0,0 +1,42 @@
+# tests/test_benchmarks.py
+
+import pytest
+
+from benchmarks.run_benchmarks import find_regressions, fit_exponent, run_suite
+
+
+@pytest.mark.parametrize("k", [1.0, 2.0, 0.5])
+def test_fit_exponent_recovers_power_laws(k):
+    timings = {n: 1e-6 * n ** k for n in (100, 1000, 10000, 100000)}
+    assert fit_exponent(timings) == pytest.approx(k, abs=1e-3)
+
+
+def test_fit_exponent_ignores_tiny_sizes_when_it_can():
+    # fixed overhead dominates n=10; sizes from 100 on are linear
+    timings = {10: 1.0, 100: 1e-4, 1000: 1e-3, 10000: 1e-2}
+    assert fit_exponent(timings) == pytest.approx(1.0)
+    assert fit_exponent({10: 1e-5, 50: 5e-5}) == pytest.approx(1.0)
+    assert fit_exponent({1000: 1e-3}) is None
+    assert fit_exponent({}) is None
+
+
+def test_find_regressions():
+    baseline = {"a": {"seconds": {"100": 0.010, "1000": 0.100}},
+                "b": {"seconds": {"100": 0.0001}},         # below the gate's noise floor
+                "gone": {"seconds": {"100": 1.0}}}
+    current = {"a": {"seconds": {"100": 0.0125, "1000": 0.105, "10000": 5.0}},
+               "b": {"seconds": {"100": 0.01}},
+               "new": {"seconds": {"100": 9.0}}}
+    assert [(name, n) for name, n, *_ in find_regressions(current, baseline, 10)] == [("a", "100")]
+    (_, _, base, cur, pct), = find_regressions(current, baseline, 10)
+    assert (base, cur) == (0.010, 0.0125) and pct == pytest.approx(25.0)
+    assert find_regressions(current, baseline, 30) == []
+
+
+def test_budget_skips_sizes_predicted_to_overrun(capsys):
+    calls = []
+    benches = {"noop": (lambda n: (n,), lambda n: calls.append(n))}
+    # every timing is tiny, so a budget of 0 skips each size after the first
+    out = run_suite(benches, [10, 100, 1000], budget=0, repeats=1)
+    assert calls == [10] and list(out["noop"]["seconds"]) == ["10"]
+    assert "skipped" in capsys.readouterr().out
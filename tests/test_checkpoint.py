@@ -0,0 +1,84 @@
+# tests/test_checkpoint.py
+
+import json
+
+import pytest
+
+import main
+from process_generator import generate_processes
+from scheduler import checkpoint, engine
+from scheduler.cost_model import CostModel
+from scheduler.power_model import PowerModel
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _interrupt_after(k):
+    def progress(completed, total):
+        if completed >= k:
+            raise Interrupted
+    return progress
+
+
+@pytest.mark.parametrize("policy, options", [
+    ("FCFS", {}),
+    ("SRTF", {"cpus": 2}),
+    ("RR", {"cost_model": CostModel(context_switch=0.5, cache_refill=2, migration=1), "cpus": 3}),
+    ("PRIORITY", {"power_model": PowerModel(governor="ondemand")}),
+    ("SJF", {"event_queue": "wheel"}),
+])
+def test_resume_matches_an_uninterrupted_run(tmp_path, workload, policy, options):
+    processes = workload(300, seed=4, gap=3, burst=(1, 9))
+    path = str(tmp_path / "run.ckpt")
+    expected = engine.simulate(processes, policy, quantum=2, **options)
+    with pytest.raises(Interrupted):
+        engine.simulate(processes, policy, quantum=2, progress=_interrupt_after(200),
+                        checkpoint_path=path, checkpoint_every=37, **options)
+    state = checkpoint.load(path)
+    assert 0 < state["completed"] < 200
+    assert engine.resume(path, checkpoint_every=37) == expected
+
+
+def test_resume_with_io_bursts(tmp_path):
+    processes = generate_processes(num_processes=200, seed=6, io_bursts=3, devices=2)
+    path = str(tmp_path / "run.ckpt")
+    expected = engine.simulate(processes, "RR", quantum=2, cpus=2)
+    with pytest.raises(Interrupted):
+        engine.simulate(processes, "RR", quantum=2, cpus=2, progress=_interrupt_after(120),
+                        checkpoint_path=path, checkpoint_every=50)
+    assert engine.resume(path) == expected
+
+
+def test_state_round_trips_exactly(workload):
+    processes = workload(100, seed=2)
+    e = engine.Engine(processes, "RR", quantum=2, cpus=2, cost_model=CostModel(cache_refill=1.5, cache_decay=7))
+    for _ in range(150):
+        e.step(None)
+    state = json.loads(json.dumps(e.state()))
+    assert checkpoint.loads(checkpoint.dumps(e.state())) == state
+    assert engine.Engine.from_state(state).run() == e.run()
+
+
+def test_damaged_checkpoints_are_rejected(workload):
+    data = checkpoint.dumps(engine.Engine(workload(5, seed=1), "FCFS").state())
+    for bad, message in ((data[:10], "Truncated"), (b"XXXX" + data[4:], "Not an engine"),
+                         (data[:4] + b"\x09" + data[5:], "version"),
+                         (data[:-1] + bytes([data[-1] ^ 1]), "Corrupt"), (data[:-3], "Corrupt")):
+        with pytest.raises(ValueError, match=message):
+            checkpoint.loads(bad)
+
+
+def test_cli_resumes_from_the_checkpoint_dir(tmp_path, capsys):
+    processes = generate_processes(num_processes=400, seed=8)
+    expected = main.run_scheduler("RR", processes, quantum=2, cpus=2)["metrics"]
+    path = tmp_path / "RR.ckpt"
+    with pytest.raises(Interrupted):
+        engine.simulate(processes, "RR", quantum=2, cpus=2, progress=_interrupt_after(300),
+                        checkpoint_path=str(path), checkpoint_every=100)
+    assert path.exists()
+    main.main(["--generate", "400", "--seed", "8", "--algorithms", "RR", "--quantum", "2", "--cpus", "2",
+               "--checkpoint-dir", str(tmp_path)])
+    assert json.loads(capsys.readouterr().out)["metrics"] == expected
+    assert not path.exists()
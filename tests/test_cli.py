@@ -0,0 +1,55 @@
+# tests/test_cli.py
+
+import json
+import sys
+
+import pytest
+
+import main
+from process_generator import generate_processes
+
+
+def _run(capsys, *argv):
+    assert main.main(list(argv)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_default_run_prints_one_line_per_algorithm(capsys):
+    records = _run(capsys, "--generate", "50", "--seed", "3")
+    assert [r["algorithm"] for r in records] == list(main.ALGORITHMS)
+    processes = generate_processes(num_processes=50, seed=3)
+    for r in records:
+        assert r["num_processes"] == 50 and r["cpus"] == 1 and r["secure"] is False
+        assert r["metrics"] == main.run_scheduler(r["algorithm"], processes)["metrics"]
+        assert ("quantum" in r) == (r["algorithm"] == "RR")
+    assert "matplotlib" not in sys.modules
+
+
+def test_options_reach_the_scheduler(capsys):
+    (record,) = _run(capsys, "--generate", "40", "--seed", "1", "--algorithms", "rr", "--quantum", "2",
+                     "--cpus", "2", "--switch-cost", "0.5", "--instrument")
+    assert record["algorithm"] == "RR" and record["quantum"] == 2 and record["cpus"] == 2
+    assert record["metrics"]["overhead_time"] > 0
+    assert record["instrumentation"]["counters"]["context_switches"] > 0
+    assert "scheduling" in record["instrumentation"]["phases_ms"]
+
+
+def test_seed_makes_runs_repeatable(capsys):
+    first = _run(capsys, "--generate", "30", "--seed", "9", "--algorithms", "SRTF")
+    assert _run(capsys, "--generate", "30", "--seed", "9", "--algorithms", "SRTF") == first
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["--governor", "ondemand", "--algorithms", "EDF"], "--governor is not supported"),
+    (["--checkpoint-dir", "unused", "--algorithms", "GANG"], "--checkpoint-dir is not supported"),
+    (["--memory-budget", "1", "--checkpoint-dir", "unused"], "--memory-budget is not supported"),
+    (["--workload", "missing.csv"], "missing.csv"),
+    (["--workload", "w.csv", "--generate", "5"], "not allowed with"),
+    (["--algorithms", "NOPE"], "invalid choice"),
+])
+def test_bad_arguments_exit_with_usage(capsys, argv, message):
+    with pytest.raises(SystemExit) as exc:
+        main.main(argv)
+    assert exc.value.code == 2
+    err = capsys.readouterr().err
+    assert err.startswith("usage:") and message in err
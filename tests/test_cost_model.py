@@ -0,0 +1,43 @@
+# tests/test_cost_model.py
+
+import math
+
+import pytest
+
+from metrics import metrics
+from scheduler.cost_model import CostModel
+from scheduler.engine import simulate
+
+
+def test_dispatch_cost_breakdown():
+    model = CostModel(context_switch=1, cache_refill=4, cache_decay=10, migration=2)
+    assert model.dispatch_cost(5, 0, "A", "A", 3, 0) == {"context_switch": 0.0, "cache": 0.0, "migration": 0.0}
+    assert model.dispatch_cost(5, 0, "B", "A", None, None) == {"context_switch": 1, "cache": 4, "migration": 0.0}
+    assert model.dispatch_cost(5, 1, "B", "A", 3, 0) == {"context_switch": 1, "cache": 4, "migration": 2}
+    warm = model.dispatch_cost(13, 0, "B", "A", 3, 0)
+    assert warm["cache"] == pytest.approx(4 * (1 - math.exp(-1)))
+    assert CostModel.from_dict(model.to_dict()).to_dict() == model.to_dict()
+    with pytest.raises(ValueError):
+        CostModel(context_switch=-1)
+    with pytest.raises(ValueError):
+        CostModel(cache_decay=0)
+
+
+def test_engine_charges_overhead_before_the_work():
+    processes = [{"pid": "A", "arrival": 0, "burst": 4}, {"pid": "B", "arrival": 0, "burst": 4}]
+    out = simulate(processes, "RR", quantum=2, cost_model=CostModel(context_switch=1))
+    timeline = [(seg.get("kind", "run"), seg["pid"], seg["start"], seg["finish"]) for seg in out["processes"]]
+    assert timeline == [("overhead", "A", 0, 1), ("run", "A", 1, 3), ("overhead", "B", 3, 4), ("run", "B", 4, 6),
+                        ("overhead", "A", 6, 7), ("run", "A", 7, 9), ("overhead", "B", 9, 10), ("run", "B", 10, 12)]
+    assert out["overhead_time"] == 4
+    m = metrics.compute(out["processes"])
+    assert m["overhead_time"] == 4
+    assert m["cpu_utilization"] == 100.0 and m["effective_cpu_utilization"] == pytest.approx(100 * 8 / 12, abs=0.01)
+
+
+def test_free_model_matches_no_model():
+    processes = [{"pid": f"P{i}", "arrival": i, "burst": 3 + i % 4} for i in range(30)]
+    plain = simulate(processes, "RR", quantum=2, cpus=2)
+    free = simulate(processes, "RR", quantum=2, cpus=2, cost_model=CostModel())
+    assert [q["finish"] for q in free["summary"]] == [q["finish"] for q in plain["summary"]]
+    assert free["overhead_time"] == 0
@@ -0,0 +1,50 @@
+# tests/test_differential.py
+
+import zlib
+
+import pytest
+
+from differential import ENGINES, GENERATORS, POLICIES, check, mismatch, shrink
+from scheduler.srtf import run_srtf
+
+TRIALS = 60
+
+
+def _seed(*parts):
+    return zlib.crc32("/".join(parts).encode("utf-8"))
+
+
+@pytest.mark.parametrize("generator", [g for g in GENERATORS if g != "huge"])
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("policy", POLICIES)
+def test_matches_reference(policy, engine, generator):
+    check(policy, engine, generator, TRIALS, _seed(policy, engine, generator))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("policy", POLICIES)
+def test_matches_reference_at_scale(policy, engine):
+    check(policy, engine, "huge", 1, _seed(policy, engine, "huge"))
+
+
+def test_srtf_zero_bursts_terminate():
+    procs = [{"pid": "P1", "arrival": 0, "burst": 3, "priority": 1},
+             {"pid": "P2", "arrival": 1, "burst": 0, "priority": 1},
+             {"pid": "P3", "arrival": 9, "burst": 0, "priority": 1}]
+    out = {p["pid"]: (p["finish"], p["waiting"]) for p in run_srtf(procs)["processes"]}
+    assert out == {"P1": (3, 0), "P2": (1, 0), "P3": (9, 0)}
+
+
+def test_shrink_finds_minimal_workload():
+    procs = [{"pid": f"P{i}", "arrival": 3 * i + 5, "burst": i + 4, "priority": i % 3 + 1} for i in range(10)]
+    minimal = shrink(procs, lambda ps: any(p["burst"] >= 6 for p in ps))
+    assert minimal == [{"pid": "P1", "arrival": 0, "burst": 6, "priority": 1}]
+
+
+def test_mismatch_reports_difference(monkeypatch):
+    procs = [{"pid": "P1", "arrival": 0, "burst": 2, "priority": 1}]
+    assert mismatch("FCFS", procs, 1) is None
+    engine = ENGINES["engine"]
+    monkeypatch.setitem(ENGINES, "broken",
+                        lambda policy, ps, q: engine(policy, [dict(p, burst=p["burst"] + 1) for p in ps], q))
+    assert "P1" in mismatch("FCFS", procs, 1, "broken")
@@ -0,0 +1,83 @@
+# tests/test_event_queue.py
+
+import heapq
+import random
+
+import pytest
+
+from scheduler.event_queue import HeapQueue, TimingWheel, make_queue, select_queue
+
+
+def _random_ops(queue, rng, steps, span):
+    """
+    Drive `queue` and a plain heapq list with the same random pushes, pops,
+    peeks and cancels, the way the engine does: new events are never
+    earlier than the last popped one. Times repeat often.
+    """
+    reference = []
+    pending = []
+    now = 0
+    seq = 0
+    for _ in range(steps):
+        op = rng.random()
+        if op < 0.45 or not reference:
+            seq += 1
+            t = now + rng.choice((0, 0, rng.randint(0, 3), rng.randint(0, span)))
+            item = (t, rng.randint(0, 2), seq)
+            queue.push(item)
+            heapq.heappush(reference, item)
+            pending.append(item)
+        elif op < 0.75:
+            item = queue.pop()
+            assert item == heapq.heappop(reference)
+            pending.remove(item)
+            now = item[0]
+        elif op < 0.85:
+            assert queue.peek() == reference[0]
+        else:
+            item = pending.pop(rng.randrange(len(pending)))
+            queue.cancel(item)
+            reference.remove(item)
+            heapq.heapify(reference)
+        assert len(queue) == len(reference)
+    assert queue.items() == sorted(reference)
+    while reference:
+        assert queue.pop() == heapq.heappop(reference)
+    assert len(queue) == 0
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("bits, levels, span", [(2, 2, 40), (3, 3, 2000), (12, 3, 10 ** 6)])
+def test_wheel_matches_heapq(seed, bits, levels, span):
+    # small wheels: most pushes land in upper levels or the overflow heap and cascade on the way down
+    _random_ops(TimingWheel(bits=bits, levels=levels), random.Random(seed), 3000, span)
+
+
+def test_heap_queue_matches_heapq():
+    _random_ops(HeapQueue(), random.Random(7), 3000, 100)
+
+
+def test_wheel_accepts_initial_items_and_integral_floats():
+    items = [(5.0, 1), (3, 2), (70, 0), (3, 1)]
+    wheel = TimingWheel(items, bits=2, levels=2)
+    assert [wheel.pop() for _ in items] == sorted(items)
+    with pytest.raises(ValueError):
+        wheel.push((1.5, 0))
+    with pytest.raises(IndexError):
+        wheel.pop()
+
+
+def test_cancel_missing_event_raises():
+    for kind in ("heap", "wheel"):
+        queue = make_queue(kind, [(1, 0), (9, 0)])
+        queue.pop()
+        with pytest.raises(ValueError):
+            queue.cancel((1, 0))
+        queue.cancel((9, 0))
+        assert len(queue) == 0
+
+
+def test_select_queue():
+    assert select_queue(range(100), 100) == "heap"
+    assert select_queue([0, 1 << 22], 1 << 22) == "wheel"
+    assert select_queue([0.5], 1 << 22) == "heap"
@@ -0,0 +1,114 @@
+# tests/test_gang.py
+
+import json
+from collections import Counter, defaultdict
+
+import pytest
+
+import main
+from scheduler.gang import PACKINGS, Matrix, run_gang, run_independent
+
+
+@pytest.mark.parametrize("packing", PACKINGS)
+@pytest.mark.parametrize("fill", [False, True])
+def test_gangs_run_all_threads_together(workload, packing, fill):
+    processes = workload(300, seed=1, gap=6, burst=(1, 20), priority=None, threads=(1, 8))
+    out = run_gang(processes, cpus=8, quantum=3, packing=packing, fill=fill)
+    by_cpu = defaultdict(list)
+    by_slot = defaultdict(set)
+    busy = Counter()
+    for seg in out["processes"]:
+        by_cpu[seg["cpu"]].append((seg["start"], seg["finish"]))
+        by_slot[(seg["pid"], seg["start"])].add((seg["cpu"], seg["finish"]))
+        busy[seg["pid"]] += seg["finish"] - seg["start"]
+    for spans in by_cpu.values():
+        spans.sort()
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:]))
+    threads = {p["pid"]: p["threads"] for p in processes}
+    for (pid, _), cpus in by_slot.items():
+        # every thread of the gang, on distinct CPUs, for the same time
+        assert len(cpus) == threads[pid] and len({f for _, f in cpus}) == 1
+    assert all(busy[p["pid"]] == p["burst"] * p["threads"] for p in processes)
+
+
+def test_single_threads_fill_the_machine():
+    processes = [{"pid": f"P{i}", "arrival": 0, "burst": 4} for i in range(4)]
+    out = run_gang(processes, cpus=4, quantum=2)
+    assert [q["finish"] for q in out["summary"]] == [4] * 4
+    assert out["gang"]["max_rows"] == 1 and out["gang"]["gang_idle"] == 0
+
+
+def test_gang_constraint_idles_cpus():
+    # 3 + 2 threads on 4 CPUs: the two gangs never fit together
+    processes = [{"pid": "A", "arrival": 0, "burst": 4, "threads": 3},
+                 {"pid": "B", "arrival": 0, "burst": 4, "threads": 2}]
+    out = run_gang(processes, cpus=4, quantum=2)
+    assert out["gang"]["max_rows"] == 2
+    assert out["gang"]["fragmentation"] > 0 and out["gang"]["gang_idle"] > 0
+    assert {q["pid"]: q["finish"] for q in out["summary"]} == {"A": 6, "B": 8}
+
+
+def test_fill_runs_other_gangs_in_holes():
+    # rows [A A C C] and [B B B D]; once C is done, D can run in its columns
+    processes = [{"pid": "A", "arrival": 0, "burst": 10, "threads": 2},
+                 {"pid": "B", "arrival": 0, "burst": 10, "threads": 3},
+                 {"pid": "C", "arrival": 0, "burst": 2, "threads": 2},
+                 {"pid": "D", "arrival": 0, "burst": 10, "threads": 1}]
+    plain = run_gang(processes, cpus=4, quantum=2, fill=False, repack=False)
+    filled = run_gang(processes, cpus=4, quantum=2, fill=True, repack=False)
+    assert filled["gang"]["fragmentation"] < plain["gang"]["fragmentation"]
+    assert {q["pid"]: q["finish"] for q in filled["summary"]}["D"] < \
+        {q["pid"]: q["finish"] for q in plain["summary"]}["D"]
+
+
+@pytest.mark.parametrize("packing, row, col", [("first_fit", 0, 2), ("best_fit", 1, 3)])
+def test_matrix_packing(packing, row, col):
+    m = Matrix(4, packing)
+    m.place(0, 2)               # row 0, hole of 2 left
+    m.place(1, 3)               # row 1, hole of 1 left
+    m.place(2, 1)
+    assert m.where[2][0] is m.rows[row] and m.where[2][1] == col
+
+
+def test_matrix_repack_shortens_the_cycle():
+    m = Matrix(4)
+    m.place(0, 3)
+    m.place(1, 3)               # second row
+    m.place(2, 1)               # beside gang 0
+    m.remove(0)
+    assert len(m) == 2
+    assert m.repack() == 1 and len(m) == 1
+    assert m.rows[0] == [1, 1, 1, 2]
+    m.remove(1)
+    m.remove(2)
+    assert len(m) == 0 and m.threads == 0
+
+
+def test_independent_baseline_is_per_process():
+    processes = [{"pid": "A", "arrival": 0, "burst": 4, "threads": 2}]
+    out = run_independent(processes, cpus=2, quantum=2)
+    assert {seg["pid"] for seg in out["processes"] if "pid" in seg} == {"A"}
+
+
+def test_rejects_gangs_wider_than_the_machine():
+    with pytest.raises(ValueError):
+        run_gang([{"pid": "A", "arrival": 0, "burst": 1, "threads": 5}], cpus=4)
+    with pytest.raises(ValueError):
+        Matrix(4, "worst_fit")
+
+
+def test_main_reports_the_independent_baseline(capsys):
+    main.main(["--generate", "100", "--seed", "1", "--threads", "4", "--cpus", "4", "--algorithms", "GANG"])
+    record = json.loads(capsys.readouterr().out)
+    m = record["metrics"]
+    assert record["packing"] == "first_fit"
+    assert 0 <= m["gang_idle"] <= 100 and m["independent_throughput"] > 0
+
+
+def test_workload_file_keeps_threads(workload, tmp_path, capsys):
+    processes = workload(60, seed=2, threads=(1, 4))
+    path = tmp_path / "gangs.jsonl"
+    path.write_text("".join(json.dumps(p) + "\n" for p in processes))
+    main.main(["--workload", str(path), "--cpus", "4", "--algorithms", "GANG"])
+    from_file = json.loads(capsys.readouterr().out)
+    assert from_file["metrics"] == main.run_scheduler("GANG", processes, cpus=4)["metrics"]
@@ -0,0 +1,97 @@
+# tests/test_incremental.py
+
+import random
+import threading
+
+import pytest
+
+from scheduler.engine import simulate
+from scheduler.incremental import IncrementalSimulation
+from scheduler.progress import SimulationCancelled
+
+
+def _outcome(result):
+    per_process = {q["pid"]: (q["start"], q["finish"], q["waiting"]) for q in result["summary"]}
+    timeline = sorted((s["start"], s["finish"], s.get("cpu", 0), s["pid"]) for s in result["processes"])
+    return per_process, timeline
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _cancel(completed, total):
+    raise Cancelled
+
+
+@pytest.mark.parametrize("policy", ["FCFS", "SJF", "SRTF", "RR", "PRIORITY"])
+@pytest.mark.parametrize("cpus", [1, 2])
+def test_edits_match_a_cold_run(workload, policy, cpus):
+    rng = random.Random(7)
+    current = workload(300, seed=1, gap=4)
+    sim = IncrementalSimulation(current, policy, quantum=2, cpus=cpus, max_snapshots=16)
+    resumed = 0
+    for step in range(12):
+        kind = step % 3
+        if kind == 0:
+            new = [{"pid": f"N{step}.{k}", "arrival": rng.randint(0, 1200), "burst": rng.randint(1, 6),
+                    "priority": rng.randint(1, 3)} for k in range(3)]
+            result = sim.add(new)
+            current = current + new
+        elif kind == 1:
+            old = rng.choice(current)
+            new = dict(old, arrival=max(0, old["arrival"] + rng.randint(-20, 20)), burst=rng.randint(1, 9))
+            result = sim.replace(old["pid"], new)
+            # a replacement goes after its equals, as if appended to the input
+            current = [p for p in current if p is not old] + [new]
+        else:
+            old = rng.choice(current)
+            result = sim.remove(old["pid"])
+            current = [p for p in current if p is not old]
+        resumed += sim.resumed_at is not None
+        assert _outcome(result) == _outcome(simulate(current, policy, quantum=2, cpus=cpus))
+        assert len(sim) == len(current)
+    assert resumed > 0
+
+
+def test_cancelled_edit_rolls_back(workload):
+    processes = workload(400, seed=2, gap=4)
+    sim = IncrementalSimulation(processes, "RR", quantum=2, max_snapshots=16)
+    before = _outcome(sim.result())
+    late = {"pid": "X", "arrival": processes[-1]["arrival"] - 50, "burst": 30, "priority": 1}
+    with pytest.raises(Cancelled):
+        sim.add([late], progress=_cancel)
+    with pytest.raises(Cancelled):
+        sim.remove(processes[10]["pid"], progress=_cancel)
+    assert len(sim) == len(processes)
+    assert _outcome(sim.result()) == before
+    # the next edit resumes from the snapshots of the run that was kept
+    result = sim.add([late])
+    assert sim.resumed_at is not None
+    assert _outcome(result) == _outcome(simulate(processes + [late], "RR", quantum=2))
+
+
+def test_cancel_event_stops_a_run_between_completions():
+    # two long jobs sliced by RR: tens of thousands of steps before the first completion
+    processes = [{"pid": "A", "arrival": 0, "burst": 20000}, {"pid": "B", "arrival": 0, "burst": 20000}]
+    cancel = threading.Event()
+    calls = []
+    unset = simulate(processes[:1], "RR", quantum=1, cancel_event=cancel)
+    assert unset["summary"][0]["finish"] == 20000
+    cancel.set()
+    with pytest.raises(SimulationCancelled):
+        simulate(processes, "RR", quantum=1, progress=lambda done, total: calls.append(done), cancel_event=cancel)
+    assert calls == []
+    sim = IncrementalSimulation(processes[:1], "RR", quantum=1)
+    before = _outcome(sim.result())
+    with pytest.raises(SimulationCancelled):
+        sim.add(processes[1:], cancel_event=cancel)
+    assert len(sim) == 1 and _outcome(sim.result()) == before
+
+
+def test_unknown_pid_and_policy():
+    sim = IncrementalSimulation([{"pid": "A", "arrival": 0, "burst": 2}], "FCFS")
+    with pytest.raises(KeyError):
+        sim.remove("B")
+    with pytest.raises(ValueError):
+        IncrementalSimulation([], "NOPE")
@@ -0,0 +1,72 @@
+# tests/test_instrument.py
+
+import main
+from scheduler import instrument
+from scheduler.fcfs import run_fcfs
+from scheduler.roundrobin import run_roundrobin
+from scheduler.srtf import run_srtf
+
+
+def _processes():
+    # P3 arrives after an idle gap
+    return [{"pid": "P1", "arrival": 0, "burst": 5, "priority": 1},
+            {"pid": "P2", "arrival": 1, "burst": 2, "priority": 1},
+            {"pid": "P3", "arrival": 20, "burst": 3, "priority": 1}]
+
+
+def test_counters_of_fcfs():
+    with instrument.instrumented() as probe:
+        run_fcfs(_processes())
+    assert probe.counters["context_switches"] == 3
+    assert probe.counters["idle_gaps"] == 1
+    assert instrument.active is None
+
+
+def test_counters_of_round_robin():
+    with instrument.instrumented() as probe:
+        run_roundrobin(_processes(), quantum=2)
+    c = probe.counters
+    # slices: P1 0-2, P2 2-4, P1 4-6, P1 6-7, idle, P3 20-22, P3 22-23
+    assert c["idle_gaps"] == 1
+    assert c["preemptions"] == 3                # P1 twice, P3 once
+    assert c["context_switches"] == 4           # P1, P2, P1, P3
+    assert c["queue_ops"] == 3 + 6 + 3          # arrivals, dequeues, requeues
+
+
+def test_counters_of_srtf():
+    with instrument.instrumented() as probe:
+        run_srtf(_processes())
+    assert probe.counters["preemptions"] == 1  # P2 (2) preempts P1 (4 left)
+
+
+def test_nesting_restores_the_outer_probe():
+    with instrument.instrumented() as outer:
+        with instrument.instrumented() as inner:
+            run_fcfs(_processes())
+        run_fcfs(_processes())
+        assert instrument.active is outer
+    assert inner.counters["context_switches"] == outer.counters["context_switches"] == 3
+
+
+def test_phases_profile_and_memory():
+    with instrument.instrumented(profile=True, trace_memory=True) as probe:
+        with instrument.phase("scheduling"):
+            run_roundrobin(_processes(), quantum=1)
+    report = probe.report()
+    assert set(report["phases_ms"]) == {"scheduling"}
+    assert "run_roundrobin" in report["profile"]
+    assert report["peak_memory_kb"] >= 0
+    with instrument.phase("metrics"):            # no active probe: a no-op
+        pass
+
+
+def test_disabled_counts_nothing():
+    with instrument.instrumented() as probe:
+        pass
+    run_fcfs(_processes())
+    assert not any(probe.counters.values())
+
+
+def test_run_scheduler_reports_counters():
+    result = main.run_scheduler("RR", _processes(), quantum=2, instrumentation=True)
+    assert result["instrumentation"]["counters"]["preemptions"] == 3
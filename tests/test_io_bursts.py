@@ -0,0 +1,68 @@
+# tests/test_io_bursts.py
+
+import pytest
+
+from metrics import metrics
+from scheduler.engine import simulate
+
+
+def two_on_one_device():
+    return [{"pid": "A", "arrival": 0, "bursts": [2, 5, 1], "devices": [0]},
+            {"pid": "B", "arrival": 0, "bursts": [3, 4, 2], "devices": [0]}]
+
+
+def test_device_queues_fcfs():
+    out = simulate(two_on_one_device(), "FCFS")
+    timeline = [(seg["pid"], seg["start"], seg["finish"]) for seg in out["processes"]]
+    assert timeline == [("A", 0, 2), ("B", 2, 5), ("A", 7, 8), ("B", 11, 13)]
+    # B's I/O is issued at 5 but waits for A's to finish at 7
+    io = [(seg["pid"], seg["device"], seg["start"], seg["finish"]) for seg in out["io_segments"]]
+    assert io == [("A", 0, 2, 7), ("B", 0, 7, 11)]
+
+
+def test_io_time_is_not_waiting():
+    summary = {p["pid"]: p for p in simulate(two_on_one_device(), "FCFS")["summary"]}
+    assert summary["A"]["finish"] == 8 and summary["B"]["finish"] == 13
+    assert summary["A"]["io_time"] == 5 and summary["B"]["io_time"] == 6    # B queues for 2
+    assert summary["A"]["waiting"] == 0 and summary["B"]["waiting"] == 2
+    assert summary["B"]["turnaround"] == summary["B"]["burst"] + summary["B"]["waiting"] + summary["B"]["io_time"]
+
+
+def test_io_utilization_and_overlap():
+    out = simulate(two_on_one_device(), "FCFS")
+    m = metrics.io_utilization(out["processes"], out["io_segments"], num_devices=2)
+    # device 0 busy 2..11 of 0..13; a CPU and the device both busy 2..5 and 7..8
+    assert m["device_utilization"] == {0: pytest.approx(100 * 9 / 13, abs=0.01), 1: 0.0}
+    assert m["io_overlap"] == pytest.approx(100 * 4 / 13, abs=0.01)
+    assert m["average_io_time"] == 5.5
+
+
+def test_devices_run_in_parallel():
+    processes = two_on_one_device()
+    processes[1]["devices"] = [1]
+    out = simulate(processes, "FCFS")
+    assert [(seg["pid"], seg["start"]) for seg in out["io_segments"]] == [("A", 2), ("B", 5)]
+    assert out["summary"][1]["io_time"] == 4 and out["summary"][1]["finish"] == 11
+
+
+def test_single_burst_is_unchanged():
+    plain = [{"pid": "A", "arrival": 0, "burst": 3}, {"pid": "B", "arrival": 1, "burst": 2}]
+    bursty = [dict(p, bursts=[p["burst"]]) for p in plain]
+    a, b = simulate(plain, "RR", quantum=2), simulate(bursty, "RR", quantum=2)
+    assert [(s["pid"], s["start"], s["finish"]) for s in a["processes"]] == \
+           [(s["pid"], s["start"], s["finish"]) for s in b["processes"]]
+    assert "io_segments" not in b
+
+
+@pytest.mark.parametrize("process", [
+    {"pid": "A", "bursts": [2, 5]},
+    {"pid": "A", "bursts": [2, 5, 1], "devices": [0, 1]},
+])
+def test_malformed_bursts_are_rejected(process):
+    with pytest.raises(ValueError):
+        simulate([process], "FCFS")
+
+
+def test_device_index_out_of_range():
+    with pytest.raises(ValueError):
+        simulate(two_on_one_device(), "FCFS", devices=0)
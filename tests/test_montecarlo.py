@@ -0,0 +1,44 @@
+# tests/test_montecarlo.py
+
+import pytest
+
+from experiments.montecarlo import compare, run_replication
+from metrics.accumulators import RunningStats
+
+
+def test_each_comparison_stops_at_the_target():
+    algorithms = ["FCFS", "SJF", "RR"]
+    report = compare(algorithms, target=2.0, min_reps=5, num_processes=15)
+    samples = [run_replication(algorithms, seed, 15) for seed in range(report["replications"])]
+    assert report["replications"] == max(c["n"] for c in report["comparisons"]) < 10000
+    for c in report["comparisons"]:
+        assert c["resolved"] and c["half_width"] < 2.0
+        # replay the paired differences: the comparison closed at the first n past min_reps under the target
+        stats = RunningStats()
+        for k, sample in enumerate(samples[:c["n"]], 1):
+            stats.push(sample[c["a"]][c["metric"]] - sample[c["b"]][c["metric"]])
+            if k < c["n"]:
+                assert k < 5 or stats.half_width(0.95) >= 2.0
+        assert stats.mean == pytest.approx(c["mean_diff"])
+        assert stats.half_width(0.95) == pytest.approx(c["half_width"])
+    # an algorithm is run until its last comparison closes
+    for a, per_metric in report["per_algorithm"].items():
+        last = max(c["n"] for c in report["comparisons"] if a in (c["a"], c["b"]))
+        assert all(s["n"] == last for s in per_metric.values())
+
+
+def test_unreachable_target_stops_at_max_reps():
+    seen = []
+    report = compare(["FCFS", "SJF"], target=0, max_reps=12,
+                     progress=lambda done, total: seen.append((done, total)))
+    assert report["replications"] == 12 and seen[-1] == (12, 12)
+    assert not any(c["resolved"] for c in report["comparisons"])
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        compare(["FCFS", "NOPE"])
+    with pytest.raises(ValueError):
+        compare(["FCFS"])
+    with pytest.raises(ValueError):
+        compare(["FCFS", "SJF"], min_reps=1)
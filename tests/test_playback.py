@@ -0,0 +1,47 @@
+# tests/test_playback.py
+
+import random
+
+from scheduler.engine import simulate
+from visualization import playback
+from visualization.playback import ScheduleTimeline
+
+
+def _state(timeline):
+    return timeline.committed, sorted(timeline.running()), timeline.ready()
+
+
+def _replayed(processes, t):
+    """The timeline state at t, replayed linearly from the start."""
+    fresh = ScheduleTimeline(processes)
+    fresh._apply(sum(1 for time in fresh.times if time <= t))
+    return _state(fresh)
+
+
+def test_random_seeks_match_linear_replay(workload, monkeypatch):
+    monkeypatch.setattr(playback, "SNAPSHOT_EVERY", 64)        # many snapshots on a small schedule
+    segments = simulate(workload(400, seed=1, gap=5), "RR", quantum=2, cpus=2)["processes"]
+    timeline = ScheduleTimeline(segments)
+    assert len(timeline.snapshots) > 10
+    rng = random.Random(2)
+    for _ in range(150):
+        t = rng.uniform(timeline.t_start - 5, timeline.t_end + 5)
+        if rng.random() < 0.3:
+            t = rng.choice(timeline.times)          # exactly on an event
+        timeline.seek(t)
+        assert _state(timeline) == _replayed(segments, t)
+
+
+def test_state_at_known_times():
+    processes = [{"pid": "A", "arrival_time": 0, "start": 0, "finish": 4},
+                 {"pid": "B", "arrival_time": 1, "start": 4, "finish": 6},
+                 {"pid": "C", "arrival_time": 2, "start": 6, "finish": 7}]
+    timeline = ScheduleTimeline(processes)
+    timeline.seek(3)
+    assert timeline.running() == ["A"] and timeline.ready() == ["B", "C"] and timeline.committed == 0
+    timeline.seek(4)
+    assert timeline.running() == ["B"] and timeline.ready() == ["C"] and timeline.committed == 1
+    timeline.seek(0.5)
+    assert timeline.running() == ["A"] and timeline.ready() == []
+    timeline.seek(100)
+    assert timeline.running() == [] and timeline.ready() == [] and timeline.committed == 3
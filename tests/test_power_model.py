@@ -0,0 +1,70 @@
+# tests/test_power_model.py
+
+import pytest
+
+from metrics import metrics
+from scheduler import checkpoint
+from scheduler.engine import POLICIES, Engine, simulate
+from scheduler.power_model import CState, OndemandGovernor, PState, PowerModel
+
+PSTATES = (PState(1.0, 1.0), PState(2.0, 4.0))
+CSTATES = (CState("C0", 0.5, 0.0, 0.0, 0.0), CState("C6", 0.1, 0.5, 1.0, 3.0))
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_performance_without_wakeup_matches_plain_engine(workload, policy):
+    processes = workload(300, seed=1, gap=10)
+    model = PowerModel(PSTATES, CSTATES[:1], governor="performance")
+    plain = simulate(processes, policy, quantum=2)
+    powered = simulate(processes, policy, quantum=2, power_model=model)
+    assert [(q["pid"], q["finish"], q["waiting"]) for q in powered["summary"]] == \
+        [(q["pid"], q["finish"], q["waiting"]) for q in plain["summary"]]
+
+
+def test_powersave_stretches_bursts_without_counting_waiting():
+    model = PowerModel(PSTATES, CSTATES, governor="powersave")
+    out = simulate([{"pid": "P1", "arrival": 0, "burst": 4}], "FCFS", power_model=model)
+    (q,) = out["summary"]
+    assert q["finish"] == 8 and q["waiting"] == 0
+    assert q["energy"] == out["energy"]["active"] == 8.0
+    assert metrics.compute(out["processes"])["average_waiting_time"] == 0
+
+
+def test_idle_energy_and_wakeup_latency():
+    model = PowerModel(PSTATES, CSTATES, governor="performance")
+    out = simulate([{"pid": "P1", "arrival": 0, "burst": 2}, {"pid": "P2", "arrival": 10, "burst": 2}],
+                   "FCFS", power_model=model)
+    # idle 2 -> 10 in C6: 0.5 entry at C0 power, the rest at C6 power; P2 waits for the exit latency
+    assert out["energy"]["idle"] == pytest.approx(0.5 * 0.5 + 7.5 * 0.1)
+    p2 = out["summary"][1]
+    assert p2["start"] == 11 and p2["finish"] == 13
+    assert [s["wakeup"] for s in out["processes"] if s.get("kind") == "overhead"] == [1.0]
+
+
+def test_energy_metrics_add_up(workload):
+    processes = workload(400, seed=2, gap=10)
+    model = PowerModel(governor="ondemand")
+    out = simulate(processes, "RR", quantum=2, cpus=2, power_model=model)
+    assert sum(q["energy"] for q in out["summary"]) == pytest.approx(out["energy"]["active"])
+    m = metrics.compute(out["processes"], num_cpus=2, idle_energy=out["energy"]["idle"])
+    assert m["total_energy"] == pytest.approx(out["energy"]["total"], abs=1e-3)
+    assert m["energy_per_process"] == pytest.approx(out["energy"]["total"] / len(processes), abs=1e-3)
+    assert m["energy_delay_product"] == pytest.approx(m["energy_per_process"] * m["average_turnaround_time"],
+                                                      rel=1e-3)
+
+
+def test_ondemand_scales_with_utilization():
+    governor = OndemandGovernor(up_threshold=0.8)
+    picks = [governor.select(PSTATES, u / 10) for u in range(11)]
+    assert picks == sorted(picks) and picks[0] == 0 and picks[-1] == 1
+
+
+def test_checkpoint_resume_keeps_power_state(workload):
+    processes = workload(200, seed=3, gap=10)
+    model = PowerModel(governor="ondemand")
+    full = simulate(processes, "SRTF", cpus=2, power_model=model)
+    engine = Engine(processes, "SRTF", cpus=2, power_model=model)
+    while engine.completed < 100:
+        engine.step()
+    resumed = Engine.from_state(checkpoint.loads(checkpoint.dumps(engine.state()))).run()
+    assert resumed == full
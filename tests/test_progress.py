@@ -0,0 +1,65 @@
+# tests/test_progress.py
+
+import threading
+
+import pytest
+
+from scheduler.fcfs import run_fcfs
+from scheduler.priority import run_priority
+from scheduler.progress import SimulationCancelled, make_progress
+from scheduler.roundrobin import run_roundrobin
+from scheduler.sjf import run_sjf
+from scheduler.srtf import run_srtf
+
+RUNNERS = {
+    "FCFS": run_fcfs,
+    "SJF": run_sjf,
+    "SRTF": run_srtf,
+    "RR": lambda procs, progress=None: run_roundrobin(procs, quantum=2, progress=progress),
+    "PRIORITY": run_priority,
+}
+
+
+@pytest.mark.parametrize("name", RUNNERS)
+def test_progress_counts_each_completion(workload, name):
+    processes = workload(60, seed=1, burst=(1, 8), priority=(1, 4), shuffle=True)
+    seen = []
+    with_progress = RUNNERS[name]([dict(p) for p in processes],
+                                  progress=lambda done, total: seen.append((done, total)))
+    assert seen == [(k, 60) for k in range(1, 61)]
+    assert with_progress == RUNNERS[name]([dict(p) for p in processes])
+
+
+@pytest.mark.parametrize("name", RUNNERS)
+def test_cancel_propagates_from_the_callback(workload, name):
+    seen = []
+
+    def progress(done, total):
+        seen.append(done)
+        if done == 5:
+            raise SimulationCancelled()
+
+    with pytest.raises(SimulationCancelled):
+        RUNNERS[name](workload(60, seed=2), progress=progress)
+    assert seen == [1, 2, 3, 4, 5]
+
+
+def test_make_progress_maps_and_throttles():
+    reported = []
+    callback = make_progress(reported.append, offset=0.5, scale=0.5, step=0.1)
+    for done in range(1, 1001):
+        callback(done, 1000)
+    assert reported[0] == pytest.approx(0.5005) and reported[-1] == 1.0
+    assert len(reported) == 6
+    assert all(b - a >= 0.1 - 1e-12 for a, b in zip(reported, reported[1:-1]))
+
+
+def test_make_progress_raises_once_cancelled():
+    cancel = threading.Event()
+    reported = []
+    callback = make_progress(reported.append, cancel)
+    callback(1, 4)
+    cancel.set()
+    with pytest.raises(SimulationCancelled):
+        callback(2, 4)
+    assert reported == [0.25]
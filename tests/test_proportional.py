@@ -0,0 +1,78 @@
+# tests/test_proportional.py
+
+import random
+
+import pytest
+
+from scheduler import instrument
+from scheduler.lottery import FenwickTree, run_lottery
+from scheduler.stride import run_stride
+
+RUNNERS = {"stride": run_stride, "lottery": lambda procs, **kw: run_lottery(procs, seed=3, **kw)}
+
+
+def _competing(tickets, burst=3000):
+    return [{"pid": f"P{i}", "arrival": 0, "burst": burst, "tickets": t} for i, t in enumerate(tickets)]
+
+
+def test_fenwick_tree_matches_prefix_sums():
+    rng = random.Random(1)
+    for n in (1, 2, 7, 64, 100):
+        tree = FenwickTree(n)
+        weights = [0] * n
+        for _ in range(300):
+            i = rng.randrange(n)
+            delta = rng.randint(-weights[i], 9)
+            tree.add(i, delta)
+            weights[i] += delta
+            assert tree.total == sum(weights)
+            if tree.total:
+                r = rng.randrange(tree.total)
+                acc = 0
+                for j, w in enumerate(weights):
+                    acc += w
+                    if acc > r:
+                        break
+                assert tree.find(r) == j
+
+
+def _received(out, lo, hi):
+    """CPU time each pid got in [lo, hi)."""
+    got = {}
+    for seg in out["processes"]:
+        got[seg["pid"]] = got.get(seg["pid"], 0) + max(0, min(hi, seg["finish"]) - max(lo, seg["start"]))
+    return got
+
+
+def test_stride_shares_are_proportional():
+    out = run_stride(_competing([100, 200, 300]), quantum=1)
+    got = _received(out, 0, 600)
+    assert all(abs(got[pid] - want) <= 2 for pid, want in (("P0", 100), ("P1", 200), ("P2", 300)))
+    # stride keeps each process within a few quanta of its fluid share
+    assert out["shares"]["max_abs_deviation"] <= 3
+
+
+def test_lottery_shares_converge():
+    out = run_lottery(_competing([100, 300]), quantum=1, seed=5)
+    got = _received(out, 0, 4000)
+    assert abs(got["P1"] - 3000) < 150
+    assert out["shares"]["mean_abs_deviation"] < 100
+
+
+@pytest.mark.parametrize("kind, slack", [("stride", 2), ("lottery", 150)])
+def test_ticket_changes_take_effect(kind, slack):
+    out = RUNNERS[kind](_competing([100, 300], burst=10000), quantum=1, ticket_changes=[(1000, "P0", 300)])
+    before = _received(out, 0, 1000)
+    after = _received(out, 1000, 3000)
+    assert abs(before["P0"] - 250) <= slack
+    assert abs(after["P0"] - 1000) <= slack
+    assert out["shares"]["per_process"]["P0"]["tickets"] == 300
+
+
+@pytest.mark.parametrize("kind", RUNNERS)
+def test_one_queue_op_per_pick(kind):
+    with instrument.instrumented() as probe:
+        out = RUNNERS[kind](_competing([100, 50, 25], burst=200), quantum=2)
+    slices = 3 * 200 // 2
+    assert probe.counters["queue_ops"] == slices
+    assert probe.counters["context_switches"] == len(out["processes"])
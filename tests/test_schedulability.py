@@ -0,0 +1,77 @@
+# tests/test_schedulability.py
+
+import json
+import math
+import random
+
+import pytest
+
+import main
+from process_generator import generate_periodic_tasks
+from scheduler import schedulability
+from scheduler.schedulability import response_times
+
+
+def _simulated_response_times(tasks):
+    """Worst response of each task under preemptive RM, unit steps over three hyperperiods."""
+    order = sorted(range(len(tasks)), key=lambda i: tasks[i][2])
+    h = 1
+    for _, _, t, _ in tasks:
+        h = h * t // math.gcd(h, t)
+    pending = [[] for _ in tasks]
+    worst = [0] * len(tasks)
+    for now in range(3 * h):
+        for i, (_, c, t, _) in enumerate(tasks):
+            if now % t == 0:
+                pending[i].append([now, c])
+        for i in order:
+            if pending[i]:
+                pending[i][0][1] -= 1
+                if not pending[i][0][1]:
+                    worst[i] = max(worst[i], now + 1 - pending[i].pop(0)[0])
+                break
+    return worst
+
+
+def test_response_times_match_simulation():
+    rng = random.Random(1)
+    for _ in range(200):
+        tasks = [(f"T{k}", rng.randint(1, 6), rng.choice((4, 5, 6, 8, 10, 12, 15)), 10 ** 6)
+                 for k in range(rng.randint(1, 4))]
+        if sum(c / t for _, c, t, _ in tasks) <= 1:
+            assert response_times(tasks) == _simulated_response_times(tasks)
+
+
+def test_arbitrary_deadlines_use_the_busy_period():
+    # Lehoczky's example: the first job of B responds in 114, the sixth in 118
+    tasks = [("A", 26, 70, 70), ("B", 62, 100, 118)]
+    assert response_times(tasks) == [26, 118]
+    tasks[1] = ("B", 62, 100, 115)
+    assert response_times(tasks) == [26, None]
+    processes = [{"pid": pid, "arrival": 0, "burst": c, "period": t, "deadline": d} for pid, c, t, d in tasks]
+    assert schedulability.rm_test(processes)["schedulable"] is False
+
+
+def test_duplicate_pids_are_reported_per_task():
+    processes = [{"pid": "T", "arrival": 0, "burst": 1, "period": 4, "deadline": 2},
+                 {"pid": "T", "arrival": 0, "burst": 3, "period": 8, "deadline": 3}]
+    report = schedulability.rm_test(processes)
+    assert report["response_times"] == [["T", 1], ["T", None]]
+    assert report["schedulable"] is False
+
+
+def test_workload_file_keeps_periods(tmp_path, capsys):
+    tasks = generate_periodic_tasks(5, 0.8, seed=4, constrained=True)
+    path = tmp_path / "tasks.jsonl"
+    path.write_text("".join(json.dumps(t) + "\n" for t in tasks))
+    main.main(["--workload", str(path), "--algorithms", "EDF"])
+    from_file = json.loads(capsys.readouterr().out)
+    assert from_file["metrics"] == main.run_scheduler("EDF", tasks)["metrics"]
+    assert "deadline_miss_ratio" in from_file["metrics"]
+
+
+@pytest.mark.parametrize("num_tasks, utilization", [(1, 1.05), (3, 2.5)])
+def test_constrained_deadlines_of_overloaded_task_sets(num_tasks, utilization):
+    for seed in range(20):
+        for task in generate_periodic_tasks(num_tasks, utilization, seed=seed, constrained=True):
+            assert min(task["burst"], task["period"]) <= task["deadline"] <= task["period"]
@@ -0,0 +1,63 @@
+# tests/test_segment_store.py
+
+import os
+
+import pytest
+
+from metrics import metrics
+from process_generator import generate_processes
+from scheduler.engine import simulate
+from scheduler.roundrobin import run_roundrobin
+from scheduler.segment_store import SegmentStore
+
+
+def test_spills_over_budget_and_reads_back_in_order(tmp_path):
+    segs = [{"pid": f"P{i % 7}", "start": i, "finish": i + 1} for i in range(1000)]
+    with SegmentStore(memory_budget=0, chunk_size=64, spill_dir=str(tmp_path)) as store:
+        store.extend(segs)
+        stats = store.stats()
+        assert stats["spilled_segments"] == 960 and stats["resident_chunks"] == 0
+        assert len(store) == 1000
+        assert list(store) == segs
+        assert list(store) == segs          # iterable more than once
+        path = store.path
+        assert os.path.dirname(path) == str(tmp_path)
+    assert not os.path.exists(path)
+
+
+def test_budget_keeps_newest_chunks_resident():
+    store = SegmentStore(memory_budget=10 ** 9, chunk_size=8)
+    store.extend({"pid": "P1", "start": i, "finish": i + 1} for i in range(100))
+    assert store.stats()["spilled_chunks"] == 0 and store.path is None
+    assert [s["start"] for s in store] == list(range(100))
+
+
+def test_roundrobin_with_budget_matches_lists(tmp_path):
+    processes = generate_processes(num_processes=2000, seed=11)
+    plain = run_roundrobin([dict(p) for p in processes], quantum=1)["processes"]
+    store = run_roundrobin([dict(p) for p in processes], quantum=1, memory_budget=0,
+                           spill_dir=str(tmp_path))["processes"]
+    try:
+        assert store.stats()["spilled_chunks"] > 0
+        assert list(store) == plain
+        assert metrics.compute(store) == metrics.compute(plain)
+    finally:
+        store.close()
+
+
+def test_io_metrics_with_budget_match_lists(tmp_path):
+    processes = generate_processes(num_processes=2000, seed=1, io_bursts=3)
+    plain = simulate(processes, "RR", quantum=2)
+    spilled = simulate(processes, "RR", quantum=2, memory_budget=0, spill_dir=str(tmp_path))
+    try:
+        assert spilled["processes"].stats()["spilled_chunks"] > 0
+        assert metrics.compute(spilled["processes"]) == metrics.compute(plain["processes"])
+        assert metrics.compute(plain["processes"])["average_waiting_time"] == \
+            round(sum(q["waiting"] for q in plain["summary"]) / len(processes), 3)
+    finally:
+        spilled["processes"].close()
+
+
+def test_rejects_negative_budget():
+    with pytest.raises(ValueError):
+        SegmentStore(memory_budget=-1)
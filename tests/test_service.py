@@ -0,0 +1,114 @@
+# tests/test_service.py
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from service.server import SimulationServer, SimulationService, normalize_request, request_key
+
+
+def _serve(client, **options):
+    """Run `client(host, port)` against a server on an ephemeral localhost port."""
+    async def go():
+        server = SimulationServer(SimulationService(workers=2, **options))
+        host, port = await server.start("127.0.0.1", 0)
+        try:
+            return await asyncio.wait_for(client(host, port), timeout=60)
+        finally:
+            await server.close()
+    return asyncio.run(go())
+
+
+async def _request(host, port, method, path, body=None):
+    """(status, headers, body) of one request, reading the response to EOF."""
+    reader, writer = await asyncio.open_connection(host, port)
+    data = b"" if body is None else json.dumps(body).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n"
+                 .encode("latin-1") + data)
+    await writer.drain()
+    raw = await reader.read()           # EOF only once every copy of the socket is closed
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:])}
+    return int(lines[0].split()[1]), headers, payload
+
+
+def _dechunk(payload):
+    out = b""
+    while True:
+        size, _, payload = payload.partition(b"\r\n")
+        size = int(size, 16)
+        if not size:
+            return out
+        out += payload[:size]
+        payload = payload[size + 2:]
+
+
+def test_health():
+    async def client(host, port):
+        return await _request(host, port, "GET", "/health")
+    status, _, body = _serve(client)
+    assert status == 200 and json.loads(body)["status"] == "ok"
+
+
+def test_simulate_one_reads_to_eof():
+    async def client(host, port):
+        # twice: the second request runs on workers started while serving the first
+        first = await _request(host, port, "POST", "/simulate", {"algorithm": "RR", "generate": 30, "seed": 1})
+        second = await _request(host, port, "POST", "/simulate", {"algorithm": "FCFS", "generate": 30, "seed": 1})
+        return first, second
+    for status, headers, body in _serve(client):
+        assert status == 200 and headers["content-type"] == "application/x-ndjson"
+        record = json.loads(body)
+        assert record["index"] == 0 and record["num_processes"] == 30 and "metrics" in record
+
+
+def test_chunked_sweep():
+    sweep = [{"algorithm": a, "generate": 40, "seed": 2} for a in ("FCFS", "SJF", "RR")]
+    sweep.append({"algorithm": "NOPE", "generate": 1})
+
+    async def client(host, port):
+        return await _request(host, port, "POST", "/simulate", sweep)
+    status, headers, body = _serve(client)
+    assert status == 200 and headers["transfer-encoding"] == "chunked"
+    records = {r["index"]: r for r in map(json.loads, _dechunk(body).splitlines())}
+    assert sorted(records) == [0, 1, 2, 3]
+    assert [records[i]["algorithm"] for i in range(3)] == ["FCFS", "SJF", "RR"]
+    assert "error" in records[3]
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("GET", "/nowhere", None, 404),
+    ("GET", "/simulate", None, 405),
+    ("POST", "/simulate", {"algorithm": "RR"}, 400),
+])
+def test_errors(method, path, body, status):
+    async def client(host, port):
+        return await _request(host, port, method, path, body)
+    assert _serve(client)[0] == status
+
+
+@pytest.mark.parametrize("req, coalesced", [
+    ({"algorithm": "RR", "generate": 30, "seed": 1}, 1),
+    ({"algorithm": "RR", "generate": 30}, 0),
+    ({"algorithm": "LOTTERY", "processes": [{"pid": "A", "burst_time": 4}]}, 0),
+    ({"algorithm": "FCFS", "processes": [{"pid": "A", "burst_time": 4}]}, 1),
+])
+def test_only_deterministic_requests_coalesce(req, coalesced):
+    spec = normalize_request(req)
+    assert (request_key(spec) is not None) == bool(coalesced)
+
+    async def go():
+        with ThreadPoolExecutor(1) as pool:
+            service = SimulationService(workers=1, executor=pool)
+            await service.start()
+            try:
+                await asyncio.gather(service.submit(spec), service.submit(spec))
+            finally:
+                await service.close()
+            return service.counters
+    counters = asyncio.run(go())
+    assert counters["requests"] == 2 and counters["coalesced"] == coalesced
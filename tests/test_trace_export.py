@@ -0,0 +1,90 @@
+# tests/test_trace_export.py
+
+import io
+import json
+
+from scheduler.cost_model import CostModel
+from scheduler.engine import simulate
+from visualization.trace_export import export_chrome_trace, export_perfetto_trace, export_trace
+
+
+def _schedule():
+    processes = [{"pid": "P1", "arrival": 0, "burst": 4}, {"pid": "P2", "arrival": 1, "burst": 3, "is_rogue": True},
+                 {"pid": "P3", "arrival": 2, "burst": 2, "throttled": True, "terminated": True}]
+    return simulate(processes, "RR", quantum=2, cpus=2, cost_model=CostModel(context_switch=0.5))["processes"]
+
+
+def _fields(data):
+    """(field number, value) pairs of one protobuf message (varint and length-delimited fields)."""
+    pos = 0
+    out = []
+    while pos < len(data):
+        key, pos = _varint(data, pos)
+        if key & 7 == 0:
+            value, pos = _varint(data, pos)
+        else:
+            size, pos = _varint(data, pos)
+            value, pos = data[pos:pos + size], pos + size
+        out.append((key >> 3, value))
+    return out
+
+
+def _varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        shift += 7
+        if not b & 0x80:
+            return n, pos
+
+
+def test_chrome_trace():
+    segments = _schedule()
+    assert any(seg.get("kind") == "overhead" for seg in segments)
+    buf = io.StringIO()
+    count = export_chrome_trace(iter(segments), buf, time_unit_us=10)     # a generator is streamed
+    events = json.loads(buf.getvalue())["traceEvents"]
+    assert len(events) == count
+    tracks = {e["tid"] for e in events if e["ph"] == "M"}
+    assert tracks == {seg.get("cpu", 0) for seg in segments} == {0, 1}
+    slices = sorted((e["name"], e["tid"], e["ts"], e["dur"]) for e in events if e["ph"] == "X")
+    expected = sorted(("overhead" if seg.get("kind") == "overhead" else seg["pid"], seg["cpu"], seg["start"] * 10,
+                       (seg["finish"] - seg["start"]) * 10) for seg in segments)
+    assert slices == expected
+    instants = sorted((e["name"], e["args"]["pid"]) for e in events if e["ph"] == "i")
+    assert instants == [("rogue", "P2"), ("terminate", "P3"), ("throttle", "P3")]
+
+
+def test_perfetto_trace():
+    segments = _schedule()
+    buf = io.BytesIO()
+    count = export_perfetto_trace(segments, buf, time_unit_ns=1000)
+    packets = [dict(_fields(body)) for field, body in _fields(buf.getvalue()) if field == 1]
+    assert len(packets) == count
+    assert all(p[10] == 1 for p in packets)             # one trusted sequence
+    tracks = {dict(_fields(p[60]))[1]: dict(_fields(p[60]))[2].decode() for p in packets if 60 in p}
+    assert sorted(tracks.values()) == ["CPU 0", "CPU 1"]
+    open_slices = {}
+    slices = []
+    for p in packets:
+        if 11 not in p:
+            continue
+        te = dict(_fields(p[11]))
+        if te[9] == 1:
+            open_slices[te[11]] = (te[23].decode(), p[8])
+        elif te[9] == 2:
+            name, start = open_slices.pop(te[11])
+            slices.append((name, tracks[te[11]], start, p[8]))
+    assert not open_slices
+    expected = [("overhead" if seg.get("kind") == "overhead" else seg["pid"], f"CPU {seg['cpu']}",
+                 int(seg["start"] * 1000), int(seg["finish"] * 1000)) for seg in segments]
+    assert sorted(slices) == sorted(expected)
+
+
+def test_format_from_extension(tmp_path):
+    segments = _schedule()
+    assert export_trace(segments, tmp_path / "t.json") == export_chrome_trace(segments, io.StringIO())
+    assert export_trace(segments, tmp_path / "t.pftrace") == export_perfetto_trace(segments, io.BytesIO())
+    assert (tmp_path / "t.pftrace").read_bytes()[:1] == b"\x0a"       # Trace.packet, length-delimited
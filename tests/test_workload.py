@@ -0,0 +1,124 @@
+# tests/test_workload.py
+
+import csv
+import json
+import random
+
+import pytest
+
+import main
+from process_generator import generate_batch_jobs, generate_periodic_tasks, generate_processes
+from workload.columnar import Workload
+from workload.loader import load_binary, load_workload, save_binary
+
+
+def _write_jsonl(path, processes):
+    path.write_text("".join(json.dumps(p) + "\n" for p in processes))
+    return str(path)
+
+
+def _sample():
+    rng = random.Random(5)
+    return Workload.from_dicts([{"pid": f"P{i + 1}", "arrival": rng.randint(0, 900), "burst": rng.randint(1, 10),
+                                 "priority": rng.randint(1, 5)} for i in range(300)])
+
+
+def test_formats_round_trip(tmp_path):
+    w = _sample()
+    dicts = w.to_dicts()
+    save_binary(w, str(tmp_path / "w.bin"))
+    with open(tmp_path / "w.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["pid", "arrival_time", "burst_time", "priority"])
+        writer.writerows(w.row(i) for i in range(len(w)))
+    _write_jsonl(tmp_path / "w.jsonl", dicts)
+    for name in ("w.csv", "w.jsonl"):
+        assert load_workload(str(tmp_path / name)).to_dicts() == dicts
+    # binary traces carry no pids: they are renumbered P1..Pn, as generated
+    assert load_workload(str(tmp_path / "w.bin")).to_dicts() == dicts
+    assert Workload.from_dicts(dicts).to_dicts() == dicts
+
+
+def test_headerless_csv_and_progress(tmp_path):
+    path = tmp_path / "w.csv"
+    path.write_text("".join(f"{i},{i % 7},{i % 3 + 1}\n" for i in range(10000)))
+    seen = []
+    w = load_workload(str(path), progress=lambda done, total: seen.append((done, total)))
+    assert len(w) == 10000 and w.row(9) == ("P10", 9, 2, 1)
+    assert seen[-1][0] == seen[-1][1] == path.stat().st_size
+    assert [d for d, _ in seen] == sorted(d for d, _ in seen)
+
+
+@pytest.mark.parametrize("name, text, line", [
+    ("bad.csv", "pid,arrival,burst\nA,0,3\nB,x,3\n", ":3:"),
+    ("short.csv", "pid,arrival,burst\nA,0\n", ":2:"),
+    ("noburst.csv", "pid,arrival\nA,0\n", "arrival and burst"),
+    ("bad.jsonl", '{"arrival": 0, "burst": 1}\n{"arrival": 0}\n', ":2:"),
+    ("text.jsonl", "not json\n", ":1:"),
+    ("list.jsonl", '{"arrival": 0, "burst": 1, "bursts": "x y"}\n', ":1:"),
+    ("w.txt", "", "Unsupported"),
+])
+def test_malformed_rows_are_reported(tmp_path, name, text, line):
+    path = tmp_path / name
+    path.write_text(text)
+    with pytest.raises(ValueError, match=line):
+        load_workload(str(path))
+
+
+def test_truncated_binary(tmp_path):
+    save_binary(_sample(), str(tmp_path / "w.bin"))
+    data = (tmp_path / "w.bin").read_bytes()
+    (tmp_path / "cut.bin").write_bytes(data[:-8])
+    with pytest.raises(ValueError, match="truncated"):
+        load_binary(str(tmp_path / "cut.bin"))
+    (tmp_path / "magic.bin").write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="CPUW"):
+        load_binary(str(tmp_path / "magic.bin"))
+
+
+def test_optional_fields_survive_jsonl(tmp_path):
+    processes = (generate_periodic_tasks(4, 0.6, seed=1)
+                 + generate_processes(num_processes=5, seed=1, io_bursts=2, threads=3))
+    dicts = load_workload(_write_jsonl(tmp_path / "w.jsonl", processes)).to_dicts()
+    for p, q in zip(processes, dicts):
+        assert {k: v for k, v in q.items() if k not in ("arrival_time", "burst_time")} == \
+            {k: v for k, v in p.items() if k not in ("arrival", "burst")}
+    assert "period" not in dicts[-1] and "bursts" not in dicts[0]
+
+
+def test_optional_fields_in_csv(tmp_path):
+    path = tmp_path / "w.csv"
+    path.write_text("pid,arrival,bursts,devices,tickets,deadline\n"
+                    "A,0,3 5 2,1,10,7.5\n"
+                    "B,1,4,,,\n")
+    a, b = load_workload(str(path)).to_dicts()
+    assert a == {"pid": "A", "arrival_time": 0, "burst_time": 5, "priority": 1,
+                 "bursts": [3, 5, 2], "devices": [1], "tickets": 10, "deadline": 7.5}
+    assert b == {"pid": "B", "arrival_time": 1, "burst_time": 4, "priority": 1, "bursts": [4]}
+
+
+def test_copy_and_from_dicts_keep_optional_fields():
+    w = Workload.from_dicts(generate_batch_jobs(10, cpus=8, seed=2))
+    assert set(w.extra) == {"cpus", "estimate"}
+    copy = w.copy()
+    copy.extra["cpus"][0] = 99
+    assert w.extra["cpus"][0] != 99
+    assert Workload.from_dicts(w.to_dicts()).to_dicts() == w.to_dicts()
+    with pytest.raises(ValueError):
+        w.append("X", 0, 1, colour="red")
+    with pytest.raises(ValueError):
+        save_binary(w, "unused.bin")
+
+
+def test_cli_runs_a_multi_cpu_csv(tmp_path, capsys):
+    jobs = generate_batch_jobs(150, cpus=8, load=0.9, seed=3)
+    path = tmp_path / "jobs.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, ["pid", "arrival", "burst", "priority", "cpus", "estimate"])
+        writer.writeheader()
+        writer.writerows(jobs)
+    main.main(["--workload", str(path), "--cpus", "8", "--algorithms", "EASY"])
+    from_file = json.loads(capsys.readouterr().out)
+    expected = main.run_scheduler("EASY", jobs, cpus=8)["metrics"]
+    assert from_file["metrics"] == expected
+    assert from_file["metrics"]["backfilled"] > 0
@@ -0,0 +1,53 @@
+# tests/test_workload_index.py
+
+import pytest
+
+from scheduler.engine import POLICIES, normalize, simulate
+from scheduler.incremental import IncrementalSimulation
+from scheduler.workload_index import WorkloadIndex, simulate_indexed
+
+
+def _busy_periods(processes):
+    """Brute force: FCFS completion times, split where the CPU goes idle."""
+    periods = []
+    end = None
+    for p in sorted(processes, key=lambda p: p["arrival"]):
+        if end is None or p["arrival"] > end:
+            periods.append([p["arrival"], p["arrival"]])
+        end = max(periods[-1][1], p["arrival"]) + p["burst"]
+        periods[-1][1] = end
+    return [tuple(p) for p in periods]
+
+
+def test_periods_and_prefix_sums(workload):
+    processes = workload(2000, seed=3, burst=(0, 7), priority=(1, 4), shuffle=True)
+    index = WorkloadIndex(processes)
+    assert [(start, end) for _, _, start, end in index.periods] == _busy_periods(processes)
+    for lo, hi, start, end in index.periods:
+        assert index.work(lo, hi) == end - start
+        assert index.arrived_by(start) > lo
+    assert index.work(0, len(index)) == sum(p["burst"] for p in processes)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_orders_match_the_engine(workload, policy):
+    processes = workload(500, seed=4, gap=1, burst=(0, 7), priority=(1, 4), shuffle=True)
+    index = WorkloadIndex(processes)
+    assert index.order(policy) == sorted(normalize(processes), key=POLICIES[policy][0])
+    sim = IncrementalSimulation(processes, policy, quantum=2, index=index)
+    assert sim.result() == simulate(processes, policy, quantum=2)
+
+
+@pytest.mark.parametrize("policy", POLICIES)
+def test_parallel_busy_periods_match_one_run(workload, policy):
+    processes = workload(3000, seed=5, burst=(0, 7), priority=(1, 4), shuffle=True)
+    index = WorkloadIndex(processes)
+    assert len(index.periods) > 8
+    assert simulate_indexed(index, policy, quantum=2, workers=2) == simulate(processes, policy, quantum=2)
+
+
+def test_fractional_times_are_not_split():
+    processes = [{"pid": "P1", "arrival": 0, "burst": 0.5}, {"pid": "P2", "arrival": 3, "burst": 1}]
+    index = WorkloadIndex(processes)
+    assert len(index.periods) == 2 and not index.splittable()
+    assert simulate_indexed(index, "RR", quantum=1, workers=2) == simulate(processes, "RR", quantum=1)
@@ -0,0 +1,282 @@
+# visualization/playback.py
+
+"""
+Animated live playback of a schedule.
+
+ScheduleTimeline turns any scheduler result (per-process records or Round
+Robin segments) into a sorted event stream and replays it: at simulated
+time t it knows the ready queue, the running process(es) and which
+segments have completed. Every SNAPSHOT_EVERY events its state is
+snapshotted, so seeking to any time restores the nearest earlier snapshot
+and replays at most SNAPSHOT_EVERY events.
+
+SchedulePlayback draws a timeline on a matplotlib Axes with blitting:
+completed segments are painted once into a cached background, and each
+frame only redraws the in-progress bars, the time cursor and the
+ready-queue text. A full redraw happens only on seek or resize.
+matplotlib is imported by SchedulePlayback only, so ScheduleTimeline
+works without it.
+"""
+
+import time
+from bisect import bisect_right
+
+SNAPSHOT_EVERY = 2048
+READY_SHOWN = 10            # ready-queue entries listed in the overlay
+ROW_HEIGHT = 10
+BAR_HEIGHT = 9
+
+# event kinds, in application order for equal timestamps
+_ARRIVE, _START, _FINISH, _COMPLETE = range(4)
+
+
+class ScheduleTimeline:
+    """Replayable state of a finished schedule."""
+
+    def __init__(self, processes):
+        rows = {}
+        arrival = {}
+        completion = {}
+        segs = []
+        for p in processes:
+            pid = p.get("pid")
+            if pid not in rows:
+                rows[pid] = len(rows)
+                a = p.get("arrival_time", p.get("arrival"))
+                arrival[pid] = a if a is not None else p.get("start", 0) or 0
+            if p.get("start") is None or p.get("finish") is None:
+                continue
+            segs.append((p["start"], p["finish"], pid, bool(p.get("is_rogue"))))
+            completion[pid] = max(completion.get(pid, p["finish"]), p["finish"])
+
+        # segments in finish order: the committed set is always a prefix
+        segs.sort(key=lambda s: (s[1], s[0]))
+        self.segments = segs
+        self.rows = rows
+        self.pids = list(rows)
+
+        events = []
+        for k, (s, f, pid, _) in enumerate(segs):
+            events.append((s, _START, k))
+            events.append((f, _FINISH, k))
+        for pid, a in arrival.items():
+            events.append((a, _ARRIVE, pid))
+            if pid in completion:
+                events.append((completion[pid], _COMPLETE, pid))
+        events.sort(key=lambda e: (e[0], e[1]))
+        self.events = events
+        self.times = [e[0] for e in events]
+        self.t_start = self.times[0] if events else 0
+        self.t_end = self.times[-1] if events else 0
+
+        # live replay state
+        self.cursor = 0             # events applied
+        self.committed = 0          # segments finished
+        self.active = set()         # segment indices started, not finished
+        self.live = {}              # pid -> None, arrived and not completed (arrival order)
+        self.snapshots = []
+        self._build_snapshots()
+
+    def _apply(self, upto):
+        events = self.events
+        for k in range(self.cursor, upto):
+            _, kind, ref = events[k]
+            if kind == _FINISH:
+                self.active.discard(ref)
+                self.committed += 1
+            elif kind == _COMPLETE:
+                self.live.pop(ref, None)
+            elif kind == _ARRIVE:
+                self.live[ref] = None
+            else:
+                self.active.add(ref)
+        self.cursor = upto
+
+    def _snapshot(self):
+        return (self.cursor, self.committed, frozenset(self.active), tuple(self.live))
+
+    def _restore(self, snap):
+        self.cursor, self.committed, active, live = snap
+        self.active = set(active)
+        self.live = dict.fromkeys(live)
+
+    def _build_snapshots(self):
+        self.snapshots = [self._snapshot()]
+        for k in range(SNAPSHOT_EVERY, len(self.events) + 1, SNAPSHOT_EVERY):
+            self._apply(k)
+            self.snapshots.append(self._snapshot())
+        self._restore(self.snapshots[0])
+
+    def seek(self, t):
+        """Move to simulated time t (events with time <= t applied)."""
+        target = bisect_right(self.times, t)
+        if target < self.cursor or target - self.cursor > SNAPSHOT_EVERY:
+            self._restore(self.snapshots[target // SNAPSHOT_EVERY])
+        self._apply(target)
+
+    def running(self):
+        return [self.segments[k][2] for k in sorted(self.active)]
+
+    def ready(self):
+        """PIDs waiting in the ready queue (arrived, not completed, not running)."""
+        running = set(self.running())
+        return [pid for pid in self.live if pid not in running]
+
+
+class SchedulePlayback:
+    """Blitted Gantt-chart animation of a ScheduleTimeline."""
+
+    def __init__(self, fig, ax, processes, speed=1.0, interval_ms=33, on_time=None):
+        from matplotlib.collections import PolyCollection
+        self.fig = fig
+        self.ax = ax
+        self.canvas = fig.canvas
+        self.timeline = ScheduleTimeline(processes)
+        self.speed = speed                  # simulated time units per second
+        self.on_time = on_time              # callback(t) after every frame
+        self.t = self.timeline.t_start
+        self.playing = False
+        self._background = None
+        self._drawn = 0                     # committed segments painted into the background
+        self._static_count = 0              # committed segments held by the static collection
+        self._last_tick = None
+
+        tl = self.timeline
+        self._verts = [self._rect(s, f, tl.rows[pid]) for s, f, pid, _ in tl.segments]
+        self._colors = ["red" if rogue else "blue" for _, _, _, rogue in tl.segments]
+
+        self.static = PolyCollection([], edgecolors="none")
+        self.fresh = PolyCollection([], edgecolors="none", animated=True)
+        self.in_progress = PolyCollection([], edgecolors="none", alpha=0.6, animated=True)
+        ax.add_collection(self.static)
+        ax.add_collection(self.fresh)
+        ax.add_collection(self.in_progress)
+        self.cursor_line = ax.axvline(self.t, color="orange", animated=True)
+        self.info = ax.text(0.01, 0.98, "", transform=ax.transAxes, va="top", fontsize=8,
+                            family="monospace", animated=True,
+                            bbox={"facecolor": "white", "alpha": 0.8, "edgecolor": "none"})
+
+        n_rows = max(len(tl.rows), 1)
+        ax.set_xlim(tl.t_start, max(tl.t_end, tl.t_start + 1))
+        ax.set_ylim(0, n_rows * ROW_HEIGHT)
+        if n_rows <= 50:
+            ax.set_yticks([i * ROW_HEIGHT + ROW_HEIGHT / 2 for i in range(len(tl.pids))])
+            ax.set_yticklabels(tl.pids)
+        else:
+            ax.set_yticks([])
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Processes")
+        ax.grid(True)
+
+        self.timer = self.canvas.new_timer(interval=interval_ms)
+        self.timer.add_callback(self._tick)
+        self._draw_cid = self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    @staticmethod
+    def _rect(start, finish, row):
+        y = row * ROW_HEIGHT
+        return [(start, y), (start, y + BAR_HEIGHT), (finish, y + BAR_HEIGHT), (finish, y)]
+
+    # ---------------- controls ----------------
+    def play(self):
+        if self.t >= self.timeline.t_end:
+            self.seek(self.timeline.t_start)
+        self.playing = True
+        self._last_tick = time.perf_counter()
+        self.timer.start()
+
+    def pause(self):
+        self.playing = False
+        self.timer.stop()
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def set_speed(self, speed):
+        self.speed = max(float(speed), 0.0)
+
+    def seek(self, t):
+        t = min(max(t, self.timeline.t_start), self.timeline.t_end)
+        backwards = t < self.t
+        self.t = t
+        self.timeline.seek(t)
+        if backwards or self.timeline.committed - self._drawn > SNAPSHOT_EVERY:
+            self._background = None
+            self._sync_static()
+            self.canvas.draw_idle()
+        else:
+            self._frame()
+
+    def close(self):
+        self.pause()
+        self.canvas.mpl_disconnect(self._draw_cid)
+
+    # ---------------- drawing ----------------
+    def _tick(self):
+        now = time.perf_counter()
+        self.t = min(self.t + (now - self._last_tick) * self.speed, self.timeline.t_end)
+        self._last_tick = now
+        self.timeline.seek(self.t)
+        self._frame()
+        if self.t >= self.timeline.t_end:
+            self.pause()
+
+    def _sync_static(self):
+        committed = self.timeline.committed
+        self.static.set_verts(self._verts[:committed])
+        self.static.set_facecolors(self._colors[:committed])
+        self._static_count = committed
+
+    def _on_draw(self, event):
+        # Full redraw (first show, seek, resize). The static layer lags behind
+        # segments that were only blitted; catch it up and draw once more.
+        if self._static_count != self.timeline.committed:
+            self._background = None
+            self._sync_static()
+            self.canvas.draw_idle()
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._drawn = self._static_count
+        self._overlay()
+
+    def _frame(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        committed = self.timeline.committed
+        if committed > self._drawn:
+            # paint newly completed segments once, then keep them in the background
+            self.fresh.set_verts(self._verts[self._drawn:committed])
+            self.fresh.set_facecolors(self._colors[self._drawn:committed])
+            self.ax.draw_artist(self.fresh)
+            self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self._drawn = committed
+        self._overlay()
+
+    def _overlay(self):
+        tl = self.timeline
+        verts = []
+        colors = []
+        for k in sorted(tl.active):
+            s, _, pid, rogue = tl.segments[k]
+            verts.append(self._rect(s, self.t, tl.rows[pid]))
+            colors.append("red" if rogue else "blue")
+        self.in_progress.set_verts(verts)
+        self.in_progress.set_facecolors(colors)
+        self.cursor_line.set_xdata([self.t, self.t])
+
+        ready = tl.ready()
+        shown = " ".join(str(pid) for pid in ready[:READY_SHOWN])
+        more = f" (+{len(ready) - READY_SHOWN})" if len(ready) > READY_SHOWN else ""
+        running = " ".join(str(pid) for pid in tl.running()) or "idle"
+        self.info.set_text(f"t = {self.t:.1f}\nRunning: {running}\nReady:   {shown}{more}")
+
+        self.ax.draw_artist(self.in_progress)
+        self.ax.draw_artist(self.cursor_line)
+        self.ax.draw_artist(self.info)
+        self.canvas.blit(self.ax.bbox)
+        if self.on_time is not None:
+            self.on_time(self.t)
@@ -0,0 +1,230 @@
+# visualization/trace_export.py
+
+"""
+Streaming trace export for scheduler results.
+
+Large schedules are better explored in a trace viewer than drawn with
+matplotlib. This module writes any scheduler result to:
+ - Chrome Trace Event JSON (chrome://tracing, ui.perfetto.dev, Speedscope)
+ - Perfetto protobuf traces (ui.perfetto.dev, trace_processor)
+
+Each CPU becomes a track, each segment a slice, and the security layer's
+rogue / throttle / terminate decisions become instant markers.
+
+Events are written one at a time while the input is consumed, so a
+generator of segments is never materialized and the output document is
+never built in memory. A
+scheduler.segment_store.SegmentStore is read back one spilled chunk at a
+time the same way.
+
+Compatible input forms (same as metrics.compute):
+ - Per-process single-record outputs (FCFS, SJF, SRTF, Priority)
+ - Multi-segment outputs (Round Robin) where each segment is a dict with pid/start/finish
+ - Optional "cpu" key selects the track (defaults to CPU 0)
+ - Engine overhead segments ("kind": "overhead") become "overhead" slices
+"""
+
+import json
+import os
+
+# Simulated time is unit-less; by default one tick is one millisecond.
+DEFAULT_TIME_UNIT_US = 1000
+DEFAULT_TIME_UNIT_NS = 1000000
+
+CHROME_SUFFIXES = (".json",)
+PERFETTO_SUFFIXES = (".pftrace", ".perfetto-trace", ".pb")
+
+
+def iter_trace_events(processes):
+    """
+    Normalize scheduler output into a stream of trace events.
+
+    Yields tuples:
+     - ("track", cpu)                          the first time a CPU is seen
+     - ("slice", cpu, pid, start, finish, args)
+     - ("instant", cpu, name, ts, pid)
+
+    Instant markers are emitted once per PID, on its first record.
+    """
+    seen_cpus = set()
+    marked = set()
+    for p in processes:
+        start = p.get("start")
+        finish = p.get("finish")
+        cpu = p.get("cpu", 0)
+        pid = p.get("pid", "unknown")
+
+        if cpu not in seen_cpus:
+            seen_cpus.add(cpu)
+            yield ("track", cpu)
+
+        if p.get("kind") == "overhead":
+            if start is not None and finish is not None:
+                yield ("slice", cpu, "overhead", start, finish,
+                       {"pid": pid, "context_switch": p.get("context_switch"),
+                        "cache": p.get("cache"), "migration": p.get("migration")})
+            continue
+
+        if pid not in marked:
+            marked.add(pid)
+            arrival = p.get("arrival_time", p.get("arrival", start))
+            if arrival is None:
+                arrival = 0
+            if p.get("is_rogue"):
+                yield ("instant", cpu, "rogue", arrival, pid)
+            if p.get("throttled"):
+                yield ("instant", cpu, "throttle", arrival, pid)
+            if p.get("terminated"):
+                yield ("instant", cpu, "terminate", finish if finish is not None else arrival, pid)
+
+        if start is None or finish is None:
+            continue
+        args = {
+            "arrival": p.get("arrival_time", p.get("arrival")),
+            "burst": p.get("burst_time", p.get("burst")),
+            "priority": p.get("priority"),
+        }
+        yield ("slice", cpu, pid, start, finish, args)
+
+
+# ---------------- Chrome Trace Event JSON ----------------
+def export_chrome_trace(processes, out, time_unit_us=DEFAULT_TIME_UNIT_US):
+    """
+    Write processes as Chrome Trace Event JSON.
+
+    `out` is a path or a writable text file. Returns the number of events written.
+    """
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "w") as f:
+            return export_chrome_trace(processes, f, time_unit_us)
+
+    out.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+    count = 0
+    for ev in iter_trace_events(processes):
+        kind = ev[0]
+        if kind == "track":
+            record = {"name": "thread_name", "ph": "M", "pid": 0, "tid": ev[1],
+                      "args": {"name": f"CPU {ev[1]}"}}
+        elif kind == "slice":
+            _, cpu, pid, start, finish, args = ev
+            record = {"name": pid, "cat": "cpu", "ph": "X", "pid": 0, "tid": cpu,
+                      "ts": start * time_unit_us, "dur": (finish - start) * time_unit_us,
+                      "args": args}
+        else:
+            _, cpu, name, ts, pid = ev
+            record = {"name": name, "cat": "security", "ph": "i", "s": "t", "pid": 0,
+                      "tid": cpu, "ts": ts * time_unit_us, "args": {"pid": pid}}
+        if count:
+            out.write(",\n")
+        out.write(json.dumps(record, separators=(",", ":")))
+        count += 1
+    out.write("\n]}\n")
+    return count
+
+
+# ---------------- Perfetto protobuf ----------------
+# Field numbers from perfetto/protos/perfetto/trace/*.proto
+_TRACE_PACKET = 1               # Trace.packet
+_PKT_TIMESTAMP = 8              # TracePacket.timestamp
+_PKT_SEQUENCE_ID = 10           # TracePacket.trusted_packet_sequence_id
+_PKT_TRACK_EVENT = 11           # TracePacket.track_event
+_PKT_SEQUENCE_FLAGS = 13        # TracePacket.sequence_flags
+_PKT_TRACK_DESCRIPTOR = 60      # TracePacket.track_descriptor
+_TD_UUID = 1                    # TrackDescriptor.uuid
+_TD_NAME = 2                    # TrackDescriptor.name
+_TE_TYPE = 9                    # TrackEvent.type
+_TE_TRACK_UUID = 11             # TrackEvent.track_uuid
+_TE_CATEGORIES = 22             # TrackEvent.categories
+_TE_NAME = 23                   # TrackEvent.name
+
+_SLICE_BEGIN = 1
+_SLICE_END = 2
+_INSTANT = 3
+_SEQ_INCREMENTAL_STATE_CLEARED = 1
+_SEQUENCE_ID = 1
+_TRACK_UUID_BASE = 0x5C4ED000
+
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _field_varint(field, value):
+    return _varint(field << 3) + _varint(value)
+
+
+def _field_bytes(field, payload):
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return _varint((field << 3) | 2) + _varint(len(payload)) + payload
+
+
+def _packet(body):
+    return _field_bytes(_TRACE_PACKET, body + _field_varint(_PKT_SEQUENCE_ID, _SEQUENCE_ID))
+
+
+def _track_event(ts, event_type, track_uuid, name=None, category=None):
+    te = _field_varint(_TE_TYPE, event_type) + _field_varint(_TE_TRACK_UUID, track_uuid)
+    if category is not None:
+        te += _field_bytes(_TE_CATEGORIES, category)
+    if name is not None:
+        te += _field_bytes(_TE_NAME, name)
+    return _packet(_field_varint(_PKT_TIMESTAMP, ts) + _field_bytes(_PKT_TRACK_EVENT, te))
+
+
+def export_perfetto_trace(processes, out, time_unit_ns=DEFAULT_TIME_UNIT_NS):
+    """
+    Write processes as a Perfetto protobuf trace.
+
+    `out` is a path or a writable binary file. Timestamps must be
+    non-negative. Returns the number of packets written.
+    """
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "wb") as f:
+            return export_perfetto_trace(processes, f, time_unit_ns)
+
+    count = 0
+    for ev in iter_trace_events(processes):
+        kind = ev[0]
+        if kind == "track":
+            cpu = ev[1]
+            desc = _field_varint(_TD_UUID, _TRACK_UUID_BASE + cpu) + _field_bytes(_TD_NAME, f"CPU {cpu}")
+            body = _field_bytes(_PKT_TRACK_DESCRIPTOR, desc)
+            if count == 0:
+                body += _field_varint(_PKT_SEQUENCE_FLAGS, _SEQ_INCREMENTAL_STATE_CLEARED)
+            out.write(_packet(body))
+            count += 1
+        elif kind == "slice":
+            _, cpu, pid, start, finish, _args = ev
+            uuid = _TRACK_UUID_BASE + cpu
+            out.write(_track_event(int(start * time_unit_ns), _SLICE_BEGIN, uuid, str(pid), "cpu"))
+            out.write(_track_event(int(finish * time_unit_ns), _SLICE_END, uuid))
+            count += 2
+        else:
+            _, cpu, name, ts, pid = ev
+            out.write(_track_event(int(ts * time_unit_ns), _INSTANT, _TRACK_UUID_BASE + cpu,
+                                   f"{name} {pid}", "security"))
+            count += 1
+    return count
+
+
+def export_trace(processes, path, fmt=None):
+    """
+    Export to `path`, choosing the format from `fmt` ("chrome" / "perfetto")
+    or, if omitted, from the file extension.
+    """
+    if fmt is None:
+        fmt = "perfetto" if str(path).lower().endswith(PERFETTO_SUFFIXES) else "chrome"
+    if fmt == "chrome":
+        return export_chrome_trace(processes, path)
+    if fmt == "perfetto":
+        return export_perfetto_trace(processes, path)
+    raise ValueError(f"Unknown trace format: {fmt}")
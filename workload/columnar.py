@@ -0,0 +1,88 @@
+# workload/columnar.py
+
+"""
+Columnar process table.
+
+A list of per-process dicts costs a few hundred bytes per process; a
+Workload keeps one typed array per field instead, so 10^6 processes fit
+in a few tens of MB and can be copied, sliced and written to disk cheaply.
+Schedulers still consume dicts: call to_dicts() at the point of use.
+
+Fields only some schedulers read (EXTRA_FIELDS: multi-CPU width and
+runtime estimate of batch jobs, period and deadline of real-time tasks,
+gang threads, lottery/stride tickets, CPU/I/O bursts and their devices)
+are kept in `extra`, one list per field that any process sets, with None
+for the processes that leave it out.
+"""
+
+from array import array
+
+EXTRA_FIELDS = ("cpus", "estimate", "period", "deadline", "threads", "tickets", "bursts", "devices")
+
+
+class Workload:
+    """Parallel columns: pid, arrival, burst, priority, plus the optional extra columns."""
+
+    def __init__(self):
+        self.pids = []
+        self.arrival = array("q")
+        self.burst = array("q")
+        self.priority = array("q")
+        self.extra = {}             # field -> list of values (None where unset)
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def append(self, pid, arrival, burst, priority=1, **extra):
+        """extra: values of EXTRA_FIELDS for this process (None = unset)."""
+        unknown = set(extra) - set(EXTRA_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown workload fields: {', '.join(sorted(unknown))}")
+        n = len(self.arrival)
+        if pid is None:
+            pid = f"P{n + 1}"
+        self.pids.append(pid)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+        for name, value in extra.items():
+            if value is not None and name not in self.extra:
+                self.extra[name] = [None] * n
+        for name, column in self.extra.items():
+            column.append(extra.get(name))
+
+    def row(self, i):
+        """(pid, arrival, burst, priority) of the i-th process."""
+        return (self.pids[i], self.arrival[i], self.burst[i], self.priority[i])
+
+    def copy(self):
+        w = Workload()
+        w.pids = list(self.pids)
+        w.arrival = array("q", self.arrival)
+        w.burst = array("q", self.burst)
+        w.priority = array("q", self.priority)
+        w.extra = {name: list(column) for name, column in self.extra.items()}
+        return w
+
+    def to_dicts(self):
+        """Process dicts in the form the GUI and schedulers use."""
+        out = [
+            {"pid": pid, "arrival_time": a, "burst_time": b, "priority": pr}
+            for pid, a, b, pr in zip(self.pids, self.arrival, self.burst, self.priority)
+        ]
+        for name, column in self.extra.items():
+            for p, value in zip(out, column):
+                if value is not None:
+                    p[name] = list(value) if isinstance(value, list) else value
+        return out
+
+    @classmethod
+    def from_dicts(cls, processes):
+        w = cls()
+        for p in processes:
+            w.append(p.get("pid"),
+                     p.get("arrival_time", p.get("arrival", 0)),
+                     p.get("burst_time", p.get("burst", 0)),
+                     p.get("priority", 1),
+                     **{name: p[name] for name in EXTRA_FIELDS if name in p})
+        return w
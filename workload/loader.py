@@ -0,0 +1,191 @@
+# workload/loader.py
+
+"""
+Bulk workload import / export.
+
+Supported formats (chosen by file extension):
+ - .csv    header with pid (optional), arrival|arrival_time, burst|burst_time,
+           priority (optional) and any of the optional fields below;
+           without a header the columns are [pid,] arrival, burst[, priority]
+ - .jsonl  one JSON object per line with the same keys
+ - .bin    binary trace: 16-byte header (magic b"CPUW", u16 version,
+           u16 reserved, u64 count) followed by the arrival, burst and
+           priority columns as little-endian int64 arrays; pids are P1..Pn
+
+Optional fields (workload.columnar.EXTRA_FIELDS) are numbers, except
+bursts and devices: lists of integers (space-separated in a CSV cell).
+Empty CSV cells leave a field unset. A process with bursts needs no
+burst: it defaults to the sum of the CPU bursts. Binary traces carry no
+optional fields.
+
+All loaders return a columnar Workload and accept progress=callback(done, total)
+(bytes read so far / file size), which may raise SimulationCancelled.
+"""
+
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+
+from workload.columnar import EXTRA_FIELDS, Workload
+
+BINARY_MAGIC = b"CPUW"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+
+_PROGRESS_EVERY = 4096  # lines between progress callbacks
+
+_ALIASES = {
+    "pid": "pid",
+    "arrival": "arrival", "arrival_time": "arrival",
+    "burst": "burst", "burst_time": "burst",
+    "priority": "priority",
+}
+_ALIASES.update((name, name) for name in EXTRA_FIELDS)
+_LISTS = ("bursts", "devices")
+
+
+def _number(value):
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"not a number: {value!r}")
+    return value
+
+
+def _extra(name, value):
+    """Validated value of an optional field; None when unset."""
+    if value is None or value == "":
+        return None
+    if name in _LISTS:
+        items = value.split() if isinstance(value, str) else value
+        if not isinstance(items, list):
+            raise TypeError(f"{name} must be a list")
+        return [int(v) for v in items]
+    return _number(value)
+
+
+def _burst(value, bursts):
+    if value is None and bursts is not None:
+        return sum(bursts[0::2])
+    return int(value)
+
+
+def _iter_lines(path, progress):
+    """Yield decoded lines, reporting bytes consumed."""
+    total = os.path.getsize(path)
+    done = 0
+    with open(path, "rb") as f:
+        for n, raw in enumerate(f, 1):
+            done += len(raw)
+            if progress is not None and n % _PROGRESS_EVERY == 0:
+                progress(done, total)
+            yield raw.decode("utf-8")
+    if progress is not None:
+        progress(total, total)
+
+
+def load_csv(path, progress=None):
+    w = Workload()
+    rows = csv.reader(_iter_lines(path, progress))
+    first = next(rows, None)
+    if first is None:
+        return w
+
+    header = [c.strip().lower() for c in first]
+    if any(c in _ALIASES for c in header):
+        columns = [_ALIASES.get(c) for c in header]
+        pending = []
+    else:
+        columns = ["pid", "arrival", "burst", "priority"] if len(first) >= 4 else ["arrival", "burst", "priority"]
+        pending = [first]
+    if "arrival" not in columns or ("burst" not in columns and "bursts" not in columns):
+        raise ValueError(f"{path}: CSV needs arrival and burst columns")
+    pid_col = columns.index("pid") if "pid" in columns else None
+    arr_col = columns.index("arrival")
+    burst_col = columns.index("burst") if "burst" in columns else None
+    prio_col = columns.index("priority") if "priority" in columns else None
+    extra_cols = [(name, columns.index(name)) for name in EXTRA_FIELDS if name in columns]
+
+    def rows_with_pending():
+        yield from pending
+        yield from rows
+
+    for line_no, row in enumerate(rows_with_pending(), 1 if pending else 2):
+        if not row:
+            continue
+        try:
+            extra = {name: _extra(name, row[col]) for name, col in extra_cols}
+            w.append(row[pid_col].strip() if pid_col is not None else None,
+                     int(row[arr_col]),
+                     _burst(row[burst_col] if burst_col is not None else None, extra.get("bursts")),
+                     int(row[prio_col]) if prio_col is not None else 1,
+                     **extra)
+        except (ValueError, TypeError, IndexError):
+            raise ValueError(f"{path}:{line_no}: invalid process row {row!r}") from None
+    return w
+
+
+def load_jsonl(path, progress=None):
+    w = Workload()
+    for line_no, line in enumerate(_iter_lines(path, progress), 1):
+        if not line.strip():
+            continue
+        try:
+            p = json.loads(line)
+            extra = {name: _extra(name, p[name]) for name in EXTRA_FIELDS if name in p}
+            w.append(p.get("pid"),
+                     int(p.get("arrival_time", p.get("arrival"))),
+                     _burst(p.get("burst_time", p.get("burst")), extra.get("bursts")),
+                     int(p.get("priority", 1)),
+                     **extra)
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError(f"{path}:{line_no}: invalid process record") from None
+    return w
+
+
+def load_binary(path, progress=None):
+    total = os.path.getsize(path)
+    w = Workload()
+    with open(path, "rb") as f:
+        magic, version, _, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"{path}: not a CPUW v{BINARY_VERSION} binary trace")
+        for k, column in enumerate((w.arrival, w.burst, w.priority)):
+            column.frombytes(f.read(count * column.itemsize))
+            if len(column) != count:
+                raise ValueError(f"{path}: truncated binary trace")
+            if sys.byteorder == "big":
+                column.byteswap()
+            if progress is not None:
+                progress(_HEADER.size + (k + 1) * count * column.itemsize, total)
+    w.pids = [f"P{i + 1}" for i in range(count)]
+    return w
+
+
+def save_binary(workload, path):
+    if workload.extra:
+        raise ValueError(f"{path}: binary traces cannot hold {', '.join(workload.extra)}")
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, len(workload)))
+        for column in (workload.arrival, workload.burst, workload.priority):
+            if sys.byteorder == "big":
+                column = array("q", column)
+                column.byteswap()
+            column.tofile(f)
+
+
+LOADERS = {".csv": load_csv, ".jsonl": load_jsonl, ".bin": load_binary}
+
+
+def load_workload(path, progress=None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in LOADERS:
+        raise ValueError(f"Unsupported workload format: {ext or path}")
+    return LOADERS[ext](path, progress=progress)